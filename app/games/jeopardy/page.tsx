@@ -57,7 +57,10 @@ export default function JeopardyGame() {
     answer: string
     value: number
     dailyDouble: boolean
+    image?: string | null
   } | null>(null)
+  // Generated games come without images; each clue's image is fetched by game id when it is revealed
+  const [gameId, setGameId] = useState<string | null>(null)
   const [showAnswer, setShowAnswer] = useState(false)
   const [answeredQuestions, setAnsweredQuestions] = useState<Set<string>>(new Set())
   const [wager, setWager] = useState<number>(0)
@@ -133,7 +136,8 @@ export default function JeopardyGame() {
 
       return {
         categories: data.categories,
-        questions: formattedQuestions
+        questions: formattedQuestions,
+        gameId: data.game_id || null
       };
     } catch (error) {
       console.error('Error in generateCustomThemeQuestions:', error);
@@ -177,6 +181,7 @@ export default function JeopardyGame() {
         // Update state with the new questions
         setCategories(customThemeData.categories);
         setQuestions(formattedQuestions);
+        setGameId(customThemeData.gameId);
         setScore(0);
         setAnsweredQuestions(new Set());
         setSelectedQuestion(null);
@@ -226,6 +231,7 @@ export default function JeopardyGame() {
 
       setCategories(selectedCategories)
       setQuestions(selectedQuestions)
+      setGameId(null)
       setScore(0)
       setAnsweredQuestions(new Set())
       setSelectedQuestion(null)
@@ -264,6 +270,29 @@ export default function JeopardyGame() {
     }
   }, [answeredQuestions, categories, gameState, numQuestions])
 
+  // Look up a revealed clue's image; the clue is shown without one until it arrives
+  const fetchClueImage = async (category: string, index: number, value: number) => {
+    if (!gameId) return
+    try {
+      const apiBaseUrl = process.env.NEXT_PUBLIC_API_BASE_URL || process.env.NEXT_PUBLIC_APP_URL || window.location.origin
+      const params = new URLSearchParams({ category, value: String(value) })
+      const response = await fetch(`${apiBaseUrl}/api/v1/jeopardy/games/${gameId}/image?${params}`)
+      if (!response.ok) return
+      const { image } = await response.json()
+      if (!image) return
+
+      setQuestions((prev: any) => ({
+        ...prev,
+        [category]: prev[category]?.map((q: any, i: number) => (i === index ? { ...q, image } : q)),
+      }))
+      setSelectedQuestion((prev) =>
+        prev && prev.category === category && prev.index === index ? { ...prev, image } : prev,
+      )
+    } catch (err) {
+      console.warn("Failed to load clue image:", err)
+    }
+  }
+
   const handleSelectQuestion = (category: string, index: number) => {
     if (gameState !== GAME_STATES.PLAYING) return
 
@@ -284,8 +313,13 @@ export default function JeopardyGame() {
         answer: questionData.answer,
         value: questionData.value,
         dailyDouble: questionData.dailyDouble,
+        image: questionData.image || null,
       })
 
+      if (!questionData.image) {
+        fetchClueImage(category, index, questionData.value)
+      }
+
       if (questionData.dailyDouble) {
         setShowWager(true)
       } else {
@@ -630,6 +664,9 @@ export default function JeopardyGame() {
             </div>
           ) : (
             <div className="text-center space-y-6">
+              {selectedQuestion?.image && (
+                <img src={selectedQuestion.image} alt="" className="mx-auto max-h-64 object-contain border-2 border-white" />
+              )}
               <p className="text-xl leading-relaxed whitespace-pre-wrap">{selectedQuestion?.question}</p>
 
               {!showAnswer ? (
@@ -3,15 +3,11 @@ import logging
 from fastapi import APIRouter, HTTPException
 from typing import Dict, Any, List
 from pydantic import BaseModel, Field
-import sys
-import os
 from pathlib import Path
 
-# Add the backend directory to the Python path
-sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
-
-# Import the ConnectionsGame class
-from trivai_connections import generate_connections_game
+from app.services.game_cache import cache_key, game_cache
+from app.services.game_worker import game_worker
+from app.services.warm_pool import warm_pool
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -27,12 +23,19 @@ async def generate_connections_game_endpoint(request: ConnectionsRequest):
     Generate a Connections style game with the given theme.
     """
     try:
-        # Generate the game data
-        game_data = generate_connections_game(
-            theme=request.theme,
+        # Serve a pre-generated game or a cached one, otherwise generate on the worker pool
+        key = cache_key(
+            "connections",
+            request.theme,
+            num_groups=request.num_groups,
+            items_per_group=request.items_per_group
+        )
+        producer = lambda: game_worker.generate_connections(
+            request.theme,
             num_groups=request.num_groups,
             items_per_group=request.items_per_group
         )
+        game_data = warm_pool.take("connections", key, producer) or await game_cache.get_or_generate(key, producer)
         
         return {
             "status": "success",
@@ -1,19 +1,18 @@
 import logging
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from typing import Dict, Any, List
 from pydantic import BaseModel
 import os
-import sys
 import re
 import yaml
 from typing import Optional
 from pathlib import Path
 
-# Add the backend directory to the Python path
-sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
-
-# Import the FeudGame class
-from trivai_feud import FeudGame
+from app.services.game_cache import cache_key, game_cache, is_cacheable
+from app.services.game_worker import game_worker
+from app.services.streaming import SSE_HEADERS, format_sse
+from app.services.warm_pool import warm_pool
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -25,6 +24,20 @@ script_path = Path(__file__).parent.parent.parent.parent.parent / "trivai_feud.p
 class FeudRequest(BaseModel):
     theme: str
     num_questions: int = Field(default=4, ge=1, le=10, description="Number of questions to generate (1-10)")
+    num_agents: Optional[int] = Field(
+        default=None, ge=1, le=50,
+        description="Respondents surveyed per game (1-50); the cap with early stopping. Defaults to FEUD_NUM_AGENTS"
+    )
+    early_stopping: Optional[bool] = Field(
+        default=None,
+        description="Stop surveying once the top answers settle. Defaults to FEUD_EARLY_STOPPING"
+    )
+
+
+def survey_options(num_agents: Optional[int], early_stopping: Optional[bool]) -> Dict[str, Any]:
+    """FeudGame survey options set by the request; unset ones keep the server defaults."""
+    options = {"num_agents": num_agents, "early_stopping": early_stopping}
+    return {name: value for name, value in options.items() if value is not None}
     
 
 @router.post("/generate", response_model=Dict[str, Any])
@@ -34,42 +47,17 @@ async def generate_feud_game(request: FeudRequest):
     Generate a Family Feud style game with the given theme.
     """
     try:
-        # Create and configure the game
-        game = FeudGame(
-            theme=request.theme,
-            num_questions=request.num_questions,
-        )
-        
-        # Generate the game data
-        game_data = game.generate_game()
+        # Serve a pre-generated game or a cached one, otherwise generate on the worker pool
+        options = survey_options(request.num_agents, request.early_stopping)
+        key = cache_key("feud", request.theme, num_questions=request.num_questions, **options)
+        producer = lambda: game_worker.generate_feud(request.theme, request.num_questions, **options)
+        game_data = warm_pool.take("feud", key, producer) or await game_cache.get_or_generate(key, producer)
         
         # Transform the data to match the frontend format
         transformed_data = transform_feud_data(game_data)
 
-        output_dir = f"{script_path.parent}/game_outputs"
-
         if save_to_file:
-            try:
-                # Create safe filename from theme
-                safe_theme = re.sub(r'[^a-zA-Z0-9_]', '_', request.theme.lower())
-                filename = f"{safe_theme}_feud.yaml"
-                
-                # Ensure output directory exists
-                os.makedirs(output_dir, exist_ok=True)
-                output_path = os.path.join(output_dir, filename)
-                
-                # Save to file
-                with open(output_path, 'w') as f:
-                    yaml.dump(transformed_data, f, default_flow_style=False)
-                
-                logger.info(f"Game saved to {output_path}")
-                # Include the file path in the response
-                
-            except Exception as e:
-                logger.error(f"Error saving to file: {str(e)}")
-                # Don't fail the request if file save fails
-                transformed_data['save_error'] = str(e)
-        
+            save_feud_game(request.theme, transformed_data)
         
         return transformed_data
         
@@ -78,23 +66,120 @@ async def generate_feud_game(request: FeudRequest):
         logger.error(error_msg)
         raise HTTPException(status_code=500, detail=error_msg)
 
+@router.get("/generate/stream")
+async def stream_feud_game(theme: str, num_questions: int = Query(default=4, ge=1, le=10),
+                           num_agents: Optional[int] = Query(default=None, ge=1, le=50),
+                           early_stopping: Optional[bool] = None):
+    """
+    Generate a Family Feud style game and stream it as Server-Sent Events.
+    
+    Events, in order:
+        questions: the theme and question texts, before any survey finishes
+        question: one question in the /generate format ({'id', 'question',
+            'answers', 'points'}), as soon as its answers are aggregated,
+            in question order
+        complete: the full game in the same format as /generate
+        error: emitted instead of complete if generation fails
+
+    A pre-generated or cached game for the theme is sent as the same events
+    straight away.
+    """
+    logger.info(f"Starting streamed Feud generation with theme: {theme}")
+    options = survey_options(num_agents, early_stopping)
+    key = cache_key("feud", theme, num_questions=num_questions, **options)
+
+    async def event_stream():
+        try:
+            producer = lambda: game_worker.generate_feud(theme, num_questions, **options)
+            game_data = warm_pool.take("feud", key, producer) or game_cache.get_fresh(key, producer)
+            if game_data:
+                transformed_data = transform_feud_data(game_data)
+                yield format_sse("questions", {
+                    'theme': transformed_data['theme'],
+                    'questions': [q['question'] for q in transformed_data['questions']]
+                })
+                for question in transformed_data['questions']:
+                    yield format_sse("question", question)
+                yield format_sse("complete", transformed_data)
+                return
+
+            async for event, payload in game_worker.stream_feud(theme, num_questions, **options):
+                if event == "question":
+                    payload = transform_feud_data({'questions': [payload]})['questions'][0]
+                elif event == "result":
+                    if is_cacheable(payload):
+                        game_cache.put(key, payload)
+                    event, payload = "complete", transform_feud_data(payload)
+                    save_feud_game(theme, payload)
+                yield format_sse(event, payload)
+        except Exception as e:
+            logger.exception("Unexpected error in stream_feud_game")
+            yield format_sse("error", {"detail": f"Error generating Feud game: {str(e)}"})
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream", headers=SSE_HEADERS)
+
+def save_feud_game(theme: str, transformed_data: Dict[str, Any]) -> None:
+    """Save a transformed game as YAML under game_outputs.
+
+    A failed save doesn't fail the request; the error is added to the game
+    as save_error instead.
+    """
+    output_dir = f"{script_path.parent}/game_outputs"
+    try:
+        # Create safe filename from theme
+        safe_theme = re.sub(r'[^a-zA-Z0-9_]', '_', theme.lower())
+        filename = f"{safe_theme}_feud.yaml"
+        
+        # Ensure output directory exists
+        os.makedirs(output_dir, exist_ok=True)
+        output_path = os.path.join(output_dir, filename)
+        
+        # Save to file
+        with open(output_path, 'w') as f:
+            yaml.dump(transformed_data, f, default_flow_style=False)
+        
+        logger.info(f"Game saved to {output_path}")
+        
+    except Exception as e:
+        logger.error(f"Error saving to file: {str(e)}")
+        transformed_data['save_error'] = str(e)
+
 def transform_feud_data(data: Dict[str, Any]) -> Dict[str, Any]:
-    """Transform Feud data to match frontend format."""
+    """Transform Feud data to match frontend format.
+
+    Questions surveyed by a simulated panel also get 'intervals', parallel
+    to 'answers': each answer's share of the panel with its 95% interval
+    ({'share', 'low', 'high'}), or None for answers added by the top-up.
+    """
     questions = []
     for i, q in enumerate(data.get('questions', [])):
         answers = []
         points = []
+        intervals = []
+        respondents = q.get('respondents')
         for j, ans in enumerate(q.get('answers', [])):
             answers.append(ans.get('answer', '').title())  # Title case for consistency
+            # Simulated panels: 95% interval of the answer's share; top-up answers have none
+            if 'ci_low' in ans:
+                intervals.append({'share': ans.get('share'), 'low': ans['ci_low'], 'high': ans['ci_high']})
+            else:
+                intervals.append(None)
             # Calculate points based on count (higher points for more common answers)
-            points.append(ans.get('count', 0) * 10)  # Scale points for better game balance
+            if respondents:
+                # Simulated panels: points are the percentage of respondents
+                points.append(max(1, round(ans.get('count', 0) * 100 / respondents)))
+            else:
+                points.append(ans.get('count', 0) * 10)  # Scale points for better game balance
         
-        questions.append({
+        question = {
             'id': q.get('id', i + 1),
             'question': q.get('question', ''),
             'answers': answers,
             'points': points
-        })
+        }
+        if any(intervals):
+            question['intervals'] = intervals
+        questions.append(question)
     
     return {
         'theme': data.get('theme', 'General Knowledge'),
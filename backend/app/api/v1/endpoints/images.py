@@ -0,0 +1,33 @@
+# app/api/v1/endpoints/images.py
+import logging
+from fastapi import APIRouter, HTTPException, Request, Response
+from fastapi.responses import FileResponse
+
+from app.services.game_worker import game_worker
+from app.services.image_enrichment import image_enricher
+
+logger = logging.getLogger(__name__)
+router = APIRouter()
+
+# Thumbnails are content-addressed, so a digest's bytes never change
+CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+@router.get("/{digest}")
+async def get_image(digest: str, request: Request):
+    """
+    Serve a stored clue image thumbnail by its content digest.
+    
+    Responds 304 when the client's If-None-Match already names the digest.
+    """
+    proxy = game_worker.module("trivai_image_proxy").image_proxy
+    # Disk lookups go to the image threads, off the event loop and the game workers
+    path = await image_enricher.run(proxy.path_for, digest)
+    if path is None:
+        raise HTTPException(status_code=404, detail="Image not found")
+
+    etag = f'"{digest}"'
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    if_none_match = request.headers.get("if-none-match", "")
+    if etag in [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")] or if_none_match.strip() == "*":
+        return Response(status_code=304, headers=headers)
+    return FileResponse(path, media_type="image/jpeg", headers=headers)
@@ -1,15 +1,15 @@
 # backend/app/api/v1/endpoints/jeopardy.py
 from fastapi import APIRouter, HTTPException, UploadFile, File
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from typing import Dict, Any, Optional
-import yaml
-import json
+from typing import Dict, Any, Iterator, Optional, Tuple
 import logging
-import tempfile
-import os
-import datetime
-import subprocess
-from pathlib import Path
+
+from app.services.game_cache import cache_key, game_cache, is_cacheable
+from app.services.game_worker import game_worker
+from app.services.image_enrichment import image_enricher
+from app.services.warm_pool import warm_pool
+from app.services.streaming import SSE_HEADERS, format_sse
 
 # Configure logging
 logging.basicConfig(
@@ -52,22 +52,46 @@ def transform_jeopardy_data(data: Dict[str, Any]) -> Dict[str, Any]:
             if category in questions:
                 result['questions'][category] = []
                 for q in questions[category]:
-                    # Transform question format to match frontend expectations
-                    transformed_q = {
-                        'question': q.get('question', q.get('clue', '')),
-                        'answer': q.get('answer', q.get('response', '')),
-                        'value': q.get('value', 200),  # Default to 200 if not specified
-                        'dailyDouble': q.get('dailyDouble', q.get('isDailyDouble', False)),
-                        'image': q.get('image'),
-                        'isRevealed': False,
-                        'isAnswered': False
-                    }
-                    # Remove None values
-                    transformed_q = {k: v for k, v in transformed_q.items() if v is not None}
-                    result['questions'][category].append(transformed_q)
+                    result['questions'][category].append(transform_question(q))
     
     return result
 
+def transform_question(q: Dict[str, Any]) -> Dict[str, Any]:
+    """Transform a single generated or assembled question to match frontend expectations."""
+    transformed_q = {
+        'question': q.get('question', q.get('clue', '')),
+        'answer': q.get('answer', q.get('response', '')),
+        'value': q.get('value', 200),  # Default to 200 if not specified
+        'dailyDouble': q.get('dailyDouble', q.get('isDailyDouble', False)),
+        'image': q.get('image'),
+        'isRevealed': False,
+        'isAnswered': False
+    }
+    # Remove None values
+    return {k: v for k, v in transformed_q.items() if v is not None}
+
+def replay_jeopardy_events(data: Dict[str, Any]) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """The progress events of /generate/stream, rebuilt from a finished game."""
+    for board_number, board in enumerate(data.get('boards', []), start=1):
+        categories = board.get('categories', [])
+        questions = board.get('questions', {})
+        yield "categories", {'board_number': board_number, 'categories': categories}
+        for category in categories:
+            yield "category", {
+                'board_number': board_number,
+                'category': category,
+                'questions': [transform_question(q) for q in questions.get(category, [])]
+            }
+        yield "daily_double", {
+            'board_number': board_number,
+            'daily_doubles': [
+                {'category': category, 'value': q.get('value')}
+                for category in categories
+                for q in questions.get(category, [])
+                if q.get('dailyDouble', q.get('isDailyDouble'))
+            ]
+        }
+
 class JeopardyRequest(BaseModel):
     theme: str
     num_boards: int = 1
@@ -84,93 +108,119 @@ async def generate_jeopardy(request: JeopardyRequest):
         Dictionary with categories and questions in frontend-compatible format
     """
     try:
-        script_path = Path(__file__).parent.parent.parent.parent.parent / "trivai_jeopardy.py"
-        
-        if not script_path.exists():
-            error_msg = f"Script not found at {script_path}"
-            logger.error(error_msg)
-            raise HTTPException(status_code=500, detail=error_msg)
-
         logger.info(f"Starting game generation with theme: {request.theme}")
         
-        # Set up output directory
-        output_dir = script_path.parent / "game_outputs"
-        output_dir.mkdir(exist_ok=True)
-        safe_theme = "".join(c if c.isalnum() else "_" for c in request.theme.lower())
-        output_file = output_dir / f"jeopardy_{safe_theme}.yaml"
+        # Serve a pre-generated game or a cached one, otherwise run the generator
+        # in-process on the preloaded worker pool
+        key = cache_key("jeopardy", request.theme, num_boards=1)
+        producer = lambda: game_worker.generate_jeopardy(request.theme, num_boards=1)
+        game_data = warm_pool.take("jeopardy", key, producer) or await game_cache.get_or_generate(key, producer)
         
-        try:
-            # Run the jeopardy generation script
-            cmd = [
-                str(script_path),
-                "--theme", request.theme,
-                "--num-boards", "1",
-            ]
-            
-            logger.info(f"Executing command: {' '.join(cmd)}")
-            
-            # Run the command and capture output
-            process = subprocess.Popen(
-                cmd,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
-                cwd=str(script_path.parent)
-            )
-            
-            stdout, stderr = process.communicate()
-            
-            logger.info(f"Process completed with return code: {process.returncode}")
-            logger.debug(f"=== STDOUT ===\n{stdout}")
-            
-            if stderr:
-                logger.error(f"=== STDERR ===\n{stderr}")
-            
-            if process.returncode != 0:
-                error_msg = f"Script failed with error: {stderr or 'Unknown error'}"
-                logger.error(error_msg)
-                raise HTTPException(
-                    status_code=500,
-                    detail=f"Failed to generate questions: {error_msg}"
-                )
-            
-            # Read the generated YAML file
-            with open(output_file, 'r') as f:
-                game_data = yaml.safe_load(f)
-            
-            # Transform the data to frontend-compatible format
-            transformed_data = transform_jeopardy_data(game_data)
-            
-            logger.info(f"Successfully generated game with {len(transformed_data['categories'])} categories")
-            return transformed_data
-            
-        except yaml.YAMLError as e:
-            logger.error(f"Failed to parse YAML output: {str(e)}")
-            raise HTTPException(
-                status_code=500,
-                detail=f"Failed to parse game data: {str(e)}"
-            )
-            
-        except Exception as e:
-            logger.error(f"Error generating game: {str(e)}", exc_info=True)
-            raise HTTPException(
-                status_code=500,
-                detail=f"An error occurred while generating the game: {str(e)}"
-            )
-            
-        except Exception as e:
-            logger.error(f"Error generating game: {str(e)}", exc_info=True)
-            # Don't delete the output file if there was an error, as it might be useful for debugging
-            if output_file.exists():
-                logger.info(f"Game data saved to {output_file} for debugging")
+        if game_data.get("error"):
+            error_msg = game_data["error"]
+            logger.error(error_msg)
             raise HTTPException(
                 status_code=500,
-                detail=f"An error occurred while generating the game: {str(e)}"
+                detail=f"Failed to generate questions: {error_msg}"
             )
-                
+        
+        # Transform the data to frontend-compatible format; images are attached
+        # in the background and fetched by game_id
+        transformed_data = transform_jeopardy_data(game_data)
+        transformed_data['game_id'] = image_enricher.register(game_data, key)
+        
+        logger.info(f"Successfully generated game with {len(transformed_data['categories'])} categories")
+        return transformed_data
+        
+    except HTTPException:
+        raise
     except Exception as e:
         logger.exception("Unexpected error in generate_jeopardy")
         raise HTTPException(
             status_code=500,
             detail=f"An unexpected error occurred: {str(e)}. Check server logs for details."
-        )
\ No newline at end of file
+        )
+
+@router.get("/generate/stream")
+async def stream_jeopardy(theme: str):
+    """
+    Generate a Jeopardy game and stream it as Server-Sent Events.
+    
+    Events, in order:
+        categories: the board's category list, as soon as the planner returns
+            (re-sent as the list grows when the category plan is streamed)
+        category: one category's column, as soon as its questions are validated
+        daily_double: the Daily Double assignment for the board
+        complete: the full text-only game in the same format as /generate,
+            including the game_id to fetch its images with
+        error: emitted instead of complete if generation fails
+
+    A pre-generated or cached game for the theme is sent as the same events
+    straight away.
+    """
+    logger.info(f"Starting streamed game generation with theme: {theme}")
+    key = cache_key("jeopardy", theme, num_boards=1)
+
+    async def event_stream():
+        try:
+            # A pre-generated or cached game is replayed as the same events at once
+            producer = lambda: game_worker.generate_jeopardy(theme, num_boards=1)
+            game_data = warm_pool.take("jeopardy", key, producer) or game_cache.get_fresh(key, producer)
+            if game_data and not game_data.get("error"):
+                for event, payload in replay_jeopardy_events(game_data):
+                    yield format_sse(event, payload)
+                game_id = image_enricher.register(game_data, key)
+                yield format_sse("complete", {**transform_jeopardy_data(game_data), 'game_id': game_id})
+                return
+
+            async for event, payload in game_worker.stream_jeopardy(theme, num_boards=1):
+                if event == "category":
+                    payload = {
+                        'board_number': payload['board_number'],
+                        'category': payload['category'],
+                        'questions': [transform_question(q) for q in payload['questions']]
+                    }
+                elif event == "result":
+                    if payload.get("error"):
+                        logger.error(payload["error"])
+                        yield format_sse("error", {"detail": f"Failed to generate questions: {payload['error']}"})
+                        return
+                    if is_cacheable(payload):
+                        game_cache.put(key, payload)
+                    game_id = image_enricher.register(payload, key)
+                    event, payload = "complete", {**transform_jeopardy_data(payload), 'game_id': game_id}
+                yield format_sse(event, payload)
+        except Exception as e:
+            logger.exception("Unexpected error in stream_jeopardy")
+            yield format_sse("error", {"detail": f"An unexpected error occurred: {str(e)}"})
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream", headers=SSE_HEADERS)
+
+
+@router.get("/games/{game_id}/images")
+async def get_game_images(game_id: str):
+    """
+    Get the images resolved so far for a served game.
+    
+    Returns:
+        status ("pending", "ready" or "failed") and a list of
+        {board_number, category, value, image} for every clue with an image
+    """
+    images = image_enricher.images(game_id)
+    if images is None:
+        raise HTTPException(status_code=404, detail="Unknown or expired game")
+    return images
+
+@router.get("/games/{game_id}/image")
+async def get_clue_image(game_id: str, category: str, value: int, board_number: int = 1):
+    """
+    Resolve a single clue's image, e.g. when the clue is revealed.
+    
+    Returns:
+        {"image": url} or {"image": null} if the clue has no image
+    """
+    try:
+        image = await image_enricher.clue_image(game_id, board_number, category, value)
+    except KeyError:
+        raise HTTPException(status_code=404, detail="Unknown game or clue")
+    return {"image": image}
@@ -3,7 +3,11 @@ from fastapi.middleware.cors import CORSMiddleware
 import logging
 from app.database import engine, Base
 from app import models  
-from app.api.v1.endpoints import auth, jeopardy, feud, connections
+from app.api.v1.endpoints import auth, jeopardy, feud, connections, images
+from app.services.game_cache import game_cache
+from app.services.game_worker import game_worker
+from app.services.image_enrichment import image_enricher
+from app.services.warm_pool import warm_pool
 
 # Configure logging
 logging.basicConfig(
@@ -43,6 +47,18 @@ app.include_router(auth.router, prefix="/api/v1")
 app.include_router(jeopardy.router, prefix="/api/v1/jeopardy", tags=["jeopardy"])
 app.include_router(feud.router, prefix="/api/v1/feud", tags=["feud"])
 app.include_router(connections.router, prefix="/api/v1/connections", tags=["connections"])
+app.include_router(images.router, prefix="/api/v1/images", tags=["images"])
+
+@app.on_event("startup")
+async def preload_game_worker():
+    # Import the generator modules once so requests don't pay for it
+    game_worker.start()
+
+@app.on_event("shutdown")
+async def stop_game_worker():
+    warm_pool.shutdown()
+    image_enricher.shutdown()
+    game_worker.shutdown()
 
 @app.get("/")
 async def root():
@@ -50,4 +66,20 @@ async def root():
 
 @app.get("/health")
 async def health_check():
-    return {"status": "ok"}
\ No newline at end of file
+    return {"status": "ok"}
+
+@app.get("/cache/stats")
+async def cache_stats():
+    return game_cache.stats_snapshot()
+
+@app.get("/warm-pool/stats")
+async def warm_pool_stats():
+    return warm_pool.stats_snapshot()
+
+@app.get("/image-search/stats")
+async def image_search_stats():
+    return {
+        **game_worker.module("trivai_images").image_search.stats_snapshot(),
+        "proxy": game_worker.module("trivai_image_proxy").image_proxy.stats,
+        "enrichment": image_enricher.stats_snapshot()
+    }
@@ -0,0 +1,197 @@
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+CACHE_DIR = Path(__file__).parent.parent.parent / "game_outputs" / "cache"
+
+# Seconds an entry is served as fresh
+GAME_CACHE_TTL = int(os.getenv("GAME_CACHE_TTL", str(24 * 60 * 60)))
+# Seconds past the TTL an entry may still be served while it is refreshed
+GAME_CACHE_MAX_STALE = int(os.getenv("GAME_CACHE_MAX_STALE", str(7 * 24 * 60 * 60)))
+GAME_CACHE_MAX_ENTRIES = int(os.getenv("GAME_CACHE_MAX_ENTRIES", "128"))
+GAME_CACHE_MAX_DISK_ENTRIES = int(os.getenv("GAME_CACHE_MAX_DISK_ENTRIES", "1000"))
+
+
+def normalize_theme(theme: str) -> str:
+    """Normalize a theme so trivially different spellings share a cache entry."""
+    return " ".join("".join(c if c.isalnum() else " " for c in theme.lower()).split())
+
+
+def cache_key(game_type: str, theme: str, **params) -> str:
+    """Build the cache key for a game type, theme and generation parameters."""
+    return json.dumps([game_type, normalize_theme(theme), params], sort_keys=True)
+
+
+def is_cacheable(data: Any) -> bool:
+    """Whether a generated game may be cached: not an error, and not degraded.
+
+    Generators mark games that fell back to placeholder content with
+    "degraded": True; those are served once but not kept.
+    """
+    return isinstance(data, dict) and bool(data) and not data.get("error") and not data.get("degraded")
+
+
+class GameCache:
+    """Two-tier (memory LRU + on-disk JSON) cache of generated games.
+
+    Entries younger than ``ttl`` are served as-is. Entries older than that but
+    within ``max_stale`` are served immediately while a background refresh
+    regenerates them; anything older is regenerated before responding.
+    Concurrent misses for the same key share a single generation.
+    """
+
+    def __init__(self, cache_dir: Path = CACHE_DIR, ttl: int = GAME_CACHE_TTL,
+                 max_stale: int = GAME_CACHE_MAX_STALE, max_entries: int = GAME_CACHE_MAX_ENTRIES,
+                 max_disk_entries: int = GAME_CACHE_MAX_DISK_ENTRIES):
+        self.cache_dir = Path(cache_dir)
+        self.ttl = ttl
+        self.max_stale = max_stale
+        self.max_entries = max_entries
+        self.max_disk_entries = max_disk_entries
+        self._memory: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self.stats = {
+            "hits": 0,
+            "disk_hits": 0,
+            "stale_hits": 0,
+            "misses": 0,
+            "refreshes": 0,
+            "refresh_errors": 0,
+        }
+
+    def _disk_path(self, key: str) -> Path:
+        return self.cache_dir / f"{hashlib.sha256(key.encode('utf-8')).hexdigest()[:32]}.json"
+
+    def get(self, key: str) -> Optional[Tuple[float, Dict[str, Any]]]:
+        """Return (created_at, data) from memory or disk, or None."""
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                return self._memory[key]
+
+        path = self._disk_path(key)
+        try:
+            with open(path, "r") as f:
+                entry = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable cache file {path}: {e}")
+            return None
+        if entry.get("key") != key:
+            return None
+
+        self.stats["disk_hits"] += 1
+        created_at, data = entry["created_at"], entry["data"]
+        self._remember(key, created_at, data)
+        return created_at, data
+
+    def put(self, key: str, data: Dict[str, Any], created_at: Optional[float] = None) -> None:
+        """Store a game in both tiers."""
+        created_at = time.time() if created_at is None else created_at
+        self._remember(key, created_at, data)
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            path = self._disk_path(key)
+            tmp_path = path.with_suffix(".tmp")
+            with open(tmp_path, "w") as f:
+                json.dump({"key": key, "created_at": created_at, "data": data}, f)
+            os.replace(tmp_path, path)
+            self._prune_disk()
+        except OSError as e:
+            logger.error(f"Error writing cache entry to disk: {e}")
+
+    def _remember(self, key: str, created_at: float, data: Dict[str, Any]) -> None:
+        with self._lock:
+            self._memory[key] = (created_at, data)
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+
+    def _prune_disk(self) -> None:
+        files = list(self.cache_dir.glob("*.json"))
+        if len(files) <= self.max_disk_entries:
+            return
+        files.sort(key=lambda p: p.stat().st_mtime)
+        for path in files[:len(files) - self.max_disk_entries]:
+            path.unlink(missing_ok=True)
+
+    def get_fresh(self, key: str, producer: Callable[[], Awaitable[Dict[str, Any]]]) -> Optional[Dict[str, Any]]:
+        """Return the cached game for key if it may still be served, else None.
+
+        A stale entry is returned while producer regenerates it in the
+        background. Must be called from the event loop.
+        """
+        entry = self.get(key)
+        if entry is not None:
+            created_at, data = entry
+            age = time.time() - created_at
+            if age < self.ttl:
+                self.stats["hits"] += 1
+                return data
+            if age < self.ttl + self.max_stale:
+                self.stats["stale_hits"] += 1
+                self._refresh_in_background(key, producer)
+                return data
+
+        self.stats["misses"] += 1
+        return None
+
+    async def get_or_generate(self, key: str, producer: Callable[[], Awaitable[Dict[str, Any]]]) -> Dict[str, Any]:
+        """Return the cached game for key, generating it with producer on a miss."""
+        data = self.get_fresh(key, producer)
+        if data is not None:
+            return data
+        return await self._generate(key, producer)
+
+    async def _generate(self, key: str, producer: Callable[[], Awaitable[Dict[str, Any]]]) -> Dict[str, Any]:
+        return await asyncio.shield(self._start_generation(key, producer))
+
+    def _start_generation(self, key: str, producer: Callable[[], Awaitable[Dict[str, Any]]]) -> asyncio.Task:
+        """Return the in-flight generation for key, starting one if needed."""
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._produce_and_store(key, producer))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return task
+
+    async def _produce_and_store(self, key: str, producer: Callable[[], Awaitable[Dict[str, Any]]]) -> Dict[str, Any]:
+        data = await producer()
+        if is_cacheable(data):
+            self.put(key, data)
+        return data
+
+    def _refresh_in_background(self, key: str, producer: Callable[[], Awaitable[Dict[str, Any]]]) -> None:
+        if key in self._inflight:
+            return
+        self.stats["refreshes"] += 1
+
+        def log_failure(task: asyncio.Task) -> None:
+            if not task.cancelled() and task.exception() is not None:
+                self.stats["refresh_errors"] += 1
+                logger.error(f"Background cache refresh failed: {task.exception()}")
+
+        self._start_generation(key, producer).add_done_callback(log_failure)
+
+    def stats_snapshot(self) -> Dict[str, Any]:
+        lookups = self.stats["hits"] + self.stats["stale_hits"] + self.stats["misses"]
+        served = self.stats["hits"] + self.stats["stale_hits"]
+        return {
+            **self.stats,
+            "memory_entries": len(self._memory),
+            "hit_rate": round(served / lookups, 4) if lookups else 0.0,
+        }
+
+
+game_cache = GameCache()
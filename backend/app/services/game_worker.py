@@ -0,0 +1,141 @@
+import asyncio
+import functools
+import importlib
+import logging
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+# Add the backend directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+logger = logging.getLogger(__name__)
+
+# Generator modules imported once at startup instead of once per request
+PRELOAD_MODULES = ["trivai_jeopardy", "trivai_feud", "trivai_connections"]
+
+GAME_WORKER_THREADS = int(os.getenv("GAME_WORKER_THREADS", "4"))
+
+
+class GameWorker:
+    """Runs game generators in-process on a pool of preloaded worker threads.
+
+    The generator scripts pull in crewai, crewai_tools and serpapi, which takes
+    seconds per interpreter. Importing them once here and dispatching requests
+    onto a thread pool keeps that cost off the request path and lets callers
+    get the game dict back directly.
+    """
+
+    def __init__(self, max_workers: int = GAME_WORKER_THREADS, preload: Optional[List[str]] = None):
+        self.max_workers = max_workers
+        self.preload = PRELOAD_MODULES if preload is None else preload
+        self._executor = None
+        self._modules: Dict[str, Any] = {}
+
+    @property
+    def started(self) -> bool:
+        return self._executor is not None
+
+    def start(self) -> None:
+        """Create the thread pool and import the generator modules."""
+        if self.started:
+            return
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_workers,
+            thread_name_prefix="game-worker"
+        )
+        for name in self.preload:
+            self._modules[name] = importlib.import_module(name)
+            logger.info(f"Preloaded generator module: {name}")
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    def module(self, name: str) -> Any:
+        """Return a preloaded generator module, importing it on first use."""
+        if name not in self._modules:
+            self._modules[name] = importlib.import_module(name)
+        return self._modules[name]
+
+    async def run(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """Run a blocking callable on the worker pool without blocking the event loop."""
+        if not self.started:
+            self.start()
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(func, *args, **kwargs))
+
+    async def stream(self, func: Callable[..., Any], *args, **kwargs) -> AsyncIterator[Tuple[str, Any]]:
+        """Run a generator that reports progress through an on_event callback.
+
+        Yields (event, payload) tuples as the worker thread emits them, then a
+        final ("result", return_value). Exceptions from func are re-raised.
+        """
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+
+        def on_event(event: str, payload: Any) -> None:
+            loop.call_soon_threadsafe(queue.put_nowait, (event, payload))
+
+        task = asyncio.ensure_future(self.run(func, *args, on_event=on_event, **kwargs))
+        # Runs on the loop after every event queued by the worker thread
+        task.add_done_callback(lambda _: queue.put_nowait(None))
+
+        while True:
+            item = await queue.get()
+            if item is None:
+                break
+            yield item
+        yield "result", task.result()
+
+    async def generate_jeopardy(self, theme: str, num_boards: int = 1, **options) -> Dict[str, Any]:
+        """Generate a Jeopardy game and return the raw game dict.
+
+        Extra keyword options (max_concurrency, parallel_boards, batch_planning)
+        are passed through to create_jeopardy_game. Images are left unresolved
+        unless enrich_images=True; see image_enricher.
+        """
+        jeopardy = self.module("trivai_jeopardy")
+        options = {"enrich_images": False, **options}
+        return await self.run(jeopardy.create_jeopardy_game, theme, num_boards, save_to_file=True, **options)
+
+    async def generate_feud(self, theme: str, num_questions: int, **options) -> Dict[str, Any]:
+        """Generate a Feud game and return the raw game dict.
+
+        Extra keyword options (num_agents, early_stopping, survey_mode, ...)
+        are passed through to FeudGame.
+        """
+        feud = self.module("trivai_feud")
+        return await self.run(
+            lambda: feud.FeudGame(theme=theme, num_questions=num_questions, **options).generate_game()
+        )
+
+    async def generate_connections(self, theme: str, num_groups: int = 4, items_per_group: int = 4) -> Dict[str, Any]:
+        """Generate a Connections game and return the raw game dict."""
+        connections = self.module("trivai_connections")
+        return await self.run(
+            connections.generate_connections_game,
+            theme=theme,
+            num_groups=num_groups,
+            items_per_group=items_per_group
+        )
+
+    def stream_feud(self, theme: str, num_questions: int, **options) -> AsyncIterator[Tuple[str, Any]]:
+        """Generate a Feud game, yielding each question as its survey completes."""
+        feud = self.module("trivai_feud")
+        return self.stream(
+            lambda on_event: feud.FeudGame(
+                theme=theme, num_questions=num_questions, **options
+            ).generate_game(on_event=on_event)
+        )
+
+    def stream_jeopardy(self, theme: str, num_boards: int = 1, **options) -> AsyncIterator[Tuple[str, Any]]:
+        """Generate a Jeopardy game, yielding board progress events as they happen."""
+        jeopardy = self.module("trivai_jeopardy")
+        options = {"enrich_images": False, **options}
+        return self.stream(jeopardy.create_jeopardy_game, theme, num_boards, save_to_file=True, **options)
+
+
+game_worker = GameWorker()
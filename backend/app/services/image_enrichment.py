@@ -0,0 +1,156 @@
+import asyncio
+import copy
+import functools
+import logging
+import os
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+from app.services.game_cache import game_cache
+from app.services.game_worker import game_worker
+
+logger = logging.getLogger(__name__)
+
+# Served games whose images can still be fetched by id
+IMAGE_ENRICHMENT_MAX_GAMES = int(os.getenv("IMAGE_ENRICHMENT_MAX_GAMES", "256"))
+# Threads for image search, probing and thumbnailing, apart from the game worker pool
+IMAGE_WORKER_THREADS = int(os.getenv("IMAGE_WORKER_THREADS", "2"))
+
+
+class ImageEnricher:
+    """Attaches clue images to Jeopardy games after they have been served.
+
+    Generation returns a text-only game. Each served game is registered under
+    a game id and its image queries are resolved in the background on a small
+    pool of image threads, so slow image hosts never hold up game generation;
+    the enriched game is then published back to the game cache so later hits
+    include images. Clients can poll the whole game's images or
+    resolve a single clue's image on demand when it is revealed.
+    """
+
+    def __init__(self, max_games: int = IMAGE_ENRICHMENT_MAX_GAMES, max_workers: int = IMAGE_WORKER_THREADS):
+        self.max_games = max_games
+        self.max_workers = max_workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._games: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self.stats = {"registered": 0, "enriched": 0, "errors": 0, "lazy_lookups": 0}
+
+    def register(self, game: Dict[str, Any], key: Optional[str] = None) -> str:
+        """Track a served game and start enriching it in the background.
+
+        Args:
+            game: The raw game dict as returned by the generator
+            key: Game cache key to publish the enriched game under
+
+        Returns:
+            The game id clients use to fetch its images
+        """
+        game_id = uuid.uuid4().hex
+        images = game_worker.module("trivai_images")
+        # The cache may hand the same dict to other requests, so enrich a copy
+        original, game = game, copy.deepcopy(game)
+        pending = images.has_pending_images(game)
+        self._games[game_id] = {"game": game, "original": original, "key": key,
+                                "status": "pending" if pending else "ready"}
+        self.stats["registered"] += 1
+        while len(self._games) > self.max_games:
+            old_id, _ = self._games.popitem(last=False)
+            task = self._tasks.pop(old_id, None)
+            if task is not None:
+                task.cancel()
+
+        if pending:
+            task = asyncio.ensure_future(self._enrich(game_id))
+            self._tasks[game_id] = task
+            task.add_done_callback(lambda _: self._tasks.pop(game_id, None))
+        return game_id
+
+    async def run(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """Run blocking image work on the image threads without blocking the event loop."""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="image-worker")
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(func, *args, **kwargs))
+
+    async def _enrich(self, game_id: str) -> None:
+        entry = self._games.get(game_id)
+        if entry is None:
+            # Evicted before the pass started
+            return
+        images = game_worker.module("trivai_images")
+        try:
+            await self.run(images.enrich_game_images, entry["game"])
+        except Exception as e:
+            self.stats["errors"] += 1
+            entry["status"] = "failed"
+            logger.error(f"Image enrichment failed for game {game_id}: {e}")
+            return
+        entry["status"] = "ready"
+        self.stats["enriched"] += 1
+
+        if entry["key"] is not None:
+            cached = game_cache.get(entry["key"])
+            # Only publish over the game this one was served from; a refresh
+            # (or a game that never was cached) must not be replaced by it
+            if cached is not None and cached[1] == entry["original"]:
+                # Keep the original age so enrichment doesn't extend the entry's TTL
+                game_cache.put(entry["key"], entry["game"], created_at=cached[0])
+
+    def images(self, game_id: str) -> Optional[Dict[str, Any]]:
+        """Return the game's enrichment status and every resolved clue image, or None if unknown."""
+        entry = self._games.get(game_id)
+        if entry is None:
+            return None
+        resolved: List[Dict[str, Any]] = []
+        for board_number, board in enumerate(entry["game"].get("boards", []), 1):
+            for category, column in board.get("questions", {}).items():
+                for q in column:
+                    if q.get("image"):
+                        resolved.append({
+                            "board_number": board_number,
+                            "category": category,
+                            "value": q["value"],
+                            "image": q["image"]
+                        })
+        return {"game_id": game_id, "status": entry["status"], "images": resolved}
+
+    async def clue_image(self, game_id: str, board_number: int, category: str, value: int) -> Optional[str]:
+        """Resolve one clue's image now, e.g. when the clue is revealed.
+
+        Lookups that overlap the background pass share its API call.
+
+        Raises:
+            KeyError: If the game or clue is unknown
+        """
+        entry = self._games[game_id]
+        boards = entry["game"].get("boards", [])
+        if not 1 <= board_number <= len(boards):
+            raise KeyError(f"Board {board_number}")
+        column = boards[board_number - 1].get("questions", {})[category]
+        question = next((q for q in column if q.get("value") == value), None)
+        if question is None:
+            raise KeyError(f"{category} ${value}")
+
+        if question.get("image") or not question.get("image_query"):
+            return question.get("image")
+        self.stats["lazy_lookups"] += 1
+        images = game_worker.module("trivai_images")
+        resolved = await self.run(images.resolve_images, [question["image_query"]])
+        question["image"] = resolved.get(question["image_query"])
+        return question["image"]
+
+    def shutdown(self) -> None:
+        for task in list(self._tasks.values()):
+            task.cancel()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    def stats_snapshot(self) -> Dict[str, Any]:
+        return {**self.stats, "games": len(self._games), "enriching": len(self._tasks)}
+
+
+image_enricher = ImageEnricher()
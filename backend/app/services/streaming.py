@@ -0,0 +1,14 @@
+import json
+from typing import Any
+
+# Headers that keep proxies from buffering a Server-Sent Events response
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "Connection": "keep-alive",
+    "X-Accel-Buffering": "no",
+}
+
+
+def format_sse(event: str, data: Any) -> str:
+    """Format a payload as a single Server-Sent Events message."""
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
@@ -0,0 +1,157 @@
+import asyncio
+import logging
+import math
+import os
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Set
+
+from app.services.game_cache import is_cacheable
+
+logger = logging.getLogger(__name__)
+
+# Ready-to-serve games kept per popular theme
+WARM_POOL_SIZE = int(os.getenv("WARM_POOL_SIZE", "2"))
+# Popular themes kept warm per game type
+WARM_POOL_THEMES = int(os.getenv("WARM_POOL_THEMES", "10"))
+# Requests (after decay) before a theme counts as popular
+WARM_POOL_MIN_REQUESTS = float(os.getenv("WARM_POOL_MIN_REQUESTS", "3"))
+# Seconds for a theme's request count to decay by half
+WARM_POOL_HALF_LIFE = float(os.getenv("WARM_POOL_HALF_LIFE", str(6 * 60 * 60)))
+# Background generations allowed at once, so refills don't starve live requests
+WARM_POOL_MAX_REFILLS = int(os.getenv("WARM_POOL_MAX_REFILLS", "1"))
+
+Producer = Callable[[], Awaitable[Dict[str, Any]]]
+
+
+class WarmPool:
+    """Keeps pre-generated games ready for the most requested themes.
+
+    Every request bumps a decaying popularity score for its key. For the top
+    themes of each game type, the pool holds up to ``size`` distinct games;
+    taking one schedules an asynchronous refill through the same producer the
+    request would have used.
+    """
+
+    def __init__(self, size: int = WARM_POOL_SIZE, max_themes: int = WARM_POOL_THEMES,
+                 min_requests: float = WARM_POOL_MIN_REQUESTS, half_life: float = WARM_POOL_HALF_LIFE,
+                 max_refills: int = WARM_POOL_MAX_REFILLS):
+        self.size = size
+        self.max_themes = max_themes
+        self.min_requests = min_requests
+        self.half_life = half_life
+        self.max_refills = max_refills
+        self._scores: Dict[str, float] = {}
+        self._scored_at: Dict[str, float] = {}
+        self._game_types: Dict[str, str] = {}
+        self._producers: Dict[str, Producer] = {}
+        self._pools: Dict[str, Deque[Dict[str, Any]]] = {}
+        self._refilling: Dict[str, asyncio.Task] = {}
+        self._refill_slots: Optional[asyncio.Semaphore] = None
+        self.stats = {"hits": 0, "misses": 0, "refills": 0, "refill_errors": 0}
+
+    def _score(self, key: str, now: float) -> float:
+        elapsed = now - self._scored_at.get(key, now)
+        return self._scores.get(key, 0.0) * math.pow(0.5, elapsed / self.half_life)
+
+    def record(self, game_type: str, key: str, producer: Producer) -> None:
+        """Count a request for key and remember how to generate more of it."""
+        now = time.time()
+        self._scores[key] = self._score(key, now) + 1.0
+        self._scored_at[key] = now
+        self._game_types[key] = game_type
+        self._producers[key] = producer
+
+    def popular_keys(self, game_type: str) -> List[str]:
+        """Keys of the game type that currently qualify for the pool, most popular first."""
+        now = time.time()
+        scored = [
+            (self._score(key, now), key)
+            for key, key_type in self._game_types.items()
+            if key_type == game_type
+        ]
+        for score, key in scored:
+            # Forget themes nobody has asked for in a long time
+            if score < 0.01 and key not in self._pools and key not in self._refilling:
+                for table in (self._scores, self._scored_at, self._game_types, self._producers):
+                    table.pop(key, None)
+        # Small tolerance so decay since the last request doesn't drop a theme at the threshold
+        scored = [(score, key) for score, key in scored if score >= self.min_requests - 1e-6]
+        scored.sort(reverse=True)
+        return [key for _, key in scored[:self.max_themes]]
+
+    def take(self, game_type: str, key: str, producer: Producer) -> Optional[Dict[str, Any]]:
+        """Record the request and pop a ready game for key, if there is one.
+
+        Must be called from the event loop; refills are scheduled on it.
+        """
+        self.record(game_type, key, producer)
+        pool = self._pools.get(key)
+        game = pool.popleft() if pool else None
+        if game is not None:
+            self.stats["hits"] += 1
+        else:
+            self.stats["misses"] += 1
+
+        popular = self.popular_keys(game_type)
+        self._prune(game_type, set(popular))
+        if key in popular:
+            self._schedule_refill(key)
+        return game
+
+    def _prune(self, game_type: str, popular: Set[str]) -> None:
+        """Drop ready games for themes that fell out of the popular set."""
+        for key in list(self._pools):
+            if self._game_types.get(key) == game_type and key not in popular:
+                del self._pools[key]
+
+    def _schedule_refill(self, key: str) -> None:
+        if key in self._refilling or len(self._pools.get(key, ())) >= self.size:
+            return
+        task = asyncio.ensure_future(self._refill(key))
+        self._refilling[key] = task
+        task.add_done_callback(lambda _: self._refilling.pop(key, None))
+
+    async def _refill(self, key: str) -> None:
+        if self._refill_slots is None:
+            self._refill_slots = asyncio.Semaphore(self.max_refills)
+        pool = self._pools.setdefault(key, deque())
+        while len(pool) < self.size:
+            async with self._refill_slots:
+                try:
+                    game = await self._producers[key]()
+                except Exception as e:
+                    self.stats["refill_errors"] += 1
+                    logger.error(f"Warm pool refill failed for {key}: {e}")
+                    return
+            if not is_cacheable(game):
+                self.stats["refill_errors"] += 1
+                return
+            if key not in self._pools:
+                # Pruned while generating
+                return
+            pool.append(game)
+            self.stats["refills"] += 1
+            logger.info(f"Warm pool for {key} has {len(pool)}/{self.size} games ready")
+
+    def shutdown(self) -> None:
+        for task in list(self._refilling.values()):
+            task.cancel()
+
+    def stats_snapshot(self) -> Dict[str, Any]:
+        now = time.time()
+        return {
+            **self.stats,
+            "refilling": len(self._refilling),
+            "pools": {
+                key: {
+                    "game_type": self._game_types.get(key),
+                    "ready": len(pool),
+                    "score": round(self._score(key, now), 2)
+                }
+                for key, pool in self._pools.items()
+            },
+        }
+
+
+warm_pool = WarmPool()
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""Exercise the image proxy against a local HTTP stand-in for third-party hosts.
+
+Starts an http.server on localhost serving a multi-megabyte original, a host
+that rejects HEAD, a slow host, a dead link and a non-image page, then
+localizes several clues' candidate lists through ImageProxy and reports
+which candidate each clue got, wall time and bytes saved by downscaling.
+No network access or API keys needed.
+
+Usage (from the backend directory):
+    python benchmarks/bench_image_proxy.py --size 3000x2000
+"""
+
+import argparse
+import io
+import os
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from PIL import Image
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+from trivai_cache import SQLiteCache  # noqa: E402
+from trivai_image_proxy import ImageProxy  # noqa: E402
+
+SLOW_SECONDS = 3.0
+
+
+def make_original(width: int, height: int) -> bytes:
+    """A noisy (hard to compress) JPEG, like a large photo original."""
+    image = Image.effect_noise((width, height), 80).convert("RGB")
+    output = io.BytesIO()
+    image.save(output, "JPEG", quality=95)
+    return output.getvalue()
+
+
+def make_handler(original: bytes):
+    class StandInHandler(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def _send(self, status: int, content_type: str = "", body: bytes = b""):
+            self.send_response(status)
+            if content_type:
+                self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            if self.command == "GET":
+                self.wfile.write(body)
+
+        def _route(self):
+            if self.path == "/photo.jpg":
+                return self._send(200, "image/jpeg", original)
+            if self.path == "/no-head.jpg":
+                if self.command == "HEAD":
+                    return self._send(405)
+                return self._send(200, "image/jpeg", original)
+            if self.path == "/slow.jpg":
+                time.sleep(SLOW_SECONDS)
+                return self._send(200, "image/jpeg", original)
+            if self.path == "/page.html":
+                return self._send(200, "text/html", b"<html>not an image</html>")
+            return self._send(404)
+
+        do_GET = _route
+        do_HEAD = _route
+
+    return StandInHandler
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the image proxy against a local stand-in host")
+    parser.add_argument("--size", type=str, default="3000x2000", help="Original image size, WIDTHxHEIGHT")
+    parser.add_argument("--timeout", type=float, default=1.0, help="Probe timeout in seconds")
+    args = parser.parse_args()
+    width, height = (int(n) for n in args.size.lower().split("x"))
+
+    original = make_original(width, height)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(original))
+    # The proxy hangs up on the slow host by design
+    server.handle_error = lambda request, client_address: None
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+
+    clues = {
+        "dead then good": [f"{base}/missing.jpg", f"{base}/photo.jpg"],
+        "slow then HEAD-less": [f"{base}/slow.jpg", f"{base}/no-head.jpg"],
+        "not an image": [f"{base}/page.html"],
+        "same original again": [f"{base}/photo.jpg"],
+        "nothing found": [],
+    }
+
+    with tempfile.TemporaryDirectory() as tmp:
+        proxy = ImageProxy(
+            store_dir=os.path.join(tmp, "images"),
+            timeout=args.timeout,
+            # The stand-in host is on localhost
+            allow_private=True,
+            sources=SQLiteCache("image_proxy", ttl=3600, max_entries=100, path=os.path.join(tmp, "cache.sqlite3"))
+        )
+        start = time.perf_counter()
+        results = proxy.localize_many(clues)
+        elapsed = time.perf_counter() - start
+
+        print(f"Original: {width}x{height}, {len(original) / 1e6:.2f} MB\n")
+        for clue, url in results.items():
+            path = proxy.path_for(url.rsplit("/", 1)[1]) if url else None
+            size = f"{os.path.getsize(path) / 1e3:.0f} kB" if path else "-"
+            print(f"{clue:<24}{url or 'no image':<52}{size:>8}")
+
+        stats = proxy.stats
+        print(f"\nLocalized {len(clues)} clues in {elapsed:.2f}s "
+              f"(probe timeout {args.timeout}s, slow host takes {SLOW_SECONDS}s)")
+        print(f"Probes: {stats['probes']} ({stats['probe_failures']} failed), stored: {stats['stored']}, "
+              f"reused: {stats['reused']}, store files: {len(os.listdir(proxy.store_dir))}")
+        if stats["bytes_in"]:
+            print(f"Downloaded {stats['bytes_in'] / 1e6:.2f} MB, stored {stats['bytes_out'] / 1e3:.0f} kB "
+                  f"({stats['bytes_in'] / max(1, stats['bytes_out']):.0f}x smaller)")
+
+    server.shutdown()
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
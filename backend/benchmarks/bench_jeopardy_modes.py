@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""Compare per-category and one-shot Jeopardy question generation.
+
+Plans one set of categories, then generates the board's questions with each
+mode and reports wall time, LLM requests and prompt/completion tokens as
+reported by the API (tool-call turns included), and the estimated
+scraped-page tokens saved by condensation. Makes
+real LLM calls, so OPENAI_API_KEY and SERPER_API_KEY must be set.
+
+Usage (from the backend directory):
+    python benchmarks/bench_jeopardy_modes.py --theme "Space Exploration" --runs 3
+"""
+
+import argparse
+import logging
+import os
+import statistics
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+from trivai_jeopardy import GENERATION_MODES, JeopardyGame  # noqa: E402
+
+
+def run_mode(theme: str, categories: list, mode: str, max_concurrency: int) -> dict:
+    game = JeopardyGame(theme, max_concurrency=max_concurrency, generation_mode=mode)
+    start = time.perf_counter()
+    if mode == "oneshot":
+        questions = game.generate_questions_oneshot(categories)
+    else:
+        questions = game.generate_questions(categories)
+    elapsed = time.perf_counter() - start
+    placeholders = sum(
+        1 for column in questions.values() for q in column
+        if q["clue"].startswith("This is a sample question")
+    )
+    return {"seconds": elapsed, "placeholders": placeholders, **game.usage_summary()}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark Jeopardy generation modes")
+    parser.add_argument("--theme", type=str, default="Science", help="Theme for the board")
+    parser.add_argument("--runs", type=int, default=3, help="Boards to generate per mode")
+    parser.add_argument("--max-concurrency", type=int, default=5, help="Concurrency for per-category mode")
+    args = parser.parse_args()
+
+    logging.getLogger("jeopardy_agents").setLevel(logging.WARNING)
+
+    categories = JeopardyGame(args.theme).generate_categories(0)
+    print(f"Categories: {categories}\n")
+
+    results = {mode: [] for mode in GENERATION_MODES}
+    for _ in range(args.runs):
+        for mode in GENERATION_MODES:
+            results[mode].append(run_mode(args.theme, categories, mode, args.max_concurrency))
+
+    print(f"{'mode':<14}{'seconds':>10}{'calls':>8}{'prompt tok':>12}{'output tok':>12}{'scrape saved':>14}"
+          f"{'placeholders':>14}")
+    for mode, runs in results.items():
+        print(
+            f"{mode:<14}"
+            f"{statistics.mean(r['seconds'] for r in runs):>10.2f}"
+            f"{statistics.mean(r['llm_calls'] for r in runs):>8.1f}"
+            f"{statistics.mean(r['prompt_tokens'] for r in runs):>12.0f}"
+            f"{statistics.mean(r['completion_tokens'] for r in runs):>12.0f}"
+            f"{statistics.mean(r['scrape_tokens_raw'] - r['scrape_tokens_sent'] for r in runs):>14.0f}"
+            f"{statistics.mean(r['placeholders'] for r in runs):>14.1f}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""Measure the per-request overhead of subprocess vs in-process Jeopardy generation.
+
+The old endpoint spawned ``trivai_jeopardy.py`` for every request and read the
+board back from a YAML file. This benchmark isolates that fixed cost (fresh
+interpreter, generator imports, ``load_dotenv`` and the YAML round-trip) from
+the LLM work by comparing it with dispatching onto the preloaded GameWorker.
+
+Usage (from the backend directory):
+    python benchmarks/bench_jeopardy_startup.py --runs 5
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import yaml
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+from app.services.game_worker import GameWorker  # noqa: E402
+
+
+def sample_game(theme: str) -> dict:
+    """Build a board with the same shape create_jeopardy_game returns."""
+    categories = [f"CATEGORY {i + 1}" for i in range(5)]
+    return {
+        "theme": theme,
+        "boards": [{
+            "board_number": 1,
+            "theme": theme,
+            "categories": categories,
+            "questions": {
+                category: [
+                    {
+                        "question": f"This is a sample clue for {category} (${value})?",
+                        "answer": "What is the sample answer?",
+                        "value": value,
+                        "dailyDouble": False,
+                        "image": None
+                    } for value in [200, 400, 600, 800, 1000]
+                ] for category in categories
+            },
+            "metadata": {"total_questions": 25, "total_value": 15000, "has_daily_double": False}
+        }]
+    }
+
+
+def run_subprocess(module: str, theme: str) -> float:
+    """One request through the old path: spawn, import, dump YAML, read it back."""
+    start = time.perf_counter()
+    with tempfile.TemporaryDirectory() as tmp:
+        output_file = os.path.join(tmp, "board.yaml")
+        script = (
+            "import json, sys, yaml\n"
+            f"import {module}\n"
+            "with open(sys.argv[1], 'w') as f:\n"
+            "    yaml.dump(json.load(sys.stdin), f, default_flow_style=False, sort_keys=False)\n"
+        )
+        subprocess.run(
+            [sys.executable, "-c", script, output_file],
+            input=json.dumps(sample_game(theme)),
+            cwd=BACKEND_DIR,
+            check=True,
+            capture_output=True,
+            text=True
+        )
+        with open(output_file) as f:
+            yaml.safe_load(f)
+    return time.perf_counter() - start
+
+
+async def run_in_process(worker: GameWorker, theme: str) -> float:
+    """One request through the new path: dispatch onto the preloaded worker."""
+    start = time.perf_counter()
+    await worker.run(sample_game, theme)
+    return time.perf_counter() - start
+
+
+def summarize(label: str, timings: list) -> None:
+    print(f"{label:<14} mean {statistics.mean(timings) * 1000:9.2f} ms   "
+          f"median {statistics.median(timings) * 1000:9.2f} ms   "
+          f"max {max(timings) * 1000:9.2f} ms")
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark Jeopardy request startup overhead")
+    parser.add_argument("--runs", type=int, default=5, help="Requests to time per path")
+    parser.add_argument("--module", type=str, default="trivai_jeopardy", help="Generator module to preload")
+    parser.add_argument("--theme", type=str, default="Science", help="Theme passed to the generator")
+    args = parser.parse_args()
+
+    subprocess_timings = [run_subprocess(args.module, args.theme) for _ in range(args.runs)]
+
+    worker = GameWorker(max_workers=1, preload=[args.module])
+    preload_start = time.perf_counter()
+    worker.start()
+    preload_time = time.perf_counter() - preload_start
+    in_process_timings = [await run_in_process(worker, args.theme) for _ in range(args.runs)]
+    worker.shutdown()
+
+    print(f"One-time preload of {args.module}: {preload_time * 1000:.2f} ms")
+    summarize("subprocess", subprocess_timings)
+    summarize("in-process", in_process_timings)
+    saved = statistics.mean(subprocess_timings) - statistics.mean(in_process_timings)
+    print(f"Per-request overhead removed: {saved * 1000:.2f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(asyncio.run(main()))
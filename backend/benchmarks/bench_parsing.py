@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""Benchmark the shared agent-output parser against the previous ad-hoc parsers.
+
+Runs every response in benchmarks/corpus through trivai_parsing and through
+inline copies of the parsing code it replaced, and reports throughput and
+success rate for well-formed and malformed responses separately.
+
+Corpus files are named ``<kind>__<label>.txt``; labels starting with ``bad_``
+are malformed. ``kind`` selects the parser and the shape a successful parse
+must have:
+
+    questions, categories, boards, board  -> YAML (Jeopardy)
+    personalities, connections            -> JSON (Feud, Connections)
+
+Usage (from the backend directory):
+    python benchmarks/bench_parsing.py --repeat 200
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import time
+from typing import Any, Callable, Dict, List, Tuple
+
+import yaml
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+from trivai_parsing import SafeLoader, loads_json, parse_yaml_payload  # noqa: E402
+
+CORPUS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "corpus")
+
+JSON_KINDS = ("personalities", "connections")
+
+
+# --- Parsing as it was before trivai_parsing ------------------------------
+
+def legacy_extract_yaml_from_markdown(text: str) -> str:
+    if not text or not isinstance(text, str):
+        return ""
+    text = re.sub(r'^```(?:yaml)?\s*', '', text, flags=re.IGNORECASE | re.MULTILINE)
+    text = re.sub(r'```$', '', text, flags=re.IGNORECASE | re.MULTILINE)
+    text = text.strip()
+    if '```' in text:
+        parts = [p.strip() for p in text.split('```') if p.strip()]
+        if parts:
+            parts.sort(key=len, reverse=True)
+            for part in parts:
+                if re.search(r'^(board|boards|categories|questions):', part, re.MULTILINE):
+                    return part.strip()
+    if re.search(r'^(board|boards|categories|questions):', text, re.MULTILINE):
+        return text.strip()
+    lines = [
+        re.sub(r'`', '', line).strip()
+        for line in text.split('\n')
+        if line.strip() and not line.startswith(('```', '---', '...'))
+    ]
+    return '\n'.join(lines) if lines else text.strip()
+
+
+def legacy_load_yaml_response(text: str) -> Any:
+    """Old JeopardyGame._load_yaml_response (categories and boards)."""
+    result = yaml.safe_load(text)
+    if result is None:
+        raise ValueError("Empty YAML content")
+    if isinstance(result, str):
+        result = yaml.safe_load(legacy_extract_yaml_from_markdown(text))
+    return result
+
+
+def legacy_parse_questions(response_text: str) -> Any:
+    """Parsing half of the old JeopardyGame._parse_questions_response."""
+    yaml_content = legacy_extract_yaml_from_markdown(response_text)
+    if '```' in yaml_content:
+        yaml_content = re.sub(r'```[^`]*```', '', yaml_content, flags=re.DOTALL)
+        yaml_content = yaml_content.replace('```', '').strip()
+    result = None
+    for attempt in [yaml_content, response_text]:
+        try:
+            result = yaml.safe_load(attempt)
+            if result is not None:
+                break
+        except yaml.YAMLError:
+            continue
+    if result is None:
+        yaml_blocks = re.findall(
+            r'(?:^|\n)(categories|questions):[\s\S]*?(?=\n\w+:|\Z)',
+            response_text,
+            re.MULTILINE
+        )
+        if yaml_blocks:
+            result = yaml.safe_load('\n'.join(yaml_blocks))
+    return result
+
+
+def legacy_loads_json(text: str) -> Any:
+    """Old ConnectionsGame.generate_groups fence stripping (a superset of Feud's)."""
+    result = text.strip()
+    if '```json' in result:
+        result = result.split('```json')[1].split('```')[0].strip()
+    elif '```' in result:
+        result = result.split('```')[1].strip()
+        if result.startswith('json'):
+            result = result[4:].strip()
+    return json.loads(result)
+
+
+def legacy_parse(kind: str, text: str) -> Any:
+    if kind in JSON_KINDS:
+        return legacy_loads_json(text)
+    if kind == "questions":
+        return legacy_parse_questions(text)
+    return legacy_load_yaml_response(text)
+
+
+def shared_parse(kind: str, text: str) -> Any:
+    if kind in JSON_KINDS:
+        return loads_json(text)
+    return parse_yaml_payload(text)
+
+
+# --- Harness ---------------------------------------------------------------
+
+def is_valid(kind: str, result: Any) -> bool:
+    """Whether a parse result has the shape the game code goes on to use."""
+    if kind in JSON_KINDS:
+        return isinstance(result, list) and bool(result) and all(isinstance(i, dict) for i in result)
+    if kind == "questions" and isinstance(result, list):
+        # The crafter sometimes drops the top-level key
+        result = {"questions": result}
+    if not isinstance(result, dict):
+        return False
+    items = result.get(kind)
+    return isinstance(items, list) and bool(items)
+
+
+def load_corpus() -> List[Tuple[str, str, bool, str]]:
+    """Return (name, kind, malformed, text) for every corpus file."""
+    corpus = []
+    for name in sorted(os.listdir(CORPUS_DIR)):
+        if not name.endswith(".txt"):
+            continue
+        kind, _, label = name[:-4].partition("__")
+        with open(os.path.join(CORPUS_DIR, name), "r", encoding="utf-8") as f:
+            corpus.append((name, kind, label.startswith("bad_"), f.read()))
+    return corpus
+
+
+def run_parser(parse: Callable[[str, str], Any], corpus: List[Tuple[str, str, bool, str]],
+               repeat: int) -> Dict[str, Any]:
+    ok: Dict[str, bool] = {}
+    for name, kind, _, text in corpus:
+        try:
+            ok[name] = is_valid(kind, parse(kind, text))
+        except Exception:
+            ok[name] = False
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for _, kind, _, text in corpus:
+            try:
+                parse(kind, text)
+            except Exception:
+                pass
+    elapsed = time.perf_counter() - start
+    return {"ok": ok, "seconds": elapsed}
+
+
+def success_rate(ok: Dict[str, bool], corpus, malformed: bool) -> str:
+    names = [name for name, _, bad, _ in corpus if bad == malformed]
+    if not names:
+        return "-"
+    return f"{sum(ok[n] for n in names)}/{len(names)}"
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark agent-output parsing")
+    parser.add_argument("--repeat", type=int, default=200, help="Passes over the corpus for timing")
+    parser.add_argument("--verbose", action="store_true", help="Show per-file results")
+    args = parser.parse_args()
+
+    corpus = load_corpus()
+    total_bytes = sum(len(text.encode("utf-8")) for _, _, _, text in corpus)
+    print(f"Corpus: {len(corpus)} responses, {total_bytes} bytes; YAML loader: {SafeLoader.__name__}\n")
+
+    results = {
+        "legacy": run_parser(legacy_parse, corpus, args.repeat),
+        "trivai_parsing": run_parser(shared_parse, corpus, args.repeat),
+    }
+
+    print(f"{'parser':<16}{'docs/s':>10}{'MB/s':>8}{'well-formed ok':>16}{'malformed ok':>14}")
+    for label, result in results.items():
+        docs = len(corpus) * args.repeat
+        print(
+            f"{label:<16}"
+            f"{docs / result['seconds']:>10.0f}"
+            f"{total_bytes * args.repeat / result['seconds'] / 1e6:>8.2f}"
+            f"{success_rate(result['ok'], corpus, False):>16}"
+            f"{success_rate(result['ok'], corpus, True):>14}"
+        )
+
+    if args.verbose:
+        print(f"\n{'file':<40}{'legacy':>8}{'shared':>8}")
+        for name, _, _, _ in corpus:
+            print(f"{name:<40}{str(results['legacy']['ok'][name]):>8}{str(results['trivai_parsing']['ok'][name]):>8}")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,78 @@
+import pytest
+
+from trivai_answers import AnswerCanonicalizer, count_answers, stem
+
+
+@pytest.mark.parametrize("word, expected", [
+    ("movies", "movie"),
+    ("cookies", "cookie"),
+    ("parties", "partie"),
+    ("party", "partie"),
+    ("buses", "bus"),
+    ("boxes", "box"),
+    ("churches", "church"),
+    ("glasses", "glass"),
+    ("horses", "hors"),
+    ("horse", "hors"),
+    ("walking", "walk"),
+    ("shopping", "shop"),
+])
+def test_stem(word, expected):
+    assert stem(word) == expected
+
+
+@pytest.mark.parametrize("word", ["news", "glass", "virus", "tennis", "bus", "gas", "bonus"])
+def test_stem_keeps_non_plurals(word):
+    assert stem(word) == word
+
+
+@pytest.mark.parametrize("singular, plural", [
+    ("movie", "movies"),
+    ("cookie", "cookies"),
+    ("party", "parties"),
+    ("bus", "buses"),
+    ("headache", "headaches"),
+    ("fry", "fries"),
+    ("ski", "skis"),
+    ("menu", "menus"),
+    ("view", "views"),
+    ("emu", "emus"),
+    ("virus", "viruses"),
+    ("gas", "gases"),
+])
+def test_plurals_share_a_cluster(singular, plural):
+    canonicalizer = AnswerCanonicalizer()
+    assert canonicalizer.add(singular) == canonicalizer.add(plural)
+
+
+def test_news_is_not_new():
+    assert len(count_answers(["news", "new"])) == 2
+
+
+PREFIX_PAIRS = [
+    ("pie", "apple pie"),
+    ("dog", "hot dog"),
+    ("tea", "iced tea"),
+    ("wine", "red wine"),
+    ("cat", "cat food"),
+    ("sun", "sunny"),
+]
+
+
+@pytest.mark.parametrize("short, long", PREFIX_PAIRS)
+@pytest.mark.parametrize("short_first", [True, False])
+def test_short_answers_dont_absorb_longer_ones(short, long, short_first):
+    canonicalizer = AnswerCanonicalizer()
+    first, second = (short, long) if short_first else (long, short)
+    canonicalizer.add(first)
+    assert not canonicalizer.contains(second)
+    assert canonicalizer.add(second) != canonicalizer.add(first)
+
+
+@pytest.mark.parametrize("answer, typo", [("pizza", "pizzza"), ("spaghetti", "spagetti")])
+@pytest.mark.parametrize("answer_first", [True, False])
+def test_typos_join_a_cluster(answer, typo, answer_first):
+    canonicalizer = AnswerCanonicalizer()
+    first, second = (answer, typo) if answer_first else (typo, answer)
+    canonicalizer.add(first)
+    assert canonicalizer.contains(second)
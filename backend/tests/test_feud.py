@@ -0,0 +1,67 @@
+import threading
+
+import pytest
+
+pytest.importorskip("crewai")
+
+from trivai_feud import FeudGame  # noqa: E402
+
+
+@pytest.fixture
+def game(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    return FeudGame("desserts", num_questions=1, num_agents=3,
+                    use_persona_library=False, use_answer_store=False)
+
+
+def test_top_up_skips_rewordings_but_keeps_new_answers(game, monkeypatch):
+    monkeypatch.setattr(game, "_poll_respondents", lambda questions: [["Pie"], ["pies"], ["cake"]])
+    monkeypatch.setattr(game, "_generate_additional_answers",
+                        lambda shortfalls: [["Apple pie", "a cake", "Pie!", "ice cream"]])
+
+    [question] = game.collect_answers(["Name a dessert"])
+
+    assert question['answers'] == [
+        {'answer': 'pie', 'count': 2},
+        {'answer': 'cake', 'count': 1},
+        {'answer': 'apple pie', 'count': 1},
+        {'answer': 'ice cream', 'count': 1},
+    ]
+
+
+@pytest.mark.parametrize("top_up, degraded", [
+    ([], True),
+    ([f"dessert {i}" for i in range(12)], False),
+])
+def test_game_with_too_few_answers_is_degraded(game, monkeypatch, top_up, degraded):
+    monkeypatch.setattr(game, "_personalities_stage", lambda: [{"name": "A"}])
+    monkeypatch.setattr(game, "_respondents_stage", lambda personalities: [])
+    monkeypatch.setattr(game, "_questions_stage", lambda: ["Name a dessert"])
+    # Two of three respondents timed out
+    monkeypatch.setattr(game, "_poll_respondents", lambda questions: [["Pie"], None, None])
+    monkeypatch.setattr(game, "_generate_additional_answers", lambda shortfalls: [top_up for _ in shortfalls])
+
+    assert game.generate_game().get("degraded", False) is degraded
+
+
+def test_each_question_group_is_emitted_before_later_groups_are_surveyed(game, monkeypatch):
+    game.group_size = 1
+    first_emitted = threading.Event()
+
+    def poll(questions):
+        # The second group's poll only finishes once the first question is out
+        if questions == ["Name a cake"]:
+            assert first_emitted.wait(5)
+        return [[f"{questions[0]} answer"]]
+
+    def on_question(q):
+        emitted.append(q['id'])
+        first_emitted.set()
+
+    emitted = []
+    monkeypatch.setattr(game, "_poll_respondents", poll)
+    monkeypatch.setattr(game, "_generate_additional_answers", lambda shortfalls: [[] for _ in shortfalls])
+
+    game.collect_answers(["Name a pie", "Name a cake"], on_question=on_question)
+
+    assert emitted == [1, 2]
@@ -0,0 +1,119 @@
+import io
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+pytest.importorskip("requests")
+pytest.importorskip("PIL")
+
+from PIL import Image  # noqa: E402
+
+from trivai_cache import SQLiteCache  # noqa: E402
+from trivai_image_proxy import ImageProxy  # noqa: E402
+
+SLOW_SECONDS = 2.0
+
+
+def make_original(width=1200, height=800):
+    output = io.BytesIO()
+    Image.effect_noise((width, height), 80).convert("RGB").save(output, "JPEG", quality=95)
+    return output.getvalue()
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """Third-party image hosts: a good one, one that rejects HEAD, a slow one and so on."""
+
+    original = b""
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, status, content_type="", body=b"", headers=()):
+        self.send_response(status)
+        if content_type:
+            self.send_header("Content-Type", content_type)
+        for name, value in headers:
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if self.command == "GET":
+            self.wfile.write(body)
+
+    def _route(self):
+        if self.path == "/photo.jpg":
+            return self._send(200, "image/jpeg", self.original)
+        if self.path == "/no-head.jpg":
+            if self.command == "HEAD":
+                return self._send(405)
+            return self._send(200, "image/jpeg", self.original)
+        if self.path == "/slow.jpg":
+            time.sleep(SLOW_SECONDS)
+            return self._send(200, "image/jpeg", self.original)
+        if self.path == "/page.html":
+            return self._send(200, "text/html", b"<html>not an image</html>")
+        if self.path == "/to-localhost":
+            port = self.server.server_address[1]
+            return self._send(302, headers=[("Location", f"http://localhost:{port}/photo.jpg")])
+        return self._send(404)
+
+    do_GET = _route
+    do_HEAD = _route
+
+
+@pytest.fixture(scope="module")
+def host():
+    StandInHandler.original = make_original()
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+    # The proxy hangs up on the slow host by design
+    server.handle_error = lambda request, client_address: None
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+
+
+def make_proxy(tmp_path, **kwargs):
+    sources = SQLiteCache("image_proxy", ttl=3600, max_entries=100, path=str(tmp_path / "cache.sqlite3"))
+    return ImageProxy(store_dir=str(tmp_path / "images"), url_prefix="https://api.example/api/v1/images",
+                      timeout=0.5, sources=sources, **kwargs)
+
+
+def test_first_working_candidate_is_stored_as_a_thumbnail(tmp_path, host):
+    proxy = make_proxy(tmp_path, allow_private=True, thumbnail_size=320)
+    results = proxy.localize_many({
+        "dead then good": [f"{host}/missing.jpg", f"{host}/photo.jpg"],
+        "slow then HEAD-less": [f"{host}/slow.jpg", f"{host}/no-head.jpg"],
+        "not an image": [f"{host}/page.html"],
+        "nothing found": [],
+    })
+
+    assert results["not an image"] is None and results["nothing found"] is None
+    # Both good hosts serve the same original, so they share one thumbnail
+    assert results["dead then good"] == results["slow then HEAD-less"]
+    url = results["dead then good"]
+    assert url.startswith("https://api.example/api/v1/images/")
+    with Image.open(proxy.path_for(url.rsplit("/", 1)[1])) as thumbnail:
+        assert max(thumbnail.size) == 320
+
+
+def test_private_hosts_and_other_schemes_are_refused(tmp_path, host):
+    proxy = make_proxy(tmp_path)
+
+    assert not proxy.is_allowed(f"{host}/photo.jpg")
+    assert not proxy.is_allowed("http://10.0.0.1/photo.jpg")
+    assert not proxy.is_allowed("http://[::1]/photo.jpg")
+    assert not proxy.is_allowed("file:///etc/passwd")
+    assert not proxy.is_allowed("ftp://example.com/photo.jpg")
+    assert proxy.localize([f"{host}/photo.jpg"]) is None
+    assert proxy.stats["stored"] == 0
+
+
+def test_redirects_to_private_hosts_are_not_followed(tmp_path, host, monkeypatch):
+    proxy = make_proxy(tmp_path)
+    # Let the stand-in's own address through, but not the localhost it redirects to
+    is_allowed = proxy.is_allowed
+    monkeypatch.setattr(proxy, "is_allowed", lambda url: url.startswith(host) or is_allowed(url))
+
+    assert proxy.probe(f"{host}/photo.jpg")
+    assert not proxy.probe(f"{host}/to-localhost")
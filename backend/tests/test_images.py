@@ -0,0 +1,62 @@
+import threading
+import time
+
+import pytest
+
+pytest.importorskip("serpapi")
+
+from trivai_cache import SQLiteCache  # noqa: E402
+from trivai_images import ImageSearchService  # noqa: E402
+
+
+class FakeSearch(ImageSearchService):
+    """Image search that answers from memory and records every API call."""
+
+    def __init__(self, cache, release=None, **kwargs):
+        super().__init__(cache=cache, **kwargs)
+        self.fetched = []
+        self.release = release
+
+    def _fetch(self, query):
+        self.fetched.append(query)
+        if self.release is not None:
+            self.release.wait(5)
+        return [f"https://images.example/{query.replace(' ', '-')}.jpg"]
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return SQLiteCache("image_search", ttl=60, max_entries=100, path=str(tmp_path / "cache.sqlite3"))
+
+
+def test_duplicate_queries_are_looked_up_once(cache):
+    service = FakeSearch(cache)
+    results = service.search_many(["Eiffel Tower", "eiffel  tower", "Louvre", "EIFFEL TOWER"])
+
+    assert sorted(service.fetched) == ["eiffel tower", "louvre"]
+    assert results["Eiffel Tower"] == results["EIFFEL TOWER"] == ["https://images.example/eiffel-tower.jpg"]
+
+    # A later batch is served from the cache
+    service.search_many(["Louvre"])
+    assert len(service.fetched) == 2
+    assert service.stats["cache_hits"] == 1
+
+
+def test_concurrent_searches_share_the_call_in_flight(cache):
+    release = threading.Event()
+    service = FakeSearch(cache, release=release)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(service.search("Big Ben"))) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    # Wait until the other two searches are parked on the first one's call
+    deadline = time.time() + 5
+    while service.stats["deduped"] < 2 and time.time() < deadline:
+        time.sleep(0.01)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert service.fetched == ["big ben"]
+    assert service.stats["deduped"] == 2
+    assert results == [["https://images.example/big-ben.jpg"]] * 3
@@ -0,0 +1,38 @@
+import pytest
+
+pytest.importorskip("crewai")
+pytest.importorskip("crewai_tools")
+
+from trivai_jeopardy import CategoryStreamParser  # noqa: E402
+
+
+def parse_streamed(text, chunk_size=3):
+    parser = CategoryStreamParser()
+    categories = []
+    for start in range(0, len(text), chunk_size):
+        categories += parser.feed(text[start:start + chunk_size])
+    return categories + parser.close()
+
+
+def test_streamed_categories_are_read_like_yaml():
+    text = (
+        "```yaml\n"
+        "categories:\n"
+        '  - "World Wars"\n'
+        "  - 'SPACE'\n"
+        "  - Famous Firsts  # unquoted\n"
+        "  - Note: these are fun\n"
+        '  - "WORLD WARS"\n'
+        "```\n"
+    )
+    assert parse_streamed(text) == ["WORLD WARS", "SPACE", "FAMOUS FIRSTS"]
+
+
+def test_items_outside_the_categories_list_are_ignored():
+    text = '- "INTRO"\ncategories:\n- "HISTORY"\nnotes:\n  - "NOT A CATEGORY"\n'
+    assert parse_streamed(text) == ["HISTORY"]
+
+
+def test_cut_off_item_is_dropped():
+    assert parse_streamed('categories:\n  - "A"\n  - "B') == ["A"]
+    assert parse_streamed('categories:\n  - "A"\n  - "B"') == ["A", "B"]
@@ -0,0 +1,22 @@
+from trivai_cache import SQLiteCache
+from trivai_personas import PersonaLibrary
+
+
+def persona(i):
+    return {"name": f"Person {i}", "age": 20 + 15 * (i % 4), "occupation": f"Job {i}", "traits": ["curious"]}
+
+
+def test_least_recently_sampled_personas_are_evicted_first(tmp_path):
+    store = SQLiteCache("personas", ttl=1e9, max_entries=4, path=str(tmp_path / "cache.sqlite3"))
+    library = PersonaLibrary(store, seed=1)
+    library.add([persona(i) for i in range(4)])
+    kept = {p["id"] for p in library.sample(2)}
+
+    library.add([persona(4), persona(5)])
+
+    remaining = {p["id"] for p in library.find()}
+    assert len(remaining) == 4
+    assert kept <= remaining
+    assert remaining == {key for key, _ in store.items()}
+    # Evicted personas are gone from every index, not just the store
+    assert {p["id"] for p in library.find(trait="curious")} == remaining
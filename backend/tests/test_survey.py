@@ -0,0 +1,19 @@
+import numpy as np
+
+from trivai_survey import simulate_question
+
+PERSONAS = [{"age": age} for age in (20, 35, 50, 65, 25, 40, 55, 70)]
+
+
+def test_intervals_reflect_persona_disagreement():
+    split = [{"pizza": 1.0}] * 4 + [{"sushi": 1.0}] * 4
+    top, _ = simulate_question(split, PERSONAS, respondents=1000, rng=np.random.default_rng(0))
+    pizza = next(answer for answer in top if answer["answer"] == "pizza")
+    # Eight personas can't pin a share down to the +-3% a 1000-draw panel would suggest
+    assert pizza["ci_high"] - pizza["ci_low"] > 0.3
+
+
+def test_intervals_collapse_when_personas_agree():
+    same = [{"pizza": 0.6, "tacos": 0.4}] * len(PERSONAS)
+    top, _ = simulate_question(same, PERSONAS, respondents=1000, rng=np.random.default_rng(0))
+    assert [(answer["ci_low"], answer["ci_high"]) for answer in top] == [(0.6, 0.6), (0.4, 0.4)]
@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Canonical forms for Feud survey answers.
+
+Respondents say the same thing in different ways: "Pizza", "pizza!",
+"a pizza", "pizzas", "Pizzza". Answers are normalized (case, accents,
+punctuation, list markers, leading articles), stemmed lightly and keyed by
+their token set; answers whose keys are a typo apart are clustered through
+a small token index, so counts reflect what people actually said.
+"""
+
+import random
+import re
+import unicodedata
+from collections import Counter, defaultdict
+from typing import Dict, Hashable, Iterable, List, Optional, Set
+
+LEADING_WORDS = frozenset(("a", "an", "the", "my", "your", "some"))
+# Answers shorter than this (in key characters) must match exactly
+MIN_FUZZY_LENGTH = 5
+# Words ending in "s" that aren't plurals; "-ss" words ("glass") are never plurals either
+NOT_PLURALS = frozenset((
+    "bus", "gas", "yes", "this", "his", "its", "plus", "news", "lens", "atlas", "canvas", "chaos",
+    "bonus", "campus", "cactus", "census", "chorus", "circus", "focus", "fungus", "genius",
+    "hummus", "octopus", "status", "virus", "walrus", "asparagus", "citrus", "platypus", "hippopotamus",
+    "tennis", "axis", "basis", "crisis", "oasis", "thesis", "iris", "analysis", "diagnosis",
+    "series", "species", "physics", "politics", "economics", "gymnastics", "measles",
+))
+
+_LIST_MARKER = re.compile(r"^\s*(?:\d+[.)]|[-*•])\s*")
+_NON_WORD = re.compile(r"[^a-z0-9' ]+")
+_DIGITS = re.compile(r"[^0-9]")
+
+
+def _drop_leading_words(words: List[str]) -> List[str]:
+    while len(words) > 1 and words[0] in LEADING_WORDS:
+        words = words[1:]
+    return words
+
+
+def clean_answer(text: str) -> str:
+    """Display form of an answer: lowercase, no list marker, outer punctuation or leading article."""
+    text = _LIST_MARKER.sub("", " ".join(str(text).lower().split()))
+    words = _drop_leading_words(text.strip(" .,;:!?\"'()[]").split())
+    return " ".join(words)
+
+
+def normalize_answer(text: str) -> str:
+    """Lowercase, strip accents, punctuation, list markers and leading articles."""
+    text = unicodedata.normalize("NFKD", str(text)).encode("ascii", "ignore").decode("ascii")
+    text = _LIST_MARKER.sub("", text.lower().replace("&", " and "))
+    words = [re.sub(r"'s$", "", word).strip("'") for word in _NON_WORD.sub(" ", text).split()]
+    return " ".join(_drop_leading_words([word for word in words if word]))
+
+
+def stem(word: str) -> str:
+    """Reduce a word to a stem its plural and verb forms share.
+
+    "parties" and "party" -> "partie", "movies" -> "movie", "buses" -> "bus",
+    "horses" and "horse" -> "hors", "menus" -> "menu", "walking" -> "walk".
+    Words ending in "ss" and those in NOT_PLURALS ("news", "virus") are kept.
+    """
+    if len(word) <= 2 or word.endswith("ss") or word in NOT_PLURALS:
+        return word
+    if word.endswith("s") and len(word) > 3:
+        word = word[:-1]
+    else:
+        for suffix in ("ing", "ed"):
+            if word.endswith(suffix) and len(word) - len(suffix) >= 4:
+                word = word[:-len(suffix)]
+                # "shopping" -> "shopp" -> "shop"
+                if len(word) > 3 and word[-1] == word[-2] and word[-1] not in "lsz":
+                    word = word[:-1]
+                return word
+    # "boxes" -> "boxe" -> "box" and "horse" -> "hors", so "-es" plurals
+    # match whether or not the singular ends in "e"
+    if len(word) > 3 and word.endswith("e") and word[:-1].endswith(("s", "x", "z", "ch", "sh")):
+        return word[:-1]
+    # "party" -> "partie", matching "parties" -> "partie"
+    if word.endswith("y") and word[-2] not in "aeiouy":
+        return word[:-1] + "ie"
+    return word
+
+
+def answer_key(text: str) -> str:
+    """Order-insensitive key of an answer's stemmed words."""
+    return " ".join(sorted(set(stem(word) for word in normalize_answer(text).split())))
+
+
+def edit_distance(a: str, b: str, limit: int) -> int:
+    """Levenshtein distance between a and b, or limit + 1 once it exceeds limit."""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb)))
+        if min(current) > limit:
+            return limit + 1
+        previous = current
+    return previous[-1]
+
+
+def _edit_limit(key: str) -> int:
+    if len(key) < MIN_FUZZY_LENGTH:
+        return 0
+    return 1 if len(key) < 10 else 2
+
+
+class AnswerCanonicalizer:
+    """Clusters answers that mean the same thing.
+
+    Each cluster is named after its most common spelling (the shortest on
+    ties), see clean_answer.
+    """
+
+    def __init__(self):
+        self._cluster_of_key: Dict[str, int] = {}
+        self._keys: List[str] = []
+        # Word prefix -> clusters with a word starting with it, to find typo candidates
+        self._index: Dict[str, Set[int]] = defaultdict(set)
+        self._spellings: List[Counter] = []
+
+    def _candidates(self, key: str) -> Set[int]:
+        found: Set[int] = set()
+        for word in key.split():
+            found |= self._index.get(word[:3], set())
+        return found
+
+    def _find(self, key: str) -> Optional[int]:
+        cluster = self._cluster_of_key.get(key)
+        if cluster is not None:
+            return cluster
+        limit = _edit_limit(key)
+        if not limit:
+            return None
+        best, best_distance = None, limit + 1
+        digits = _DIGITS.sub("", key)
+        for candidate in self._candidates(key):
+            other = self._keys[candidate]
+            # "2 kids" and "3 kids" are different answers, however close
+            if _DIGITS.sub("", other) != digits:
+                continue
+            # Both keys have to be long enough for the distance: "pie" is no typo of "apple pie"
+            allowed = min(limit, _edit_limit(other))
+            if not allowed:
+                continue
+            distance = edit_distance(key, other, allowed)
+            if distance <= allowed and distance < best_distance:
+                best, best_distance = candidate, distance
+        return best
+
+    def add(self, answer: str, weight: float = 1) -> Optional[int]:
+        """Record an answer and return its cluster, or None for an empty answer.
+
+        weight is how much this spelling counts towards naming the cluster.
+        """
+        spelling = clean_answer(answer)
+        key = answer_key(answer)
+        if not key:
+            return None
+        cluster = self._find(key)
+        if cluster is None:
+            cluster = len(self._keys)
+            self._keys.append(key)
+            self._spellings.append(Counter())
+            for word in key.split():
+                self._index[word[:3]].add(cluster)
+        self._cluster_of_key[key] = cluster
+        self._spellings[cluster][spelling] += weight
+        return cluster
+
+    def contains(self, answer: str) -> bool:
+        """Whether answer would join an existing cluster."""
+        key = answer_key(answer)
+        return bool(key) and self._find(key) is not None
+
+    def name(self, cluster: int) -> str:
+        spellings = self._spellings[cluster]
+        return min(spellings, key=lambda spelling: (-spellings[spelling], len(spelling), spelling))
+
+    def counts(self) -> List[Dict[str, object]]:
+        """Clusters as {'answer', 'count'} dicts, most common first."""
+        counted = [{'answer': self.name(i), 'count': sum(spellings.values())}
+                   for i, spellings in enumerate(self._spellings)]
+        return sorted(counted, key=lambda a: (-a['count'], a['answer']))
+
+
+def count_answers(answers: Iterable[str]) -> List[Dict[str, object]]:
+    """Count answers by canonical form, most common first."""
+    canonicalizer = AnswerCanonicalizer()
+    for answer in answers:
+        if answer:
+            canonicalizer.add(answer)
+    return canonicalizer.counts()
+
+
+def _top(counts: Counter, k: int, rng: random.Random) -> Set[Hashable]:
+    # Ties are broken at random, so a top k that only holds by tie-break doesn't look settled
+    return {answer for answer, _ in sorted(counts.items(), key=lambda item: (-item[1], rng.random()))[:k]}
+
+
+def top_k_stability(answers: List[Hashable], k: int, rounds: int = 200, seed: int = 0) -> float:
+    """Bootstrap estimate of how settled the k most common answers are.
+
+    Args:
+        answers: One canonical answer (e.g. cluster id) per respondent
+        k: How many top answers have to settle
+        rounds: Bootstrap resamples
+        seed: Seed for the resampling, so the estimate is repeatable
+
+    Returns:
+        The average share of the observed top k that is also in the top k
+        of a resample of the respondents, from 0 (no answers) to 1
+    """
+    if not answers:
+        return 0.0
+    rng = random.Random(seed)
+    observed = _top(Counter(answers), k, rng)
+    overlap = 0
+    for _ in range(rounds):
+        overlap += len(observed & _top(Counter(rng.choices(answers, k=len(answers))), k, rng))
+    return overlap / (rounds * len(observed))
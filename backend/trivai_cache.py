@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Persistent key/value cache shared by the game generators.
+
+Entries live in a single SQLite file, partitioned by namespace (one per
+kind of cached result). Each namespace has its own TTL and entry limit;
+reads past the TTL miss unless the caller allows expired entries, and
+writes evict the least recently used entries once the limit is exceeded.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+
+TRIVAI_CACHE_DB = os.getenv(
+    "TRIVAI_CACHE_DB",
+    os.path.join(BACKEND_DIR, "game_outputs", "cache", "trivai_cache.sqlite3")
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    namespace TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    accessed_at REAL NOT NULL,
+    PRIMARY KEY (namespace, key)
+);
+CREATE INDEX IF NOT EXISTS entries_lru ON entries (namespace, accessed_at);
+"""
+
+# One connection per database file, shared by every namespace in the process
+_connections: Dict[str, sqlite3.Connection] = {}
+_connections_lock = threading.Lock()
+
+
+def _connect(path: str) -> sqlite3.Connection:
+    with _connections_lock:
+        conn = _connections.get(path)
+        if conn is None:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            conn = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+            # WAL lets the API server and CLI runs share the file
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+            _connections[path] = conn
+        return conn
+
+
+class SQLiteCache:
+    """A namespaced, TTL- and size-bounded JSON cache in a SQLite file.
+
+    Safe to share between threads. Values are stored as JSON, so anything
+    json.dumps accepts round-trips (other objects are stored as strings).
+    """
+
+    def __init__(self, namespace: str, ttl: float, max_entries: int, path: str = TRIVAI_CACHE_DB):
+        self.namespace = namespace
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.path = path
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "expired": 0, "writes": 0, "errors": 0}
+
+    @property
+    def _conn(self) -> sqlite3.Connection:
+        return _connect(self.path)
+
+    def get(self, key: str, allow_expired: bool = False) -> Optional[Any]:
+        """Return the cached value for key, or None on a miss.
+
+        Args:
+            key: Cache key within this namespace
+            allow_expired: Serve entries past their TTL instead of missing
+
+        Returns:
+            The decoded value, or None
+        """
+        now = time.time()
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT value, created_at FROM entries WHERE namespace = ? AND key = ?",
+                    (self.namespace, key)
+                ).fetchone()
+                if row is None:
+                    self.stats["misses"] += 1
+                    return None
+                if now - row[1] > self.ttl and not allow_expired:
+                    self.stats["expired"] += 1
+                    return None
+                self._conn.execute(
+                    "UPDATE entries SET accessed_at = ? WHERE namespace = ? AND key = ?",
+                    (now, self.namespace, key)
+                )
+                self.stats["hits"] += 1
+            return json.loads(row[0])
+        except (sqlite3.Error, ValueError) as e:
+            self.stats["errors"] += 1
+            logger.error(f"Error reading {self.namespace} cache entry: {e}")
+            return None
+
+    def put(self, key: str, value: Any) -> List[str]:
+        """Store value under key and evict least recently used entries over the limit.
+
+        Returns:
+            The keys evicted to make room
+        """
+        now = time.time()
+        try:
+            data = json.dumps(value, default=str)
+            with self._lock:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO entries (namespace, key, value, created_at, accessed_at) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (self.namespace, key, data, now, now)
+                )
+                evicted = [row[0] for row in self._conn.execute(
+                    "SELECT key FROM entries WHERE namespace = ? ORDER BY accessed_at DESC LIMIT -1 OFFSET ?",
+                    (self.namespace, self.max_entries)
+                ).fetchall()]
+                self._conn.executemany(
+                    "DELETE FROM entries WHERE namespace = ? AND key = ?",
+                    [(self.namespace, evicted_key) for evicted_key in evicted]
+                )
+                self.stats["writes"] += 1
+            return evicted
+        except (sqlite3.Error, TypeError, ValueError) as e:
+            self.stats["errors"] += 1
+            logger.error(f"Error writing {self.namespace} cache entry: {e}")
+            return []
+
+    def touch(self, keys: List[str]) -> None:
+        """Mark entries as just used, for eviction, without reading them."""
+        now = time.time()
+        try:
+            with self._lock:
+                self._conn.executemany(
+                    "UPDATE entries SET accessed_at = ? WHERE namespace = ? AND key = ?",
+                    [(now, self.namespace, key) for key in keys]
+                )
+        except sqlite3.Error as e:
+            self.stats["errors"] += 1
+            logger.error(f"Error touching {self.namespace} cache entries: {e}")
+
+    def items(self) -> List[Tuple[str, Any]]:
+        """Return every unexpired (key, value) pair in this namespace.
+
+        Unlike get, this doesn't count as an access for eviction or stats.
+        """
+        try:
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT key, value FROM entries WHERE namespace = ? AND created_at >= ? ORDER BY created_at",
+                    (self.namespace, time.time() - self.ttl)
+                ).fetchall()
+            return [(key, json.loads(value)) for key, value in rows]
+        except (sqlite3.Error, ValueError) as e:
+            self.stats["errors"] += 1
+            logger.error(f"Error listing {self.namespace} cache entries: {e}")
+            return []
+
+    def clear(self) -> None:
+        """Remove every entry in this namespace."""
+        with self._lock:
+            self._conn.execute("DELETE FROM entries WHERE namespace = ?", (self.namespace,))
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM entries WHERE namespace = ?", (self.namespace,)
+            ).fetchone()[0]
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Condense scraped pages to the paragraphs that matter for a prompt.
+
+ScrapeWebsiteTool returns a page's whole text: navigation, cookie banners,
+footers and every section of the article. condense keeps the main-content
+paragraphs, ranks them against a focus string (the category and theme)
+with BM25, and returns the best ones, in page order, within a character
+budget. Everything is local and lexical; no model calls.
+"""
+
+import math
+import os
+import re
+from collections import Counter
+from typing import List
+
+# Longest excerpt handed to an agent, in characters (~4 per token)
+SCRAPE_EXCERPT_CHARS = int(os.getenv("SCRAPE_EXCERPT_CHARS", "4000"))
+# Paragraphs with fewer words are treated as navigation or boilerplate
+MIN_PARAGRAPH_WORDS = 8
+# Unbroken text is cut into chunks of about this many characters
+CHUNK_CHARS = 600
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+STOPWORDS = frozenset("""
+a about above after again against all also am an and any are as at be because been before being
+below between both but by can could did do does doing down during each few for from further had
+has have having he her here hers herself him himself his how i if in into is it its itself just
+me more most my myself no nor not now of off on once only or other our ours ourselves out over own
+same she should so some such than that the their theirs them themselves then there these they this
+those through to too under until up very was we were what when where which while who whom why will
+with would you your yours yourself yourselves
+""".split())
+
+_WORD = re.compile(r"[a-z0-9]+")
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase content words of text."""
+    return [word for word in _WORD.findall(text.lower()) if len(word) > 1 and word not in STOPWORDS]
+
+
+def split_paragraphs(text: str) -> List[str]:
+    """Split page text into whitespace-normalized paragraphs.
+
+    Lines are paragraphs; lines much longer than CHUNK_CHARS (pages with no
+    line breaks) are cut at sentence boundaries.
+    """
+    paragraphs = []
+    for line in text.splitlines():
+        line = " ".join(line.split())
+        if len(line) <= 2 * CHUNK_CHARS:
+            if line:
+                paragraphs.append(line)
+            continue
+        chunk = ""
+        for sentence in _SENTENCE_END.split(line):
+            if chunk and len(chunk) + len(sentence) > CHUNK_CHARS:
+                paragraphs.append(chunk)
+                chunk = ""
+            chunk = f"{chunk} {sentence}".strip()
+        if chunk:
+            paragraphs.append(chunk)
+    return paragraphs
+
+
+def main_paragraphs(paragraphs: List[str]) -> List[str]:
+    """Drop short and repeated paragraphs (menus, buttons, footers)."""
+    seen = set()
+    kept = []
+    for paragraph in paragraphs:
+        if len(paragraph.split()) < MIN_PARAGRAPH_WORDS or paragraph in seen:
+            continue
+        seen.add(paragraph)
+        kept.append(paragraph)
+    return kept
+
+
+def bm25_scores(paragraphs: List[str], query: str) -> List[float]:
+    """Score each paragraph against query with BM25, paragraphs as the corpus."""
+    terms = set(tokenize(query))
+    if not terms or not paragraphs:
+        return [0.0] * len(paragraphs)
+    docs = [Counter(tokenize(paragraph)) for paragraph in paragraphs]
+    avg_length = sum(sum(doc.values()) for doc in docs) / len(docs) or 1.0
+    idf = {}
+    for term in terms:
+        df = sum(1 for doc in docs if term in doc)
+        idf[term] = math.log(1 + (len(docs) - df + 0.5) / (df + 0.5))
+
+    scores = []
+    for doc in docs:
+        length = sum(doc.values())
+        score = 0.0
+        for term in terms:
+            tf = doc.get(term, 0)
+            if tf:
+                score += idf[term] * tf * (BM25_K1 + 1) / (tf + BM25_K1 * (1 - BM25_B + BM25_B * length / avg_length))
+        scores.append(score)
+    return scores
+
+
+def condense(text: str, focus: str = "", max_chars: int = SCRAPE_EXCERPT_CHARS) -> str:
+    """Return the most relevant excerpt of a scraped page.
+
+    Args:
+        text: Page text as returned by the scrape tool
+        focus: What the excerpt should be about, e.g. "WORLD CAPITALS European geography"
+        max_chars: Character budget for the excerpt
+
+    Returns:
+        text unchanged if it already fits, otherwise the best-scoring main
+        paragraphs in page order (the leading ones when nothing matches focus)
+    """
+    if not isinstance(text, str) or len(text) <= max_chars:
+        return text
+
+    paragraphs = main_paragraphs(split_paragraphs(text))
+    if not paragraphs:
+        return text[:max_chars]
+
+    scores = bm25_scores(paragraphs, focus)
+    # Earlier paragraphs win ties, which also orders unmatched pages by position
+    ranked = sorted(range(len(paragraphs)), key=lambda i: (-scores[i], i))
+
+    chosen = []
+    used = 0
+    for i in ranked:
+        if used + len(paragraphs[i]) > max_chars:
+            if used:
+                continue
+            # A single paragraph over budget is cut rather than dropped
+            chosen.append(i)
+            break
+        chosen.append(i)
+        used += len(paragraphs[i]) + 2
+    excerpt = "\n\n".join(paragraphs[i] for i in sorted(chosen))
+    return excerpt[:max_chars]
@@ -4,6 +4,7 @@ from typing import List, Dict, Any
 from crewai import Agent, Task, Crew, Process
 from pydantic import BaseModel
 from dotenv import load_dotenv
+from trivai_parsing import loads_json
 from enum import Enum
 import random
 
@@ -28,6 +29,8 @@ class ConnectionsGame:
         self.theme = theme
         self.num_groups = 4
         self.items_per_group = 4
+        # Set when the default groups stand in for a failed generation
+        self.degraded = False
         self.openai_api_key = os.getenv("OPENAI_API_KEY")
         if not self.openai_api_key:
             raise ValueError("OPENAI_API_KEY environment variable not set")
@@ -77,16 +80,8 @@ class ConnectionsGame:
         
         try:
             result = crew.kickoff()
-            # Clean and parse the JSON response
-            result = str(result).strip()
-            if '```json' in result:
-                result = result.split('```json')[1].split('```')[0].strip()
-            elif '```' in result:
-                result = result.split('```')[1].strip()
-                if result.startswith('json'):
-                    result = result[4:].strip()
-            
-            categories_data = json.loads(result)
+            # Parse the JSON response, unwrapping markdown if needed
+            categories_data = loads_json(str(result))
             
             # Convert to ConnectionsGroup objects
             groups = []
@@ -109,6 +104,7 @@ class ConnectionsGame:
     
     def _get_default_groups(self) -> List[ConnectionsGroup]:
         """Return some default groups if AI generation fails."""
+        self.degraded = True
         return [
             ConnectionsGroup(
                 category=f"{self.theme} Colors",
@@ -137,7 +133,7 @@ def generate_connections_game(theme: str = "general", num_groups: int = 4, items
     groups = game.generate_groups()
     
     # Convert to the format expected by the frontend
-    return {
+    game_data = {
         "groups": [
             {
                 "category": group.category,
@@ -147,6 +143,9 @@ def generate_connections_game(theme: str = "general", num_groups: int = 4, items
             for group in groups
         ]
     }
+    if game.degraded:
+        game_data["degraded"] = True
+    return game_data
 
 if __name__ == "__main__":
     # Example usage
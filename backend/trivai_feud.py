@@ -1,34 +1,140 @@
 import os
 import re
 import yaml
-import json
+import time
 import argparse
-from typing import List, Dict, Any, Optional
+import threading
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, List, Optional, Tuple
 from crewai import Agent, Task, Crew, Process
 from pydantic import BaseModel
 from dotenv import load_dotenv
+from trivai_parsing import loads_json
+from trivai_answers import AnswerCanonicalizer, top_k_stability
+from trivai_cache import SQLiteCache
+from trivai_personas import PersonaLibrary, persona_id, persona_library
+from trivai_survey import FEUD_PANEL_SIZE, parse_distribution, simulate_question
+from trivai_stages import StageGraph
 
 load_dotenv()
 
+# Respondents polled at once; 1 keeps the old one-after-another behaviour
+DEFAULT_MAX_CONCURRENCY = int(os.getenv("FEUD_MAX_CONCURRENCY", "10"))
+# Seconds a respondent may take before it is dropped from the panel
+DEFAULT_RESPONDENT_TIMEOUT = float(os.getenv("FEUD_RESPONDENT_TIMEOUT", "60"))
+# "agents": one crew per persona; "batched": one call role-plays batch_size personas;
+# "panel": personas give answer distributions and panel_size respondents are simulated
+SURVEY_MODES = ("agents", "batched", "panel")
+DEFAULT_SURVEY_MODE = os.getenv("FEUD_SURVEY_MODE", "agents")
+DEFAULT_SURVEY_BATCH_SIZE = int(os.getenv("FEUD_SURVEY_BATCH_SIZE", "10"))
+# Questions surveyed per panel poll; each group streams out once its own answers are in,
+# smaller groups stream sooner but take more calls
+DEFAULT_SURVEY_GROUP_SIZE = int(os.getenv("FEUD_SURVEY_GROUP_SIZE", "2"))
+# Sample panels from the shared persona library instead of generating them per game
+DEFAULT_USE_PERSONA_LIBRARY = os.getenv("FEUD_PERSONA_LIBRARY", "1").lower() in ("1", "true", "yes")
+# Reuse a persona's earlier answer to the same question instead of asking again
+DEFAULT_USE_ANSWER_STORE = os.getenv("FEUD_ANSWER_STORE", "1").lower() in ("1", "true", "yes")
+# Poll respondents in waves and stop once the top answers settle; num_agents is the cap
+DEFAULT_EARLY_STOPPING = os.getenv("FEUD_EARLY_STOPPING", "1").lower() in ("1", "true", "yes")
+DEFAULT_NUM_AGENTS = int(os.getenv("FEUD_NUM_AGENTS", "10"))
+DEFAULT_WAVE_SIZE = int(os.getenv("FEUD_WAVE_SIZE", "5"))
+# Respondents that must answer before polling may stop; 0 means half the cap
+DEFAULT_MIN_RESPONDENTS = int(os.getenv("FEUD_MIN_RESPONDENTS", "0"))
+# Share of the top answers that survive bootstrap resampling, for every question
+DEFAULT_STABILITY_THRESHOLD = float(os.getenv("FEUD_STABILITY_THRESHOLD", "0.85"))
+DEFAULT_STABILITY_TOP_K = int(os.getenv("FEUD_STABILITY_TOP_K", "5"))
+# Answers a question needs for its board to be playable; games with fewer are marked degraded
+FEUD_MIN_ANSWERS = int(os.getenv("FEUD_MIN_ANSWERS", "5"))
+FEUD_ANSWER_TTL = int(os.getenv("FEUD_ANSWER_TTL", str(90 * 24 * 60 * 60)))
+FEUD_ANSWER_MAX_ENTRIES = int(os.getenv("FEUD_ANSWER_MAX_ENTRIES", "200000"))
+
+answer_store = SQLiteCache("feud_answers", ttl=FEUD_ANSWER_TTL, max_entries=FEUD_ANSWER_MAX_ENTRIES)
+
+
+def normalize_question(question: str) -> str:
+    """Normalize a question for answer lookups: case, contractions, punctuation, spacing."""
+    question = question.lower().replace("\u2019", "'")
+    question = re.sub(r"\b(what|who|where|how|that|it)'s\b", r"\1 is", question)
+    question = re.sub(r"[^a-z0-9' ]+", " ", question)
+    return " ".join(question.split())
+
+
 class FeudGame:
     """A class to generate Family Feud style games using AI agents."""
     
-    def __init__(self, theme: str, num_questions: int = 5, num_agents: int = 10):
+    def __init__(self, theme: str, num_questions: int = 5, num_agents: int = DEFAULT_NUM_AGENTS,
+                 max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+                 respondent_timeout: float = DEFAULT_RESPONDENT_TIMEOUT,
+                 survey_mode: str = DEFAULT_SURVEY_MODE,
+                 batch_size: int = DEFAULT_SURVEY_BATCH_SIZE,
+                 group_size: int = DEFAULT_SURVEY_GROUP_SIZE,
+                 use_persona_library: bool = DEFAULT_USE_PERSONA_LIBRARY,
+                 library: Optional[PersonaLibrary] = None,
+                 use_answer_store: bool = DEFAULT_USE_ANSWER_STORE,
+                 answers: Optional[SQLiteCache] = None,
+                 early_stopping: bool = DEFAULT_EARLY_STOPPING,
+                 wave_size: int = DEFAULT_WAVE_SIZE,
+                 min_respondents: int = DEFAULT_MIN_RESPONDENTS,
+                 stability_threshold: float = DEFAULT_STABILITY_THRESHOLD,
+                 stability_top_k: int = DEFAULT_STABILITY_TOP_K,
+                 panel_size: int = FEUD_PANEL_SIZE):
         """Initialize the FeudGame with theme and configuration."""
+        if survey_mode not in SURVEY_MODES:
+            raise ValueError(f"Unknown survey mode {survey_mode}, expected one of {SURVEY_MODES}")
         self.theme = theme
         self.num_questions = num_questions
         self.num_agents = num_agents
+        self.max_concurrency = max(1, max_concurrency)
+        self.respondent_timeout = respondent_timeout
+        self.survey_mode = survey_mode
+        self.batch_size = max(1, batch_size)
+        self.group_size = max(1, group_size)
+        self.library = (library if library is not None else persona_library) if use_persona_library else None
+        self.answer_store = (answers if answers is not None else answer_store) if use_answer_store else None
+        self.panel_size = panel_size
+        # Progress callback for the current generate_game call, see generate_game
+        self.on_event: Optional[Callable[[str, Dict[str, Any]], None]] = None
+        self.early_stopping = early_stopping
+        self.wave_size = max(1, wave_size)
+        # Below the cap, or early stopping could never end the poll early
+        self.min_respondents = min(min_respondents or max(1, num_agents // 2), num_agents)
+        self.stability_threshold = stability_threshold
+        self.stability_top_k = max(1, stability_top_k)
+        # Respondents polled out of the panel, and survey calls made, summed over question groups
+        self.poll_stats = {"polled": 0, "panel": 0, "calls": 0}
+        # Persona answers served from / missing in the answer store this game
+        self.answer_stats = {"hits": 0, "misses": 0}
+        # Guards the stats above, which question groups surveyed at once both update
+        self._stats_lock = threading.Lock()
         self.agents = []
         self.personalities = []
+        # Agents (by index) whose timed-out survey call is still running
+        self._busy_agents: Dict[int, Future] = {}
+        self._agents_lock = threading.Lock()
+        # Set once generate_game is done with the respondents, see _release_respondents
+        self._finished = False
+        # Seconds each generation stage took, see build_stages
+        self.stage_timings: Dict[str, float] = {}
         
         # Initialize OpenAI API key
         self.openai_api_key = os.getenv("OPENAI_API_KEY")
         if not self.openai_api_key:
             raise ValueError("OPENAI_API_KEY environment variable not set")
 
-    def generate_personalities(self) -> List[Dict[str, Any]]:
-        """Generate diverse personalities for AI agents."""
-        print("Generating personalities...")
+    def generate_personalities(self, age_bands: Optional[Dict[str, int]] = None) -> List[Dict[str, Any]]:
+        """Generate diverse personalities for AI agents.
+
+        Args:
+            age_bands: How many profiles to create per age range, e.g.
+                {"18-29": 3}; defaults to num_agents across all ages
+        """
+        count = sum(age_bands.values()) if age_bands else self.num_agents
+        if age_bands:
+            ages = ", ".join(f"{n} aged {band}" for band, n in age_bands.items())
+            age_rule = f"Ages must be exactly: {ages}"
+        else:
+            age_rule = "Age groups (young adults to seniors)"
+        print(f"Generating {count} personalities...")
         personality_agent = Agent(
             role="Personality Creator",
             goal="Create diverse and realistic personality profiles",
@@ -37,7 +143,7 @@ class FeudGame:
         )
         
         task = Task(
-            description=f"""Create {self.num_agents} diverse personality profiles for our survey respondents.
+            description=f"""Create {count} diverse personality profiles for our survey respondents.
             Each profile should include:
             - name: Full name
             - age: Integer between 18-80
@@ -47,7 +153,7 @@ class FeudGame:
             - perspective: 1 sentence about their worldview
             
             Make sure the profiles are diverse in:
-            - Age groups (young adults to seniors)
+            - {age_rule}
             - Professions
             - Backgrounds
             - Perspectives
@@ -55,7 +161,7 @@ class FeudGame:
             Return ONLY a valid JSON array of objects, no other text.
             """,
             agent=personality_agent,
-            expected_output=f"A JSON array of {self.num_agents} personality profiles"
+            expected_output=f"A JSON array of {count} personality profiles"
         )
         
         crew = Crew(
@@ -67,12 +173,8 @@ class FeudGame:
         
         try:
             result = crew.kickoff()
-            # Clean and parse the JSON response
-            result = str(result)
-            result = result.strip()
-            if '```json' in result:
-                result = result.split('```json')[1].split('```')[0].strip()
-            return json.loads(result)
+            # Parse the JSON response, unwrapping markdown if needed
+            return loads_json(str(result))
         except Exception as e:
             print(f"Error generating personalities: {e}")
             return []
@@ -131,8 +233,18 @@ class FeudGame:
             print(f"Error generating questions: {e}")
             return []
 
-    def _generate_additional_answers(self, question: str, existing_answers: List[str], count: int) -> List[str]:
-        """Generate additional answers to ensure we have enough unique answers."""
+    def _generate_additional_answers(self, shortfalls: List[Tuple[str, List[str], int]]) -> List[List[str]]:
+        """Generate additional answers for every short question in a single call.
+
+        Args:
+            shortfalls: (question, existing answers, answers wanted) per
+                question that needs more answers
+
+        Returns:
+            The new answers for each entry of shortfalls, in order
+        """
+        if not shortfalls:
+            return []
         try:
             answer_agent = Agent(
                 role="Answer Generator",
@@ -141,24 +253,27 @@ class FeudGame:
                 verbose=True
             )
             
-            existing_str = "\n".join([f"- {ans}" for ans in existing_answers])
+            questions_str = "\n\n".join(
+                f"""QUESTION {i+1}: {question}
+                ANSWERS NEEDED: {count}
+                EXISTING ANSWERS (do not repeat these): {', '.join(existing) or 'none'}"""
+                for i, (question, existing, count) in enumerate(shortfalls)
+            )
             
             task = Task(
-                description=f"""Generate {count} additional unique answers to this question:
-                
-                QUESTION: {question}
+                description=f"""Generate additional unique answers for each of these survey questions:
                 
-                EXISTING ANSWERS (do not repeat these):
-                {existing_str}
+                {questions_str}
                 
                 RULES:
                 1. Each answer must be 1-3 words
-                2. Must be different from all existing answers
+                2. Must be different from all existing answers to that question
                 3. Should be plausible and relevant to the question
-                4. Return only the answers, one per line
+                4. Return ONLY a valid JSON array with one object per question, no other text:
+                [{{"question": 1, "answers": ["answer", "answer"]}}]
                 """,
                 agent=answer_agent,
-                expected_output=f"{count} unique answers, one per line"
+                expected_output=f"A JSON array of {len(shortfalls)} objects with the new answers for each question"
             )
             
             crew = Crew(
@@ -168,13 +283,22 @@ class FeudGame:
                 verbose=False
             )
             
-            result = crew.kickoff()
-            new_answers = [a.strip() for a in str(result).split('\n') if a.strip()]
-            return new_answers[:count]  # Return only the requested number of answers
-            
+            rows = loads_json(str(crew.kickoff()))
         except Exception as e:
             print(f"Error generating additional answers: {e}")
-            return []
+            return [[] for _ in shortfalls]
+        
+        by_number = {}
+        for row in rows if isinstance(rows, list) else []:
+            if isinstance(row, dict) and isinstance(row.get('answers'), list):
+                try:
+                    by_number[int(row.get('question'))] = row['answers']
+                except (TypeError, ValueError):
+                    continue
+        return [
+            [str(a).strip() for a in by_number.get(i + 1, []) if a and str(a).strip()][:count]
+            for i, (_, _, count) in enumerate(shortfalls)
+        ]
     
     def _get_agent_answers(self, agent: Agent, questions: List[str]) -> List[str]:
         """Get answers from a single agent for all questions."""
@@ -219,116 +343,637 @@ class FeudGame:
             traceback.print_exc()
             return [''] * len(questions)
 
-    def collect_answers(self, questions: List[str]) -> List[Dict[str, Any]]:
-        """Collect and process answers for all questions from all agents."""
+    def _ask_batch(self, personas: List[Dict[str, Any]], questions: List[str], instructions: str,
+                   example: str, label: str) -> Optional[Dict[str, List[Any]]]:
+        """Have one agent role-play a batch of personas and answer for each.
+
+        The response is a JSON array with a row per persona, tagged with the
+        persona's id (R1, R2, ...) so rows can't be attributed to the wrong
+        respondent.
+
+        Returns:
+            Each returned row's per-question entries by persona id, or None
+            if the call failed
+        """
+        ids = [f"R{i+1}" for i in range(len(personas))]
+        print(f"\n=== Getting {label} from a batch of {len(personas)} personas ===")
+        personas_text = "\n".join(
+            f"{rid}. {p.get('name', rid)}, {p.get('age', '30')}, {p.get('occupation', 'General')}. "
+            f"{p.get('background', '')} Traits: {', '.join(p.get('traits', []) or [])}. {p.get('perspective', '')}"
+            for rid, p in zip(ids, personas)
+        )
+        questions_text = "\n".join(f"{i+1}. {q}" for i, q in enumerate(questions))
+
+        panel_agent = Agent(
+            role="Survey Panel",
+            goal="Answer survey questions in the voice of each respondent on the panel",
+            backstory="You play every member of a survey panel, answering as each of them would, independently of the others.",
+            max_execution_time=int(self.respondent_timeout),
+            verbose=True
+        )
+        task = Task(
+            description=f"""You are running a Family Feud style survey panel.
+    {instructions}
+
+    RESPONDENTS:
+    {personas_text}
+
+    QUESTIONS:
+    {questions_text}
+
+    Return ONLY a valid JSON array with one object per respondent, no other text:
+    [{{"id": "R1", "answers": {example}}}]""",
+            agent=panel_agent,
+            expected_output=f"A JSON array of {len(personas)} objects with {len(questions)} answers each"
+        )
+        crew = Crew(
+            agents=[panel_agent],
+            tasks=[task],
+            process=Process.sequential,
+            verbose=True
+        )
+
+        try:
+            rows = loads_json(str(crew.kickoff()))
+        except Exception as e:
+            print(f"Error getting {label} from persona batch: {str(e)}")
+            return None
+
+        if isinstance(rows, dict):
+            # {"R1": [...], ...}
+            rows = [{'id': key, 'answers': value} for key, value in rows.items()]
+        by_id = {}
+        for row in rows if isinstance(rows, list) else []:
+            if isinstance(row, dict) and isinstance(row.get('answers'), list) and row['answers']:
+                by_id[str(row.get('id', '')).strip().upper()] = row['answers'][:len(questions)]
+        print(f"Batch answered for {sum(1 for rid in ids if rid in by_id)}/{len(personas)} personas")
+        return {rid: by_id[rid] for rid in ids if rid in by_id}
+
+    def _get_batch_answers(self, personas: List[Dict[str, Any]], questions: List[str]) -> List[Optional[List[str]]]:
+        """Get answers from a batch of personas in a single call.
+
+        Returns:
+            Each persona's answers, in the order of personas, or None for
+            personas missing from the response
+        """
+        by_id = self._ask_batch(
+            personas, questions,
+            instructions="""Answer every question as each of these respondents would, based on their age, job,
+    background and outlook. Each respondent answers on their own; different people
+    may give the same answer. Each answer is 1-3 words.""",
+            example='["answer to question 1", "answer to question 2"]',
+            label="answers"
+        ) or {}
+
+        results: List[Optional[List[str]]] = []
+        for i in range(len(personas)):
+            answers = by_id.get(f"R{i+1}")
+            if not answers:
+                results.append(None)
+                continue
+            answers = [str(a).strip() if a is not None else '' for a in answers]
+            results.append(answers + [''] * (len(questions) - len(answers)))
+        return results
+
+    def _get_batch_distributions(self, personas: List[Dict[str, Any]],
+                                 questions: List[str]) -> List[Optional[List[Optional[Dict[str, float]]]]]:
+        """Get each persona's answer distribution for every question in a single call.
+
+        Returns:
+            For each persona, one {answer: probability} per question (None
+            where unusable), or None for personas missing from the response
+        """
+        by_id = self._ask_batch(
+            personas, questions,
+            instructions="""For every question, give the 1-3 answers each of these respondents would most likely
+    give, based on their age, job, background and outlook, with how likely they are to
+    give each one (probabilities adding up to 1). Each answer is 1-3 words.""",
+            example='[{"answer A": 0.6, "answer B": 0.3, "answer C": 0.1}, {"answer D": 1.0}]',
+            label="answer distributions"
+        ) or {}
+
+        results = []
+        for i in range(len(personas)):
+            entries = by_id.get(f"R{i+1}")
+            if not entries:
+                results.append(None)
+                continue
+            distributions = [parse_distribution(entry) for entry in entries]
+            results.append(distributions + [None] * (len(questions) - len(distributions)))
+        return results
+
+    def _poll_panel(self, calls: List[Tuple[str, Callable[[], Any]]],
+                    on_abandoned: Optional[Callable[[int, Future], None]] = None) -> List[Any]:
+        """Run survey calls up to max_concurrency at a time.
+
+        Args:
+            calls: (label, call) pairs; label is used in log messages
+            on_abandoned: Called with (index, future) for each call still
+                running when the poll gives up on it
+
+        Returns:
+            Each call's result, in order, or None for calls that failed or took
+            longer than respondent_timeout
+        """
+        results: List[Any] = [None] * len(calls)
+        if not calls:
+            return results
+        started: Dict[int, float] = {}
+
+        def run(index: int, call: Callable[[], Any]) -> Any:
+            started[index] = time.monotonic()
+            return call()
+
+        workers = min(self.max_concurrency, len(calls))
+        executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="feud-respondent")
+        futures = {executor.submit(run, i, call): i for i, (_, call) in enumerate(calls)}
+        pending = set(futures)
+        timed_out = []
+        try:
+            while pending:
+                # Wake up for the next call to finish or to run out of time
+                deadlines = [started[futures[f]] + self.respondent_timeout for f in pending if futures[f] in started]
+                timeout = max(0.0, min(deadlines) - time.monotonic()) if deadlines else 0.1
+                done, pending = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+
+                for future in done:
+                    index = futures[future]
+                    try:
+                        results[index] = future.result()
+                    except Exception as e:
+                        print(f"Error processing answers from {calls[index][0]}: {str(e)}")
+
+                now = time.monotonic()
+                for future in list(pending):
+                    index = futures[future]
+                    if index in started and now - started[index] >= self.respondent_timeout:
+                        print(f"{calls[index][0]} timed out after {self.respondent_timeout}s")
+                        pending.discard(future)
+                        timed_out.append(future)
+        finally:
+            # Timed-out calls can't be interrupted; let them finish in the background
+            executor.shutdown(wait=False, cancel_futures=True)
+            for future in timed_out + list(pending) if on_abandoned else []:
+                if not future.done():
+                    on_abandoned(futures[future], future)
+        return results
+
+    def _ask_panel(self, questions: List[str], missing: List[List[int]]) -> Tuple[List[Optional[List[str]]], int]:
+        """Ask each persona the questions it has no stored answer for.
+
+        In "agents" mode each respondent agent is its own call; in "batched"
+        mode personas missing the same questions share calls of up to
+        batch_size personas.
+
+        Args:
+            questions: All of the game's questions
+            missing: For each persona, the indices of the questions to ask
+
+        Returns:
+            For each persona, its answers to its missing questions (in that
+            order), or None if it wasn't asked or didn't answer; and the
+            number of calls made
+        """
+        answered: List[Optional[List[str]]] = [None] * len(self.personalities)
+        targets: List[List[int]] = []
+        calls = []
+        if self.survey_mode == "batched":
+            groups: Dict[Tuple[int, ...], List[int]] = {}
+            for i, indices in enumerate(missing):
+                if indices:
+                    groups.setdefault(tuple(indices), []).append(i)
+            for indices, members in groups.items():
+                asked = [questions[j] for j in indices]
+                for start in range(0, len(members), self.batch_size):
+                    batch = members[start:start + self.batch_size]
+                    personas = [self.personalities[i] for i in batch]
+                    targets.append(batch)
+                    calls.append((f"Persona batch {len(calls) + 1}",
+                                  lambda personas=personas, asked=asked: self._get_batch_answers(personas, asked)))
+            for batch, rows in zip(targets, self._poll_panel(calls)):
+                for i, answers in zip(batch, rows or []):
+                    answered[i] = answers
+        else:
+            for i, agent in enumerate(self.agents):
+                with self._agents_lock:
+                    busy = self._busy_agents.get(i)
+                    if busy is not None and busy.done():
+                        del self._busy_agents[i]
+                        busy = None
+                # Still answering an earlier question group; an agent runs one crew at a time
+                if missing[i] and busy is None:
+                    asked = [questions[j] for j in missing[i]]
+                    targets.append([i])
+                    calls.append((f"Respondent {agent.role}",
+                                  lambda agent=agent, asked=asked: self._get_agent_answers(agent, asked)))
+
+            def hold(k: int, future: Future) -> None:
+                # An agent still answering can't go back to the library yet
+                with self._agents_lock:
+                    self._busy_agents[targets[k][0]] = future
+
+            for (i,), answers in zip(targets, self._poll_panel(calls, on_abandoned=hold)):
+                answered[i] = answers
+        return answered, len(calls)
+
+    def _answer_key(self, persona: Dict[str, Any], question: str) -> str:
+        return f"{persona.get('id') or persona_id(persona)}|{normalize_question(question)}"
+
+    def _board_stability(self, results: List[List[str]], polled: List[int], num_questions: int) -> float:
+        """How settled the least settled question's top answers are, from 0 to 1."""
+        stability = 1.0
+        for j in range(num_questions):
+            canonicalizer = AnswerCanonicalizer()
+            clusters = [canonicalizer.add(results[i][j]) for i in polled if results[i][j]]
+            clusters = [c for c in clusters if c is not None]
+            stability = min(stability, top_k_stability(clusters, self.stability_top_k))
+        return stability
+
+    def _poll_respondents(self, questions: List[str]) -> List[Optional[List[str]]]:
+        """Ask every respondent the questions, reusing stored answers.
+
+        Each persona's earlier answer to the same (normalized) question is
+        taken from the answer store; only the rest are asked, and fresh
+        answers are stored for later games.
+
+        With early stopping, personas whose answers are all stored come
+        first, then the rest are polled in waves of wave_size. Polling stops
+        once at least min_respondents have answered and every question's top
+        answers are stable under bootstrap resampling (stability_threshold);
+        num_agents caps the panel.
+
+        Returns:
+            Each respondent's answers, in persona order, or None for
+            respondents that weren't polled, or had no stored answers and
+            failed or took longer than respondent_timeout
+        """
+        blank = [''] * len(questions)
+        if self.answer_store is not None:
+            keys = [[self._answer_key(p, q) for q in questions] for p in self.personalities]
+            results = [[self.answer_store.get(key) or '' for key in row] for row in keys]
+        else:
+            results = [list(blank) for _ in self.personalities]
+        missing = [[j for j, answer in enumerate(row) if not answer] for row in results]
+
+        # Personas with nothing to ask cost no calls, so they always come first
+        order = sorted(range(len(results)), key=lambda i: bool(missing[i]))
+        if self.early_stopping:
+            free = sum(1 for indices in missing if not indices)
+            waves = [order[:free]] + [order[i:i + self.wave_size] for i in range(free, len(order), self.wave_size)]
+        else:
+            waves = [order]
+
+        polled: List[int] = []
+        calls = 0
+        hits = 0
+        for wave in waves:
+            if self.early_stopping and len(polled) >= self.min_respondents:
+                stability = self._board_stability(results, polled, len(questions))
+                if stability >= self.stability_threshold:
+                    print(f"Top answers settled after {len(polled)}/{len(results)} respondents "
+                          f"(stability {stability:.2f})")
+                    break
+            in_wave = set(wave)
+            wave_missing = [indices if i in in_wave else [] for i, indices in enumerate(missing)]
+            wave_hits = sum(len(questions) - len(missing[i]) for i in wave)
+            hits += wave_hits
+            with self._stats_lock:
+                self.answer_stats["hits"] += wave_hits
+                self.answer_stats["misses"] += sum(len(missing[i]) for i in wave)
+
+            answered, made = self._ask_panel(questions, wave_missing)
+            calls += made
+            for i, answers in enumerate(answered):
+                for j, answer in zip(wave_missing[i], answers or []):
+                    answer = answer.strip() if isinstance(answer, str) else ''
+                    if answer:
+                        results[i][j] = answer
+                        if self.answer_store is not None:
+                            self.answer_store.put(keys[i][j], answer)
+            polled.extend(wave)
+        with self._stats_lock:
+            self.poll_stats["polled"] += len(polled)
+            self.poll_stats["panel"] += len(results)
+            self.poll_stats["calls"] += calls
+
+        # Respondents that answered nothing count as failed
+        in_panel = set(polled)
+        results = [answers if i in in_panel and any(answers) else None for i, answers in enumerate(results)]
+        answered_count = sum(1 for answers in results if answers is not None)
+        print(f"Collected answers from {answered_count}/{len(results)} respondents in {calls} calls")
+        if self.answer_store is not None:
+            total = len(questions) * len(polled)
+            rate = hits / total if total else 0.0
+            print(f"Answer store: reused {hits}/{total} persona answers ({rate:.0%} hit rate)")
+        return results
+
+    def _simulate_panel(self, questions: List[str]) -> List[Tuple[List[Dict[str, Any]], AnswerCanonicalizer]]:
+        """Survey a simulated panel of panel_size respondents per question.
+
+        Personas are asked for answer distributions in batches of
+        batch_size; respondents are then drawn from the persona population,
+        weighted by age band, and counted per canonical answer.
+
+        Returns:
+            Per question, the top answers with counts, shares and confidence
+            intervals, and the canonicalizer of every answer given
+        """
+        batches = [self.personalities[i:i + self.batch_size]
+                   for i in range(0, len(self.personalities), self.batch_size)]
+        calls = [
+            (f"Persona batch {i+1}", lambda batch=batch: self._get_batch_distributions(batch, questions))
+            for i, batch in enumerate(batches)
+        ]
+        per_persona: List[Optional[List[Optional[Dict[str, float]]]]] = []
+        for batch, rows in zip(batches, self._poll_panel(calls)):
+            per_persona.extend(rows if rows is not None else [None] * len(batch))
+        answered = sum(1 for rows in per_persona if rows is not None)
+        print(f"Collected answer distributions from {answered}/{len(per_persona)} personas in {len(calls)} calls")
+
+        tallies = []
+        for j, question in enumerate(questions):
+            distributions = [rows[j] if rows is not None else None for rows in per_persona]
+            top_answers, canonicalizer = simulate_question(distributions, self.personalities,
+                                                           respondents=self.panel_size)
+            if top_answers:
+                leader = top_answers[0]
+                print(f"{question} -> {leader['answer']}: {leader['share']:.0%} of {self.panel_size} "
+                      f"(95% CI {leader['ci_low']:.0%}-{leader['ci_high']:.0%} over {answered} personas)")
+            tallies.append((top_answers, canonicalizer))
+        return tallies
+
+    def collect_answers(self, questions: List[str],
+                        on_question: Optional[Callable[[Dict[str, Any]], None]] = None) -> List[Dict[str, Any]]:
+        """Collect and process answers for all questions from all agents.
+
+        Questions are surveyed in ordered groups of group_size, one panel
+        poll per group. Respondents are polled concurrently; answers from
+        whichever part of the panel responded in time are aggregated.
+        Answers are counted by canonical form, so "Pizza!", "a pizza" and
+        "pizzas" count together. In "panel" mode the counts come from a
+        simulated panel instead, see _simulate_panel. Questions short of 10
+        answers are topped up per group, while later groups are surveyed.
+
+        Args:
+            questions: The survey questions
+            on_question: Called with each finished question, in question
+                order, as soon as its group is counted and topped up
+
+        Returns:
+            Each question with its top 10 answers
+        """
         if not questions:
             return []
             
-        questions_with_answers = []
-        
-        # Process each agent one at a time
-        for agent in self.agents:
-            try:
-                answers = self._get_agent_answers(agent, questions)
-                for i, answer in enumerate(answers):
-                    if i >= len(questions_with_answers):
-                        questions_with_answers.append({
-                            'id': i + 1,
-                            'question': questions[i],
-                            'answers': []
-                        })
-                    if answer:
-                        questions_with_answers[i]['answers'].append(answer.lower().strip())
-            except Exception as e:
-                print(f"Error processing answers from {agent.role}: {str(e)}")
+        questions_with_answers = [
+            {'id': i + 1, 'question': question, 'answers': []}
+            for i, question in enumerate(questions)
+        ]
+        groups = [questions_with_answers[i:i + self.group_size]
+                  for i in range(0, len(questions_with_answers), self.group_size)]
+
+        # Respondent agents run one crew at a time, so their groups are polled in turn;
+        # batch calls don't share state, so groups can be polled at once
+        survey_workers = 1 if self.survey_mode == "agents" else min(len(groups), self.max_concurrency)
+        with ThreadPoolExecutor(max_workers=survey_workers, thread_name_prefix="feud-survey") as surveys, \
+                ThreadPoolExecutor(max_workers=len(groups), thread_name_prefix="feud-top-up") as top_ups:
+            surveyed = [surveys.submit(self._survey_group, group) for group in groups]
+            finished = [
+                top_ups.submit(lambda group=group, survey=survey: self._top_up_group(group, survey.result()))
+                for group, survey in zip(groups, surveyed)
+            ]
+            for future in finished:
+                for q in future.result():
+                    if on_question:
+                        on_question(q)
         
-        # Process answer counts and ensure we have 10 answers per question
-        for q in questions_with_answers:
-            answer_counts = {}
-            for ans in q['answers']:
-                if ans:
-                    answer_counts[ans] = answer_counts.get(ans, 0) + 1
-            
-            # Sort by frequency and take top answers
-            sorted_answers = sorted(
-                answer_counts.items(),
-                key=lambda x: (-x[1], x[0])
-            )
-            
-            # Get the answers we have
-            top_answers = [{'answer': ans, 'count': count} for ans, count in sorted_answers]
-            
-            # If we don't have enough answers, generate more
+        return questions_with_answers
+
+    def _survey_group(self, group: List[Dict[str, Any]]) -> List[Tuple[List[Dict[str, Any]], AnswerCanonicalizer]]:
+        """Poll the panel on one group of questions.
+
+        Returns:
+            Per question, its answers by frequency and the canonicalizer
+            they were counted with
+        """
+        questions = [q['question'] for q in group]
+        if self.survey_mode == "panel":
+            return self._simulate_panel(questions)
+
+        answered = [[] for _ in questions]
+        for answers in self._poll_respondents(questions):
+            if answers is None:
+                continue
+            for j, answer in enumerate(answers):
+                if answer:
+                    answered[j].append(answer)
+        tallies = []
+        for answers in answered:
+            canonicalizer = AnswerCanonicalizer()
+            for ans in answers:
+                canonicalizer.add(ans)
+            # Sorted by frequency
+            tallies.append((canonicalizer.counts(), canonicalizer))
+        return tallies
+
+    def _top_up_group(self, group: List[Dict[str, Any]],
+                      tallies: List[Tuple[List[Dict[str, Any]], AnswerCanonicalizer]]) -> List[Dict[str, Any]]:
+        """Fill in a group's answers, topping up every short question in one call."""
+        shortfalls = []
+        short = []
+        for q, (top_answers, canonicalizer) in zip(group, tallies):
+            if self.survey_mode == "panel":
+                # Counts are out of the simulated panel rather than one per persona
+                q['respondents'] = self.panel_size
+            q['answers'] = top_answers[:10]
             if len(top_answers) < 10:
-                existing_answers = [a['answer'] for a in top_answers]
                 needed = 10 - len(top_answers)
-                print(f"\n=== Generating {needed} additional answers for: {q['question']}")
-                
-                # Generate additional answers
-                additional = self._generate_additional_answers(
-                    q['question'],
-                    existing_answers,
-                    needed * 2  # Generate extra in case some are duplicates
-                )
-                
-                # Add new answers with count=1
-                for ans in additional:
-                    if len(top_answers) >= 10:
-                        break
-                    if ans.lower() not in [a.lower() for a in existing_answers]:
-                        top_answers.append({'answer': ans, 'count': 1})
-                        existing_answers.append(ans)
-            
-            # Ensure we have exactly 10 answers
-            q['answers'] = top_answers[:10]
+                print(f"\n=== Need {needed} additional answers for: {q['question']}")
+                # Ask for extra in case some are duplicates
+                shortfalls.append((q['question'], [a['answer'] for a in top_answers], needed * 2))
+                short.append((q, canonicalizer))
         
-        return questions_with_answers
+        for (q, canonicalizer), additional in zip(short, self._generate_additional_answers(shortfalls)):
+            # Add new answers with count=1
+            for ans in additional:
+                if len(q['answers']) >= 10:
+                    break
+                # Skip rewordings of answers we already have
+                if not canonicalizer.contains(ans):
+                    cluster = canonicalizer.add(ans)
+                    if cluster is not None:
+                        q['answers'].append({'answer': canonicalizer.name(cluster), 'count': 1})
+        return group
 
-    def generate_game(self) -> Dict[str, Any]:
-        """Generate a complete Feud game."""
-        print(f"Generating Family Feud game with theme: {self.theme}")
-        
-        # Generate personalities and create agents
-        self.personalities = self.generate_personalities()
+    def _build_respondent(self, p: Dict[str, Any], i: int = 0) -> Agent:
+        print(f"Creating agent {i+1}: {p.get('name', 'Unknown')} ({p.get('occupation', 'No occupation')})")
+        return Agent(
+            name=p.get('name', f"Respondent_{i+1}"),
+            role=f"Survey Respondent: {p.get('occupation', 'General')}",
+            goal=f"Answer questions from the perspective of a {p.get('age', '30')} year old {p.get('occupation', 'person').lower()}",
+            backstory=p.get('background', 'No background provided'),
+            max_execution_time=int(self.respondent_timeout),
+            verbose=True  # Enable verbose for agent
+        )
+
+    def _create_respondents(self, personalities: List[Dict[str, Any]]) -> List[Agent]:
+        """Create one survey respondent agent per personality.
+
+        With the persona library, agents built for earlier games are reused.
+        """
+        if self.library is None:
+            print(f"\n=== Creating {len(personalities)} agents ===")
+            return [self._build_respondent(p, i) for i, p in enumerate(personalities)]
+
+        agents = self.library.checkout_agents(personalities, self._build_respondent)
+        for agent in agents:
+            agent.max_execution_time = int(self.respondent_timeout)
+        return agents
+
+    def _release_respondents(self) -> None:
+        """Give this game's respondent agents back to the persona library.
+
+        Agents whose survey call timed out are still running; each goes back
+        once its call finishes. Agents checked out after this (by a
+        respondents stage still running when the game failed) are released
+        by that stage.
+        """
+        with self._agents_lock:
+            self._finished = True
+            personalities, agents, busy = self.personalities, self.agents, self._busy_agents
+            self.agents, self._busy_agents = [], {}
+        if self.library is None or not agents:
+            return
+        idle = [i for i in range(len(agents)) if i not in busy]
+        self.library.release_agents([personalities[i] for i in idle], [agents[i] for i in idle])
+        for i, future in busy.items():
+            future.add_done_callback(
+                lambda _, persona=personalities[i], agent=agents[i]: self.library.release_agents([persona], [agent])
+            )
+
+    def _personalities_stage(self) -> List[Dict[str, Any]]:
+        if self.library is not None:
+            self.personalities = self.library.sample(self.num_agents, top_up=self.generate_personalities)
+            print(f"Sampled {len(self.personalities)} personas from a library of {len(self.library)}")
+        else:
+            self.personalities = self.generate_personalities()
         if not self.personalities:
             raise ValueError("Failed to generate personalities")
-        
-        print(f"\n=== Creating {len(self.personalities)} agents ===")
-        # Create agents from personalities
-        self.agents = []
-        for i, p in enumerate(self.personalities):
-            print(f"Creating agent {i+1}: {p.get('name', 'Unknown')} ({p.get('occupation', 'No occupation')})")
-            agent = Agent(
-                name=p.get('name', f"Respondent_{i+1}"),
-                role=f"Survey Respondent: {p.get('occupation', 'General')}",
-                goal=f"Answer questions from the perspective of a {p.get('age', '30')} year old {p.get('occupation', 'person').lower()}",
-                backstory=p.get('background', 'No background provided'),
-                verbose=True  # Enable verbose for agent
-            )
-            self.agents.append(agent)
-        
-        # Generate questions
+        return self.personalities
+
+    def _respondents_stage(self, personalities: List[Dict[str, Any]]) -> List[Agent]:
+        if self.survey_mode in ("batched", "panel"):
+            # Batches role-play the personas directly; no per-persona agents
+            print(f"\n=== Surveying {len(personalities)} personas in batches of {self.batch_size} ===")
+            self.agents = []
+            return self.agents
+        agents = self._create_respondents(personalities)
+        with self._agents_lock:
+            if not self._finished:
+                self.agents = agents
+                return agents
+        # The game failed while the agents were being checked out
+        if self.library is not None:
+            self.library.release_agents(personalities, agents)
+        return agents
+
+    def _questions_stage(self) -> List[str]:
         print("\n=== Generating questions ===")
         questions = self.generate_questions_batch()
         if not questions:
             raise ValueError("Failed to generate questions")
         print(f"Generated questions: {questions}")
-        
-        # Collect and process answers
+        if self.on_event:
+            self.on_event("questions", {'theme': self.theme, 'questions': questions})
+        return questions
+
+    def _answers_stage(self, agents: List[Agent], questions: List[str]) -> List[Dict[str, Any]]:
         print("\n=== Collecting answers ===")
-        questions_with_answers = self.collect_answers(questions)
+        on_question = (lambda q: self.on_event("question", q)) if self.on_event else None
+        questions_with_answers = self.collect_answers(questions, on_question=on_question)
         print("\n=== Answer collection complete ===")
+        return questions_with_answers
+
+    def build_stages(self) -> StageGraph:
+        """Describe game generation as a stage graph.
+
+        Personalities and questions don't depend on each other, so they are
+        generated at the same time; answers need both.
+        """
+        graph = StageGraph(name="feud-stage")
+        graph.add("personalities", self._personalities_stage)
+        graph.add("questions", self._questions_stage)
+        graph.add("respondents", self._respondents_stage, deps=("personalities",))
+        graph.add("answers", self._answers_stage, deps=("respondents", "questions"))
+        return graph
+
+    def generate_game(self, on_event: Optional[Callable[[str, Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+        """Generate a complete Feud game.
+
+        Args:
+            on_event: Optional progress callback, called from worker threads
+                with (event, payload):
+                    questions: {'theme', 'questions'} once the questions exist
+                    question: one finished question ({'id', 'question',
+                        'answers'}), in question order
+
+        Returns:
+            {'theme', 'questions'}, plus 'degraded': True when a question
+            ended up with fewer than FEUD_MIN_ANSWERS answers
+        """
+        print(f"Generating Family Feud game with theme: {self.theme}")
+        
+        self.on_event = on_event
+        self._finished = False
+        graph = self.build_stages()
+        try:
+            results = graph.run()
+        finally:
+            self._release_respondents()
+            lookups = self.answer_stats["hits"] + self.answer_stats["misses"]
+            self.answer_stats["hit_rate"] = self.answer_stats["hits"] / lookups if lookups else 0.0
+            self.stage_timings = dict(graph.timings)
+            print(f"Stage timings: {graph.summary()}")
         
-        return {
+        game = {
             'theme': self.theme,
-            'questions': questions_with_answers
+            'questions': results["answers"]
         }
+        # The panel timed out or the top-up failed, leaving boards with too few answers
+        thin = [q['question'] for q in game['questions'] if len(q['answers']) < FEUD_MIN_ANSWERS]
+        if thin:
+            print(f"Warning: {len(thin)} question(s) have fewer than {FEUD_MIN_ANSWERS} answers: {thin}")
+            game['degraded'] = True
+        return game
 
 def main():
     parser = argparse.ArgumentParser(description='Generate Family Feud style questions and answers.')
     parser.add_argument('--theme', type=str, required=True, help='Theme for the game')
     parser.add_argument('--num-questions', type=int, default=5, help='Number of questions to generate')
-    parser.add_argument('--num-agents', type=int, default=10, help='Number of agents to survey')
+    parser.add_argument('--num-agents', type=int, default=DEFAULT_NUM_AGENTS,
+                        help='Number of agents to survey (the cap with early stopping)')
+    parser.add_argument('--max-concurrency', type=int, default=DEFAULT_MAX_CONCURRENCY,
+                        help='Respondents polled at once (1 = one after another)')
+    parser.add_argument('--respondent-timeout', type=float, default=DEFAULT_RESPONDENT_TIMEOUT,
+                        help='Seconds before a slow respondent is dropped from the panel')
+    parser.add_argument('--survey-mode', choices=SURVEY_MODES, default=DEFAULT_SURVEY_MODE,
+                        help='agents: one call per persona; batched: one call per batch of personas')
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_SURVEY_BATCH_SIZE,
+                        help='Personas answered per call in batched and panel modes')
+    parser.add_argument('--group-size', type=int, default=DEFAULT_SURVEY_GROUP_SIZE,
+                        help='Questions per panel poll; each group streams out as soon as it is done')
+    parser.add_argument('--panel-size', type=int, default=FEUD_PANEL_SIZE,
+                        help='Simulated respondents per question in panel mode')
+    parser.add_argument('--no-persona-library', action='store_true',
+                        help='Generate fresh personalities instead of sampling the persona library')
+    parser.add_argument('--no-answer-store', action='store_true',
+                        help='Ask every respondent every question instead of reusing stored answers')
+    parser.add_argument('--early-stopping', action=argparse.BooleanOptionalAction, default=DEFAULT_EARLY_STOPPING,
+                        help='Poll respondents in waves and stop once the top answers settle')
+    parser.add_argument('--wave-size', type=int, default=DEFAULT_WAVE_SIZE,
+                        help='Respondents polled per wave with --early-stopping')
+    parser.add_argument('--min-respondents', type=int, default=DEFAULT_MIN_RESPONDENTS,
+                        help='Respondents polled before --early-stopping may stop (0 = half of --num-agents)')
     parser.add_argument('--output', type=str, help='Output YAML file path')
     
     args = parser.parse_args()
@@ -337,7 +982,18 @@ def main():
         game = FeudGame(
             theme=args.theme,
             num_questions=args.num_questions,
-            num_agents=args.num_agents
+            num_agents=args.num_agents,
+            max_concurrency=args.max_concurrency,
+            respondent_timeout=args.respondent_timeout,
+            survey_mode=args.survey_mode,
+            batch_size=args.batch_size,
+            group_size=args.group_size,
+            panel_size=args.panel_size,
+            use_persona_library=DEFAULT_USE_PERSONA_LIBRARY and not args.no_persona_library,
+            use_answer_store=DEFAULT_USE_ANSWER_STORE and not args.no_answer_store,
+            early_stopping=args.early_stopping,
+            wave_size=args.wave_size,
+            min_respondents=args.min_respondents
         )
         
         result = game.generate_game()
@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Validated, downscaled local copies of clue images.
+
+Image search returns URLs on arbitrary third-party hosts, some slow or dead
+and some multi-megabyte originals. At generation time the candidate URLs
+for a clue are probed concurrently; the first one that serves an image is
+downloaded, downscaled and stored in a content-addressed directory, and the
+clue points at the backend's image endpoint instead of the original host.
+
+Only public http(s) hosts are fetched, redirects included, so a search
+result can't make the backend request its own network.
+"""
+
+import hashlib
+import io
+import ipaddress
+import logging
+import os
+import re
+import socket
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, Optional
+from urllib.parse import urljoin, urlsplit
+
+import requests
+from PIL import Image
+
+from trivai_cache import SQLiteCache
+
+logger = logging.getLogger(__name__)
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+
+IMAGE_STORE_DIR = os.getenv("IMAGE_STORE_DIR", os.path.join(BACKEND_DIR, "game_outputs", "images"))
+# Origin the frontend reaches the backend at (its NEXT_PUBLIC_API_BASE_URL); clue images
+# are on another origin than the frontend, so their URLs must be absolute
+PUBLIC_API_BASE_URL = os.getenv("PUBLIC_API_BASE_URL", "http://localhost:8000").rstrip("/")
+# Prefix of the URLs clues are rewritten to; served by app/api/v1/endpoints/images.py
+IMAGE_PROXY_URL_PREFIX = os.getenv("IMAGE_PROXY_URL_PREFIX", f"{PUBLIC_API_BASE_URL}/api/v1/images")
+IMAGE_PROXY_ENABLED = os.getenv("IMAGE_PROXY_ENABLED", "1").lower() in ("1", "true", "yes")
+# Seconds to wait on a third-party host, per request
+IMAGE_PROBE_TIMEOUT = float(os.getenv("IMAGE_PROBE_TIMEOUT", "4"))
+IMAGE_PROBE_CONCURRENCY = int(os.getenv("IMAGE_PROBE_CONCURRENCY", "8"))
+# Originals larger than this are skipped rather than downloaded
+IMAGE_MAX_BYTES = int(os.getenv("IMAGE_MAX_BYTES", str(8 * 1024 * 1024)))
+# Longest side of a stored thumbnail, in pixels
+IMAGE_THUMBNAIL_SIZE = int(os.getenv("IMAGE_THUMBNAIL_SIZE", "640"))
+IMAGE_THUMBNAIL_QUALITY = 82
+# Redirect hops followed per request, each checked like the original URL
+IMAGE_MAX_REDIRECTS = 5
+
+DIGEST_PATTERN = re.compile(r"^[0-9a-f]{32}$")
+USER_AGENT = "TrivAI image proxy"
+
+
+class ImageProxy:
+    """Probes, downscales and stores clue images under their content hash."""
+
+    def __init__(self, store_dir: str = IMAGE_STORE_DIR, url_prefix: str = IMAGE_PROXY_URL_PREFIX,
+                 timeout: float = IMAGE_PROBE_TIMEOUT, max_concurrency: int = IMAGE_PROBE_CONCURRENCY,
+                 max_bytes: int = IMAGE_MAX_BYTES, thumbnail_size: int = IMAGE_THUMBNAIL_SIZE,
+                 sources: Optional[SQLiteCache] = None, allow_private: bool = False):
+        self.store_dir = store_dir
+        self.url_prefix = url_prefix.rstrip("/")
+        self.timeout = timeout
+        self.max_concurrency = max_concurrency
+        self.max_bytes = max_bytes
+        self.thumbnail_size = thumbnail_size
+        # Fetch from loopback and private networks too; only for local stand-in hosts
+        self.allow_private = allow_private
+        # Source URL -> digest, so a known original is never downloaded twice
+        self.sources = sources if sources is not None else SQLiteCache("image_proxy", ttl=365 * 24 * 60 * 60, max_entries=20000)
+        self._session = requests.Session()
+        self._session.headers["User-Agent"] = USER_AGENT
+        self._lock = threading.Lock()
+        self._inflight: Dict[str, Future] = {}
+        self.stats = {"probes": 0, "probe_failures": 0, "stored": 0, "reused": 0,
+                      "bytes_in": 0, "bytes_out": 0, "errors": 0}
+
+    def path_for(self, digest: str) -> Optional[str]:
+        """Return the stored thumbnail's path, or None for an unknown or malformed digest."""
+        if not DIGEST_PATTERN.match(digest):
+            return None
+        path = os.path.join(self.store_dir, f"{digest}.jpg")
+        return path if os.path.exists(path) else None
+
+    def url_for(self, digest: str) -> str:
+        return f"{self.url_prefix}/{digest}"
+
+    def is_allowed(self, url: str) -> bool:
+        """Whether url is http(s) on a host that resolves only to public addresses."""
+        try:
+            parts = urlsplit(url)
+            if parts.scheme not in ("http", "https") or not parts.hostname:
+                return False
+            if self.allow_private:
+                return True
+            addresses = socket.getaddrinfo(parts.hostname, parts.port or 0, proto=socket.IPPROTO_TCP)
+        except (ValueError, OSError):
+            return False
+        return bool(addresses) and all(
+            ipaddress.ip_address(address[4][0].split("%", 1)[0]).is_global for address in addresses
+        )
+
+    def _request(self, method: str, url: str) -> requests.Response:
+        """Send a streamed request, following redirects only to allowed URLs.
+
+        Raises:
+            requests.RequestException: On failure, or if url or a redirect is
+                not allowed
+        """
+        for _ in range(IMAGE_MAX_REDIRECTS + 1):
+            if not self.is_allowed(url):
+                raise requests.RequestException(f"refusing to fetch {url}")
+            response = self._session.request(method, url, timeout=self.timeout, allow_redirects=False, stream=True)
+            if not response.is_redirect:
+                return response
+            response.close()
+            url = urljoin(url, response.headers["Location"])
+        raise requests.TooManyRedirects(f"more than {IMAGE_MAX_REDIRECTS} redirects")
+
+    def probe(self, url: str) -> bool:
+        """Check that url serves an image no larger than max_bytes.
+
+        Tries HEAD first and falls back to a streamed GET (headers only) for
+        hosts that reject or mis-answer HEAD. URLs that aren't allowed (see
+        is_allowed) fail without a request.
+        """
+        with self._lock:
+            self.stats["probes"] += 1
+        for method in ("HEAD", "GET") if self.is_allowed(url) else ():
+            try:
+                response = self._request(method, url)
+                response.close()
+            except requests.Timeout:
+                # A host too slow for HEAD won't be faster for GET
+                break
+            except requests.RequestException:
+                continue
+            if response.status_code != 200:
+                continue
+            content_type = response.headers.get("Content-Type", "")
+            length = int(response.headers.get("Content-Length") or 0)
+            if content_type.startswith("image/") and length <= self.max_bytes:
+                return True
+        with self._lock:
+            self.stats["probe_failures"] += 1
+        return False
+
+    def store(self, url: str) -> Optional[str]:
+        """Download url, downscale it and store the thumbnail.
+
+        Concurrent calls for the same url share one download.
+
+        Returns:
+            The thumbnail's digest, or None if the image couldn't be used
+        """
+        cached = self.sources.get(url)
+        if cached and self.path_for(cached):
+            with self._lock:
+                self.stats["reused"] += 1
+            return cached
+
+        with self._lock:
+            future = self._inflight.get(url)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._inflight[url] = future
+            else:
+                self.stats["reused"] += 1
+        if not owner:
+            return future.result()
+
+        digest = None
+        try:
+            digest = self._download(url)
+        finally:
+            future.set_result(digest)
+            with self._lock:
+                self._inflight.pop(url, None)
+        return digest
+
+    def _download(self, url: str) -> Optional[str]:
+        try:
+            with self._request("GET", url) as response:
+                response.raise_for_status()
+                data = bytearray()
+                for chunk in response.iter_content(64 * 1024):
+                    data.extend(chunk)
+                    if len(data) > self.max_bytes:
+                        raise ValueError(f"larger than {self.max_bytes} bytes")
+
+            image = Image.open(io.BytesIO(data))
+            image.thumbnail((self.thumbnail_size, self.thumbnail_size))
+            output = io.BytesIO()
+            image.convert("RGB").save(output, "JPEG", quality=IMAGE_THUMBNAIL_QUALITY, optimize=True)
+            thumbnail = output.getvalue()
+        except Exception as e:
+            with self._lock:
+                self.stats["errors"] += 1
+            logger.warning(f"Could not store image {url}: {e}")
+            return None
+
+        digest = hashlib.sha256(thumbnail).hexdigest()[:32]
+        path = os.path.join(self.store_dir, f"{digest}.jpg")
+        if not os.path.exists(path):
+            os.makedirs(self.store_dir, exist_ok=True)
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(thumbnail)
+            os.replace(tmp_path, path)
+        self.sources.put(url, digest)
+        with self._lock:
+            self.stats["stored"] += 1
+            self.stats["bytes_in"] += len(data)
+            self.stats["bytes_out"] += len(thumbnail)
+        return digest
+
+    def localize(self, candidates: List[str]) -> Optional[str]:
+        """Return a proxy URL for the first candidate that probes and stores cleanly."""
+        candidates = [url for url in candidates if url]
+        if not candidates:
+            return None
+        known = [url for url in candidates if self.path_for(self.sources.get(url) or "")]
+        if known:
+            return self.url_for(self.store(known[0]))
+
+        workers = max(1, min(self.max_concurrency, len(candidates)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="image-probe") as executor:
+            valid = list(executor.map(self.probe, candidates))
+        for url, ok in zip(candidates, valid):
+            if ok:
+                digest = self.store(url)
+                if digest:
+                    return self.url_for(digest)
+        return None
+
+    def localize_many(self, candidates: Dict[str, List[str]]) -> Dict[str, Optional[str]]:
+        """Localize several clues' candidate lists concurrently.
+
+        Returns:
+            Mapping of each key of candidates to its proxy URL, or None
+        """
+        keys = list(candidates)
+        if len(keys) <= 1 or self.max_concurrency <= 1:
+            return {key: self.localize(candidates[key]) for key in keys}
+        workers = min(self.max_concurrency, len(keys))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="image-proxy") as executor:
+            return dict(zip(keys, executor.map(lambda key: self.localize(candidates[key]), keys)))
+
+
+image_proxy = ImageProxy()
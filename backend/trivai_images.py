@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Image lookup for Jeopardy clues.
+
+The Question Crafter writes a short image search query into a clue's
+``image`` field (kept as ``image_query`` once validated). Images are
+resolved after the board is assembled: attach_images looks up every query
+on a board in one concurrent batch, so the text-only board can be served
+before its images are ready. Lookups are cached in the shared SQLite store, and identical
+queries in flight at the same time share a single API call.
+"""
+
+import logging
+import os
+import statistics
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Deque, Dict, Iterable, List, Optional
+
+from serpapi.google_search import GoogleSearch
+
+from trivai_cache import SQLiteCache
+from trivai_image_proxy import IMAGE_PROXY_ENABLED, IMAGE_PROXY_URL_PREFIX, ImageProxy, image_proxy
+
+logger = logging.getLogger(__name__)
+
+IMAGE_CACHE_TTL = int(os.getenv("IMAGE_CACHE_TTL", str(30 * 24 * 60 * 60)))
+IMAGE_CACHE_MAX_ENTRIES = int(os.getenv("IMAGE_CACHE_MAX_ENTRIES", "5000"))
+# Image API calls in flight at once for a batch
+IMAGE_SEARCH_CONCURRENCY = int(os.getenv("IMAGE_SEARCH_CONCURRENCY", "8"))
+IMAGE_SEARCH_RESULTS = 5
+
+
+def normalize_query(query: str) -> str:
+    """Normalize an image query so trivially different spellings share a lookup."""
+    return " ".join(str(query).casefold().split())
+
+
+def is_url(value: Any) -> bool:
+    return isinstance(value, str) and value.startswith(("http://", "https://", IMAGE_PROXY_URL_PREFIX))
+
+
+class ImageSearchService:
+    """Cached, deduplicated and batched Google Images lookups."""
+
+    def __init__(self, cache: Optional[SQLiteCache] = None, max_concurrency: int = IMAGE_SEARCH_CONCURRENCY,
+                 per_page: int = IMAGE_SEARCH_RESULTS):
+        self.cache = cache if cache is not None else SQLiteCache("image_search", ttl=IMAGE_CACHE_TTL, max_entries=IMAGE_CACHE_MAX_ENTRIES)
+        self.max_concurrency = max_concurrency
+        self.per_page = per_page
+        self._inflight: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        # Seconds per API call, most recent last
+        self.latencies: Deque[float] = deque(maxlen=1000)
+        self.stats = {"lookups": 0, "cache_hits": 0, "deduped": 0, "api_calls": 0, "errors": 0}
+
+    def search(self, query: str) -> List[str]:
+        """Return image URLs for query, from the cache when possible.
+
+        Failed lookups return an empty list and are not cached.
+        """
+        key = normalize_query(query)
+        if not key:
+            return []
+        self.stats["lookups"] += 1
+
+        cached = self.cache.get(key)
+        if cached is not None:
+            self.stats["cache_hits"] += 1
+            return cached
+
+        with self._lock:
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._inflight[key] = future
+            else:
+                self.stats["deduped"] += 1
+        if not owner:
+            return future.result()
+
+        urls: List[str] = []
+        try:
+            urls = self._fetch(key)
+            self.cache.put(key, urls)
+        except Exception as e:
+            self.stats["errors"] += 1
+            logger.error(f"Image search failed for '{key}': {e}")
+        finally:
+            future.set_result(urls)
+            with self._lock:
+                self._inflight.pop(key, None)
+        return urls
+
+    def search_many(self, queries: Iterable[str]) -> Dict[str, List[str]]:
+        """Look up several queries concurrently; duplicates are looked up once.
+
+        Returns:
+            Mapping of each distinct query to its image URLs
+        """
+        queries = [q for q in queries if q]
+        unique = [key for key in dict.fromkeys(normalize_query(q) for q in queries) if key]
+        if len(unique) <= 1 or self.max_concurrency <= 1:
+            results = {key: self.search(key) for key in unique}
+        else:
+            workers = min(self.max_concurrency, len(unique))
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="image-search") as executor:
+                results = dict(zip(unique, executor.map(self.search, unique)))
+        return {query: results.get(normalize_query(query), []) for query in queries}
+
+    def _fetch(self, query: str) -> List[str]:
+        params = {
+            "engine": "google_images",
+            "q": query,
+            "api_key": os.getenv("SERPER_API_KEY"),
+            "google_domain": "google.com",
+            "hl": "en",
+            "gl": "us",
+            "num": self.per_page
+        }
+        start = time.perf_counter()
+        try:
+            results = GoogleSearch(params).get_dict()
+        finally:
+            self.latencies.append(time.perf_counter() - start)
+            self.stats["api_calls"] += 1
+        if results.get("error"):
+            raise RuntimeError(results["error"])
+        image_results = results.get("images_results", [])
+        return [img["original"] for img in image_results if img.get("original")][:self.per_page]
+
+    def latency_snapshot(self) -> Dict[str, Any]:
+        """Summary of recent API call latencies, in milliseconds."""
+        latencies = sorted(self.latencies)
+        if not latencies:
+            return {"calls": 0}
+        return {
+            "calls": len(latencies),
+            "mean_ms": round(statistics.mean(latencies) * 1000, 1),
+            "p50_ms": round(latencies[len(latencies) // 2] * 1000, 1),
+            "p95_ms": round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))] * 1000, 1),
+            "max_ms": round(latencies[-1] * 1000, 1),
+        }
+
+    def stats_snapshot(self) -> Dict[str, Any]:
+        return {**self.stats, "latency": self.latency_snapshot()}
+
+
+image_search = ImageSearchService()
+
+
+# Proxy that validates and stores images locally, or None to link the original hosts
+default_proxy: Optional[ImageProxy] = image_proxy if IMAGE_PROXY_ENABLED else None
+
+
+def resolve_images(queries: Iterable[str], service: ImageSearchService = image_search,
+                   proxy: Optional[ImageProxy] = default_proxy) -> Dict[str, Optional[str]]:
+    """Resolve image search queries to the URL each clue should show.
+
+    With a proxy, every query's candidate URLs are probed and the first
+    working one is replaced by a local thumbnail; otherwise the first search
+    result is used as is.
+    """
+    results = service.search_many(queries)
+    if proxy is None:
+        return {query: urls[0] if urls else None for query, urls in results.items()}
+    return proxy.localize_many(results)
+
+
+def attach_images(questions: Dict[str, List[Dict[str, Any]]],
+                  service: ImageSearchService = image_search,
+                  proxy: Optional[ImageProxy] = default_proxy) -> int:
+    """Resolve the image search queries of a board's questions to image URLs.
+
+    Args:
+        questions: Questions keyed by category. Questions with an
+            ``image_query`` and no ``image`` URL yet get their query's image
+            as their ``image``.
+        service: Image search service to resolve queries with
+        proxy: Image proxy to localize images through, see resolve_images
+
+    Returns:
+        Number of questions that got an image
+    """
+    pending = [
+        q for column in questions.values() for q in column
+        if q.get("image_query") and not is_url(q.get("image"))
+    ]
+    if not pending:
+        return 0
+
+    images = resolve_images((q["image_query"] for q in pending), service, proxy)
+    attached = 0
+    for q in pending:
+        q["image"] = images.get(q["image_query"])
+        attached += bool(q["image"])
+    logger.info(f"Attached {attached}/{len(pending)} images ({service.latency_snapshot()})")
+    return attached
+
+
+def has_pending_images(game: Dict[str, Any]) -> bool:
+    """Whether any clue in an assembled game still has an unresolved image query."""
+    return any(
+        q.get("image_query") and not is_url(q.get("image"))
+        for board in game.get("boards", [])
+        for column in board.get("questions", {}).values()
+        for q in column
+    )
+
+
+def enrich_game_images(game: Dict[str, Any], service: ImageSearchService = image_search) -> Dict[str, Any]:
+    """Attach images to every board of an assembled game, in place.
+
+    Returns:
+        The same game dict
+    """
+    for board in game.get("boards", []):
+        attach_images(board.get("questions", {}), service)
+    return game
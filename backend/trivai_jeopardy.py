@@ -7,12 +7,16 @@ import random
 import logging
 import yaml
 import datetime
-from typing import Dict, List, Any, Optional
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterator, List, Any, Optional, Tuple
 from crewai import Agent, Task, Crew
 from crewai_tools import SerperDevTool, ScrapeWebsiteTool
-from serpapi.google_search import GoogleSearch
 from crewai.tools import BaseTool
 from dotenv import load_dotenv
+from trivai_parsing import extract_payload, parse_yaml_payload
+from trivai_images import enrich_game_images, image_search, is_url
+from trivai_tools import CondensedTool, cached_tool, tool_context
 
 # Load environment variables
 load_dotenv(".env")
@@ -29,38 +33,109 @@ logger = logging.getLogger('jeopardy_game')
 QUESTION_VALUES = [200, 400, 600, 800, 1000]
 DEFAULT_CATEGORIES = 5
 QUESTIONS_PER_CATEGORY = 5
+# "per_category": one Question Crafter call per category
+# "oneshot": one call for the whole board, per-category calls only for columns that fail validation
+GENERATION_MODES = ("per_category", "oneshot")
+# Max categories generated at once; 1 keeps the old one-after-another behaviour
+DEFAULT_MAX_CONCURRENCY = int(os.getenv("JEOPARDY_MAX_CONCURRENCY", str(DEFAULT_CATEGORIES)))
+# Repair requests per category for value slots the crafter left empty
+REPAIR_ATTEMPTS = int(os.getenv("JEOPARDY_REPAIR_ATTEMPTS", "1"))
 
-# Initialize tools
-search_tool = SerperDevTool()
-ddg_search_tool = ScrapeWebsiteTool()
+# Initialize tools; results are cached across requests and scraped pages are
+# condensed before they reach the agent (see trivai_tools)
+search_tool = cached_tool(SerperDevTool(), "serper_search")
+ddg_search_tool = CondensedTool(cached_tool(ScrapeWebsiteTool(), "scrape_website"))
 
 class GoogleImageSearch(BaseTool):
     name: str = "Google Image Search Tool"
     description: str = "Searches Google Images and returns a list of image URLs based on a query."
 
     def _run(self, query: str, per_page: int = 5) -> List[str]:
-        params = {
-            "engine": "google_images",
-            "q": query,
-            "api_key": os.getenv("SERPER_API_KEY"),
-            "google_domain": "google.com",
-            "hl": "en",
-            "gl": "us",
-            "num": per_page
-        }
-
-        try:
-            search = GoogleSearch(params)
-            results = search.get_dict()
-            image_results = results.get("images_results", [])
-            image_urls = [img.get("original") for img in image_results if img.get("original")]
-            return image_urls[:per_page]
-        except Exception as e:
-            print(f"Image search error: {str(e)}")
-            return []
+        return image_search.search(query)[:per_page]
 
 image_tool = GoogleImageSearch()
 
+# Model used when the category plan is streamed straight from the OpenAI API
+PLANNER_STREAM_MODEL = os.getenv("OPENAI_MODEL_NAME", "gpt-4o-mini")
+
+
+class CategoryStreamParser:
+    """Incrementally parse a streamed categories YAML document.
+
+    Feed it chunks of planner output as they arrive; every call returns the
+    category names whose list item line (e.g. ``  - "WORLD WARS"``) under
+    the ``categories:`` key has been completed since the previous call.
+    Items are read the way the YAML parser would read them: quotes are
+    stripped, and items that aren't plain strings (``- Note: these are
+    fun``) or whose closing quote never arrived are skipped.
+    """
+
+    HEADER_PATTERN = re.compile(r'^categories:\s*$')
+    QUOTED_ITEM_PATTERN = re.compile(r'^-\s*(["\'])(.+?)\1\s*(?:#.*)?$')
+    PLAIN_ITEM_PATTERN = re.compile(r'^-\s*([^"\'\s#].*?)\s*(?:\s#.*)?$')
+
+    def __init__(self):
+        self._buffer = ""
+        self._seen = set()
+        self._in_list = False
+
+    def feed(self, chunk: str) -> List[str]:
+        self._buffer += chunk
+        *lines, self._buffer = self._buffer.split("\n")
+        return self._parse_lines(lines)
+
+    def close(self) -> List[str]:
+        """Parse whatever is left once the stream has ended."""
+        lines, self._buffer = [self._buffer], ""
+        return self._parse_lines(lines)
+
+    def _parse_lines(self, lines: List[str]) -> List[str]:
+        categories = []
+        for line in lines:
+            stripped = line.strip()
+            if self.HEADER_PATTERN.match(stripped):
+                self._in_list = True
+                continue
+            if not stripped.startswith("-"):
+                # Another top-level key (or a closing code fence) ends the list
+                if stripped and not line[:1].isspace():
+                    self._in_list = False
+                continue
+            category = self._parse_item(stripped) if self._in_list else None
+            if category and category not in self._seen:
+                self._seen.add(category)
+                categories.append(category)
+        return categories
+
+    def _parse_item(self, item: str) -> Optional[str]:
+        """Return the category named by a list item line, or None if it isn't one."""
+        match = self.QUOTED_ITEM_PATTERN.match(item)
+        if match:
+            return match.group(2).strip().upper()
+        match = self.PLAIN_ITEM_PATTERN.match(item)
+        # An unquoted "key: value" is a mapping, not a category name
+        if not match or ": " in match.group(1) or match.group(1).endswith(":"):
+            return None
+        return match.group(1).strip().upper()
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the token count of text, using tiktoken when it is installed."""
+    if not text:
+        return 0
+    try:
+        import tiktoken
+        return len(tiktoken.get_encoding("cl100k_base").encode(text))
+    except Exception:
+        # Roughly four characters per token for English prose
+        return max(1, len(text) // 4)
+
+
+def _openai_client():
+    """Create the OpenAI client used for streamed planner calls."""
+    from openai import OpenAI
+    return OpenAI()
+
 # Set up logging
 logging.basicConfig(
     level=logging.INFO,
@@ -71,20 +146,79 @@ logger = logging.getLogger('jeopardy_agents')
 class JeopardyGame:
     """Main class for generating Jeopardy game data."""
     
-    def __init__(self, theme: str, num_boards: int = 1):
+    def __init__(self, theme: str, num_boards: int = 1, max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+                 parallel_boards: bool = False, batch_planning: bool = False, stream_plan: bool = False,
+                 generation_mode: str = "per_category",
+                 on_event: Optional[Callable[[str, Dict[str, Any]], None]] = None):
         """Initialize the Jeopardy game generator.
         
         Args:
             theme: The theme for the Jeopardy game
             num_boards: Number of game boards to generate (default: 1)
+            max_concurrency: Max LLM calls in flight at once across all boards (default: 5)
+            parallel_boards: Build boards concurrently instead of one after another
+            batch_planning: Plan categories for every board in a single planner call
+            stream_plan: Stream the category plan and start each category's questions
+                as soon as its line arrives, instead of waiting for the whole plan
+                (per_category mode only)
+            generation_mode: "per_category" (one crafter call per category) or
+                "oneshot" (one call for the whole board)
+            on_event: Optional callback receiving (event, payload) as parts of a board
+                become available: "categories", "category" and "daily_double"
         """
         self.theme = theme
         self.num_boards = num_boards
+        self.max_concurrency = max(1, max_concurrency)
+        self.parallel_boards = parallel_boards
+        self.batch_planning = batch_planning
+        self.stream_plan = stream_plan
+        if generation_mode not in GENERATION_MODES:
+            raise ValueError(f"Unknown generation mode: {generation_mode}")
+        self.generation_mode = generation_mode
+        self.on_event = on_event
+        # Shared budget for agent calls, so parallel boards don't multiply concurrency
+        self._llm_slots = threading.BoundedSemaphore(self.max_concurrency)
+        # LLM requests and tokens as reported by the API, for the streamed planner
+        # calls; agent calls are added from their LLMs' counters, see usage_summary
+        self.usage = {
+            "llm_calls": 0,
+            "prompt_tokens": 0,
+            "completion_tokens": 0,
+            # Estimated tokens of scraped pages before and after condensation
+            "scrape_tokens_raw": 0,
+            "scrape_tokens_sent": 0
+        }
+        self._usage_lock = threading.Lock()
+        # Usage counters (an agent's LLM, or its token process) of every agent that ran, by id
+        self._usage_sources: Dict[int, Any] = {}
         self.boards = []
+        # Set when placeholder categories or sample questions stand in for failed generations
+        self.degraded = False
         self.setup_agents()
         logger.info(f"Initialized Jeopardy game with theme: {theme}")
 
     def setup_agents(self):
+        # Category Planner Agent
+        self.category_planner = self._create_category_planner()
+
+        # Question Crafter Agent
+        self.question_crafter = self._create_question_crafter()
+
+        # Game Assembler Agent
+        self.game_assembler = Agent(
+            role="Game Assembler",
+            goal="Format game data into proper structure",
+            backstory=(
+                "You organize Jeopardy games into the proper format for the game board. "
+                "You ensure all required fields are present and properly formatted."
+            ),
+            verbose=True,
+            allow_delegation=False,
+            logger=logger
+        )
+
+    def _create_category_planner(self) -> Agent:
+        """Build a Category Planner agent (one per board when boards run in parallel)."""
         # Define YAML structure for category generation
         category_yaml_example = """categories:
   - "CATEGORY 1"
@@ -94,6 +228,31 @@ class JeopardyGame:
   - "CATEGORY 5"
 """
 
+        return Agent(
+            role="Category Planner",
+            goal="Create engaging Jeopardy categories",
+            backstory=(
+                "You are an expert at creating fun, challenging Jeopardy categories that cover a wide range of topics. "
+                "Your categories are creative, diverse, and cover different aspects of the given theme. "
+                "You always return exactly 5 categories in the specified JSON format."
+            ),
+            verbose=True,
+            allow_delegation=False,
+            tools=[search_tool],
+            logger=logger,
+            response_format={
+                "type": "yaml",
+                "example": category_yaml_example,
+                "description": "YAML format with a 'categories' key containing a list of 5 category names in ALL CAPS"
+            }
+        )
+
+    def _create_question_crafter(self) -> Agent:
+        """Build a Question Crafter agent.
+
+        crewai agents keep per-execution state, so concurrent category tasks
+        each get their own crafter instead of sharing self.question_crafter.
+        """
         # Define YAML structure for question generation
         question_yaml_example = """questions:
   - clue: "This is a sample clue for a 200-point question?"
@@ -111,35 +270,14 @@ class JeopardyGame:
   - clue: "This is a sample clue for an 800-point question?"
     response: "What is the sample answer?"
     value: 800
-    image: "https://example.com/sample.jpg"
+    image: "sample image search query"
   - clue: "This is a sample clue for a 1000-point question?"
     response: "What is the sample answer?"
     value: 1000
-    image: "https://example.com/sample2.jpg"
+    image: null
 """
 
-        # Category Planner Agent
-        self.category_planner = Agent(
-            role="Category Planner",
-            goal="Create engaging Jeopardy categories",
-            backstory=(
-                "You are an expert at creating fun, challenging Jeopardy categories that cover a wide range of topics. "
-                "Your categories are creative, diverse, and cover different aspects of the given theme. "
-                "You always return exactly 5 categories in the specified JSON format."
-            ),
-            verbose=True,
-            allow_delegation=False,
-            tools=[search_tool],
-            logger=logger,
-            response_format={
-                "type": "yaml",
-                "example": category_yaml_example,
-                "description": "YAML format with a 'categories' key containing a list of 5 category names in ALL CAPS"
-            }
-        )
-
-        # Question Crafter Agent
-        self.question_crafter = Agent(
+        return Agent(
             role="Question Crafter",
             goal="Create accurate and challenging Jeopardy questions",
             backstory=(
@@ -149,104 +287,225 @@ class JeopardyGame:
             ),
             verbose=True,
             allow_delegation=False,
-            tools=[search_tool, ddg_search_tool, image_tool],
+            tools=[search_tool, ddg_search_tool],
             logger=logger,
             response_format={
                 "type": "yaml",
                 "example": question_yaml_example,
-                "description": "YAML format with a 'questions' key containing a list of 5 question objects with 'clue', 'response', 'value', and optional 'image' fields"
+                "description": "YAML format with a 'questions' key containing a list of 5 question objects with 'clue', 'response', 'value', and optional 'image' search query fields"
             }
         )
 
-        # Game Assembler Agent
-        self.game_assembler = Agent(
-            role="Game Assembler",
-            goal="Format game data into proper structure",
-            backstory=(
-                "You organize Jeopardy games into the proper format for the game board. "
-                "You ensure all required fields are present and properly formatted."
-            ),
-            verbose=True,
-            allow_delegation=False,
-            logger=logger
-        )
-
     def generate_game(self) -> Dict[str, Any]:
         """Generate a complete Jeopardy game."""
-        for board_num in range(self.num_boards):
-            print(f"Generating board {board_num + 1} of {self.num_boards}...")
-            
-            # Generate categories
-            categories = self.generate_categories(board_num)
-            
-            # Generate questions for each category
-            category_questions = self.generate_questions(categories)
-            
-            # Assemble the game board
-            game_board = self.assemble_game(categories, category_questions, board_num)
-            
-            # Select Daily Doubles
-            game_board = self.select_daily_double(game_board)
-            
-            self.boards.append(game_board)
+        planned_categories = [None] * self.num_boards
+        if self.batch_planning and self.num_boards > 1:
+            planned_categories = self.generate_categories_batch(self.num_boards)
 
-        return {
+        if self.parallel_boards and self.num_boards > 1:
+            logger.info(f"Generating {self.num_boards} boards concurrently (max {self.max_concurrency} agent calls)")
+            with ThreadPoolExecutor(max_workers=self.num_boards, thread_name_prefix="jeopardy-board") as executor:
+                futures = [
+                    executor.submit(self._generate_board, board_num, planned_categories[board_num])
+                    for board_num in range(self.num_boards)
+                ]
+                self.boards = [future.result() for future in futures]
+        else:
+            for board_num in range(self.num_boards):
+                self.boards.append(self._generate_board(board_num, planned_categories[board_num]))
+
+        usage = self.usage_summary()
+        logger.info(f"Agent usage for {self.num_boards} board(s): {usage}")
+        if usage["scrape_tokens_raw"]:
+            logger.info(
+                f"Scrape condensation saved {usage['scrape_tokens_raw'] - usage['scrape_tokens_sent']} "
+                f"tokens ({usage['scrape_tokens_raw']} scraped, {usage['scrape_tokens_sent']} sent)"
+            )
+        game = {
             "theme": self.theme,
             "boards": self.boards
         }
+        if self.degraded:
+            # Served, but not cached; see app.services.game_cache.is_cacheable
+            game["degraded"] = True
+        return game
 
-    def generate_categories(self, board_num: int) -> List[str]:
-        """Generate themed categories with structured output and fallback."""
-        categories_task = Task(
-            description=(
-                f"Create 5 Jeopardy categories for the theme: '{self.theme}' (Board #{board_num + 1}).\n"
-                "## CRITICAL INSTRUCTIONS FOR YAML FORMATTING:\n"
-                "1. You MUST respond with ONLY valid YAML, starting with 'categories:' on the first line\n"
-                "2. The YAML must be properly indented with 2 spaces\n"
-                "3. Category names must be in double quotes\n"
-                "4. Do not include any markdown formatting like ```yaml or ```\n\n"
-                "## Requirements:\n"
-                "1. Create exactly 5 distinct categories that are broad enough for 5 questions each\n"
-                "2. Categories should be diverse and cover different aspects of the theme\n"
-                "3. Each category should be 1-3 words long, in ALL CAPS, and clearly indicate the topic\n"
-                "4. Categories should be ordered from most general to most specific\n\n"
-                "## Example Output (for theme 'HISTORY'):\n"
-                'categories:\n'
-                '  - "ANCIENT CIVILIZATIONS"\n'
-                '  - "MEDIEVAL TIMES"\n'
-                '  - "WORLD WARS"\n'
-                '  - "AMERICAN PRESIDENTS"\n'
-                '  - "SCIENTIFIC DISCOVERIES"'
-            ),
-            agent=self.category_planner,
-            expected_output=(
-                "A YAML document with a 'categories' key containing a list of 5 category names. "
-                "Each category should be 1-3 words, in ALL CAPS, and clearly indicate the topic. "
-                "Use the exact YAML format shown in the example."
+    def _generate_board(self, board_num: int, categories: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Generate, assemble and pick Daily Doubles for a single board."""
+        print(f"Generating board {board_num + 1} of {self.num_boards}...")
+        
+        if not categories and self.stream_plan and self.generation_mode == "per_category":
+            # Overlap the planner call with the first question calls
+            categories, category_questions = self._generate_board_pipelined(board_num)
+        else:
+            # Generate categories unless they were planned up front
+            if not categories:
+                planner = self._create_category_planner() if self.parallel_boards else self.category_planner
+                categories = self.generate_categories(board_num, agent=planner)
+            
+            self._emit("categories", {"board_number": board_num + 1, "categories": categories})
+            
+            # Generate questions for each category
+            if self.generation_mode == "oneshot":
+                category_questions = self.generate_questions_oneshot(categories, board_num)
+            else:
+                category_questions = self.generate_questions(categories, board_num)
+        
+        # Assemble the game board
+        game_board = self.assemble_game(categories, category_questions, board_num)
+        
+        # Select Daily Doubles
+        game_board = self.select_daily_double(game_board)
+        self._emit("daily_double", {
+            "board_number": board_num + 1,
+            "daily_doubles": [
+                {"category": category, "value": q["value"]}
+                for category, questions in game_board["questions"].items()
+                for q in questions
+                if q.get("dailyDouble")
+            ]
+        })
+        return game_board
+
+    def _generate_board_pipelined(self, board_num: int) -> Tuple[List[str], Dict[str, List[Dict[str, Any]]]]:
+        """Stream the category plan and craft each category as soon as it is parsed.
+
+        Returns the board's categories and their questions, in plan order. If the
+        stream fails or yields fewer than five categories, the rest are topped up
+        through the regular planner path.
+        """
+        categories: List[str] = []
+        futures = []
+        parser = CategoryStreamParser()
+
+        with ThreadPoolExecutor(max_workers=DEFAULT_CATEGORIES, thread_name_prefix="jeopardy-category") as executor:
+            def submit(new_categories: List[str]) -> None:
+                for category in new_categories:
+                    if len(categories) >= DEFAULT_CATEGORIES:
+                        return
+                    logger.info(f"Planner streamed category {len(categories) + 1}: {category}")
+                    categories.append(category)
+                    # Re-send the growing plan so clients see each column's header first
+                    self._emit("categories", {"board_number": board_num + 1, "categories": list(categories)})
+                    futures.append(executor.submit(
+                        self._generate_category_questions, category, self._create_question_crafter(), board_num
+                    ))
+
+            try:
+                logger.info(f"Streaming categories for board {board_num + 1}...")
+                for chunk in self._stream_planner_output(board_num):
+                    submit(parser.feed(chunk))
+                submit(parser.close())
+            except Exception as e:
+                logger.error(f"Error streaming categories for board {board_num + 1}: {e}")
+
+            # Top up a short plan; the new categories start as soon as they are known
+            if len(categories) < DEFAULT_CATEGORIES:
+                planned = list(categories)
+                planner = self._create_category_planner() if self.parallel_boards else self.category_planner
+                submit(self._top_up_categories(board_num, planned, set(planned), agent=planner))
+
+            results = [future.result() for future in futures]
+
+        return categories, dict(zip(categories, results))
+
+    def _stream_planner_output(self, board_num: int) -> Iterator[str]:
+        """Yield the Category Planner's response token by token.
+
+        The streamed call goes straight to the OpenAI chat API with the planner's
+        prompt, so it skips the planner's search tool in exchange for tokens
+        arriving as they are generated.
+        """
+        task = self._build_categories_task(board_num, self.category_planner)
+        messages = [
+            {"role": "system", "content": f"You are a {self.category_planner.role}. {self.category_planner.backstory}"},
+            {"role": "user", "content": f"{task.description}\n\nExpected output: {task.expected_output}"}
+        ]
+        with self._llm_slots:
+            stream = _openai_client().chat.completions.create(
+                model=PLANNER_STREAM_MODEL,
+                messages=messages,
+                stream=True,
+                # The last chunk carries the token usage of the whole call
+                stream_options={"include_usage": True}
             )
-        )
+            for chunk in stream:
+                if chunk.usage:
+                    self._record_usage(chunk.usage.prompt_tokens, chunk.usage.completion_tokens)
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+
+    def _execute_task(self, agent: Agent, task: Task, focus: str = "") -> str:
+        """Run an agent task inside the game's shared concurrency budget.
+
+        Pages the agent scrapes are condensed to the parts relevant to focus
+        (default: the theme).
+        """
+        with self._llm_slots, tool_context(focus or self.theme, self._record_condense):
+            result = agent.execute_task(task)
+        # crewai counts every request the agent makes, tool-call turns included
+        source = agent.llm if hasattr(agent.llm, "get_token_usage_summary") else agent._token_process
+        with self._usage_lock:
+            self._usage_sources[id(source)] = source
+        return result
+
+    def _record_condense(self, original: str, condensed: str) -> None:
+        with self._usage_lock:
+            self.usage["scrape_tokens_raw"] += estimate_tokens(original)
+            self.usage["scrape_tokens_sent"] += estimate_tokens(condensed)
+
+    def _record_usage(self, prompt_tokens: int, completion_tokens: int) -> None:
+        with self._usage_lock:
+            self.usage["llm_calls"] += 1
+            self.usage["prompt_tokens"] += prompt_tokens or 0
+            self.usage["completion_tokens"] += completion_tokens or 0
+
+    def usage_summary(self) -> Dict[str, int]:
+        """LLM requests and tokens of the game so far, as reported by the API.
+
+        Agent calls come from the usage crewai tracks on each agent's LLM, so
+        tool-call turns and scraped pages fed back to the model are counted;
+        agents are created per game, so their counters hold only this game.
+        """
+        with self._usage_lock:
+            usage = dict(self.usage)
+            sources = list(self._usage_sources.values())
+        for source in sources:
+            metrics = (source.get_token_usage_summary() if hasattr(source, "get_token_usage_summary")
+                       else source.get_summary())
+            usage["llm_calls"] += metrics.successful_requests
+            usage["prompt_tokens"] += metrics.prompt_tokens
+            usage["completion_tokens"] += metrics.completion_tokens
+        return usage
+
+    def _emit(self, event: str, payload: Dict[str, Any]) -> None:
+        """Send a progress event to the on_event callback, if any."""
+        if self.on_event is None:
+            return
+        try:
+            self.on_event(event, payload)
+        except Exception as e:
+            logger.error(f"Error in {event} event callback: {e}")
+
+    def generate_categories(self, board_num: int, exclude: Optional[List[str]] = None,
+                            agent: Optional[Agent] = None) -> List[str]:
+        """Generate themed categories with structured output and fallback.
+
+        Args:
+            board_num: The board number (0-based)
+            exclude: Categories already used on other boards
+            agent: Planner to run the task on (default: self.category_planner)
+        """
+        agent = agent or self.category_planner
+        categories_task = self._build_categories_task(board_num, agent, exclude)
 
         try:
             logger.info(f"Generating categories for board {board_num + 1}...")
-            categories_result = self.category_planner.execute_task(categories_task)
+            categories_result = self._execute_task(agent, categories_task)
             
             # Parse the response
             try:
-                # First try direct YAML parse
-                try:
-                    result = yaml.safe_load(categories_result)
-                    if result is None:
-                        raise ValueError("Empty YAML content")
-                    
-                    # If we got a string, try to extract YAML from markdown
-                    if isinstance(result, str):
-                        yaml_str = self._extract_yaml_from_markdown(categories_result)
-                        result = yaml.safe_load(yaml_str)
-                        if result is None:
-                            raise ValueError("No valid YAML content found after extraction")
-                except Exception as e:
-                    logger.error(f"Error parsing YAML: {e}")
-                    raise ValueError(f"Failed to parse YAML: {str(e)}")
+                result = self._load_yaml_response(categories_result)
                 
                 # Extract categories from the structured response
                 categories = result.get("categories", [])
@@ -278,8 +537,143 @@ class JeopardyGame:
             # Fallback to default categories if generation fails
             fallback = [f"{self.theme.upper()} {i+1}" for i in range(5)]
             logger.warning(f"Using fallback categories: {fallback}")
+            self.degraded = True
             return fallback
 
+    def _build_categories_task(self, board_num: int, agent: Agent, exclude: Optional[List[str]] = None) -> Task:
+        """Build the Category Planner task for a single board."""
+        avoid = ""
+        if exclude:
+            avoid = "5. Do NOT reuse any of these categories: " + ", ".join(f'"{c}"' for c in exclude) + "\n"
+        return Task(
+            description=(
+                f"Create 5 Jeopardy categories for the theme: '{self.theme}' (Board #{board_num + 1}).\n"
+                "## CRITICAL INSTRUCTIONS FOR YAML FORMATTING:\n"
+                "1. You MUST respond with ONLY valid YAML, starting with 'categories:' on the first line\n"
+                "2. The YAML must be properly indented with 2 spaces\n"
+                "3. Category names must be in double quotes\n"
+                "4. Do not include any markdown formatting like ```yaml or ```\n\n"
+                "## Requirements:\n"
+                "1. Create exactly 5 distinct categories that are broad enough for 5 questions each\n"
+                "2. Categories should be diverse and cover different aspects of the theme\n"
+                "3. Each category should be 1-3 words long, in ALL CAPS, and clearly indicate the topic\n"
+                "4. Categories should be ordered from most general to most specific\n"
+                f"{avoid}\n"
+                "## Example Output (for theme 'HISTORY'):\n"
+                'categories:\n'
+                '  - "ANCIENT CIVILIZATIONS"\n'
+                '  - "MEDIEVAL TIMES"\n'
+                '  - "WORLD WARS"\n'
+                '  - "AMERICAN PRESIDENTS"\n'
+                '  - "SCIENTIFIC DISCOVERIES"'
+            ),
+            agent=agent,
+            expected_output=(
+                "A YAML document with a 'categories' key containing a list of 5 category names. "
+                "Each category should be 1-3 words, in ALL CAPS, and clearly indicate the topic. "
+                "Use the exact YAML format shown in the example."
+            )
+        )
+
+    def generate_categories_batch(self, num_boards: int) -> List[List[str]]:
+        """Plan categories for several boards with one planner call.
+
+        Categories are deduplicated across all boards. Boards left short after
+        dedupe (or all boards, if the batch call fails) are topped up with a
+        regular per-board planner call that excludes the categories already used.
+        """
+        example_boards = "".join(
+            "  - categories:\n" + "".join(f'      - "BOARD {b + 1} CATEGORY {i + 1}"\n' for i in range(5))
+            for b in range(min(num_boards, 2))
+        )
+        batch_task = Task(
+            description=(
+                f"Create 5 Jeopardy categories for EACH of {num_boards} boards for the theme: '{self.theme}'.\n"
+                "## CRITICAL INSTRUCTIONS FOR YAML FORMATTING:\n"
+                "1. You MUST respond with ONLY valid YAML, starting with 'boards:' on the first line\n"
+                "2. The YAML must be properly indented with 2 spaces\n"
+                "3. Category names must be in double quotes\n"
+                "4. Do not include any markdown formatting like ```yaml or ```\n\n"
+                "## Requirements:\n"
+                f"1. Return exactly {num_boards} boards with exactly 5 categories each\n"
+                "2. No category may appear on more than one board\n"
+                "3. Categories should be diverse and cover different aspects of the theme\n"
+                "4. Each category should be 1-3 words long, in ALL CAPS, and clearly indicate the topic\n"
+                "5. Later boards may use harder, more specific categories\n\n"
+                "## Example Output:\n"
+                "boards:\n"
+                f"{example_boards}"
+            ),
+            agent=self.category_planner,
+            expected_output=(
+                f"A YAML document with a 'boards' key containing {num_boards} items, "
+                "each with a 'categories' list of 5 unique category names in ALL CAPS."
+            )
+        )
+
+        proposed: List[List[str]] = [[] for _ in range(num_boards)]
+        try:
+            logger.info(f"Planning categories for {num_boards} boards in one call...")
+            batch_result = self._execute_task(self.category_planner, batch_task)
+            result = self._load_yaml_response(batch_result)
+            boards = result.get("boards", [])
+            if not isinstance(boards, list):
+                raise ValueError(f"Expected 'boards' to be a list, got {type(boards).__name__}")
+            for board_num, board in enumerate(boards[:num_boards]):
+                categories = board.get("categories", []) if isinstance(board, dict) else board
+                if isinstance(categories, list):
+                    proposed[board_num] = [str(c).strip().upper() for c in categories if str(c).strip()]
+        except Exception as e:
+            logger.error(f"Batched category planning failed, planning boards individually: {e}")
+
+        # Dedupe across boards, keeping the first board that proposed a category
+        seen = set()
+        planned = []
+        for board_num in range(num_boards):
+            unique = []
+            for category in proposed[board_num]:
+                if category not in seen and len(unique) < DEFAULT_CATEGORIES:
+                    seen.add(category)
+                    unique.append(category)
+            planned.append(unique)
+
+        for board_num, categories in enumerate(planned):
+            self._top_up_categories(board_num, categories, seen)
+
+        logger.info(f"Planned categories: {planned}")
+        return planned
+
+    def _top_up_categories(self, board_num: int, categories: List[str], seen: set,
+                           agent: Optional[Agent] = None) -> List[str]:
+        """Fill a short category list in place with a planner call, then fallback names.
+
+        Returns the categories that were added.
+        """
+        added = []
+        if len(categories) >= DEFAULT_CATEGORIES:
+            return added
+        logger.warning(f"Board {board_num + 1} has {len(categories)} unique categories, topping up")
+        for category in self.generate_categories(board_num, exclude=sorted(seen), agent=agent):
+            if category not in seen and len(categories) < DEFAULT_CATEGORIES:
+                seen.add(category)
+                categories.append(category)
+                added.append(category)
+        while len(categories) < DEFAULT_CATEGORIES:
+            self.degraded = True
+            category = f"{self.theme.upper()} {board_num + 1}-{len(categories) + 1}"
+            seen.add(category)
+            categories.append(category)
+            added.append(category)
+        return added
+
+    def _load_yaml_response(self, text: str) -> Any:
+        """Load an agent's YAML response, unwrapping markdown if needed."""
+        result = parse_yaml_payload(text)
+        if result is None or isinstance(result, str):
+            logger.error("Error parsing YAML: no valid YAML content found")
+            raise ValueError("Failed to parse YAML: no valid YAML content found")
+        return result
+
     def _extract_yaml_from_markdown(self, text: str) -> str:
         """Extract YAML content from markdown code blocks.
         
@@ -289,35 +683,7 @@ class JeopardyGame:
         Returns:
             Extracted YAML content as a string
         """
-        if not text or not isinstance(text, str):
-            return ""
-            
-        # Remove markdown code block markers
-        text = re.sub(r'^```(?:yaml)?\s*', '', text, flags=re.IGNORECASE | re.MULTILINE)
-        text = re.sub(r'```$', '', text, flags=re.IGNORECASE | re.MULTILINE)
-        text = text.strip()
-        
-        # Try to extract YAML content between backticks
-        if '```' in text:
-            parts = [p.strip() for p in text.split('```') if p.strip()]
-            if parts:
-                parts.sort(key=len, reverse=True)
-                for part in parts:
-                    if re.search(r'^(categories|questions):', part, re.MULTILINE):
-                        return part.strip()
-        
-        # Return text if it looks like YAML, otherwise clean it up
-        if re.search(r'^(categories|questions):', text, re.MULTILINE):
-            return text.strip()
-            
-        # Clean up remaining text
-        lines = [
-            re.sub(r'`', '', line).strip()
-            for line in text.split('\n')
-            if line.strip() and not line.startswith(('```', '---', '...'))
-        ]
-        
-        return '\n'.join(lines) if lines else text.strip()
+        return extract_payload(text)
 
     def _parse_questions_response(self, response_text: str, category: str) -> List[Dict[str, Any]]:
         """Parse and validate the questions response from the agent.
@@ -338,30 +704,8 @@ class JeopardyGame:
                 
             logger.debug(f"Processing response for category: {category}")
             
-            # Extract and clean YAML content
-            yaml_content = self._extract_yaml_from_markdown(response_text)
-            if '```' in yaml_content:
-                yaml_content = re.sub(r'```[^`]*```', '', yaml_content, flags=re.DOTALL)
-                yaml_content = yaml_content.replace('```', '').strip()
-            
-            # Parse YAML with fallback to raw text
-            result = None
-            for attempt in [yaml_content, response_text]:
-                try:
-                    result = yaml.safe_load(attempt)
-                    if result is not None:
-                        break
-                except yaml.YAMLError:
-                    continue
-                    
-            if result is None:
-                yaml_blocks = re.findall(
-                    r'(?:^|\n)(categories|questions):[\s\S]*?(?=\n\w+:|\Z)',
-                    response_text,
-                    re.MULTILINE
-                )
-                if yaml_blocks:
-                    result = yaml.safe_load('\n'.join(yaml_blocks))
+            # Extract and parse the YAML content
+            result = parse_yaml_payload(response_text)
             
             if result is None:
                 raise ValueError("Could not extract valid YAML from response")
@@ -376,48 +720,7 @@ class JeopardyGame:
             if not isinstance(questions, list):
                 raise ValueError(f"Expected 'questions' to be a list, got {type(questions).__name__}")
                 
-            # Validate and clean each question
-            validated_questions = []
-            seen_values = set()
-            
-            for q in questions:
-                if not isinstance(q, dict):
-                    logger.warning(f"Skipping invalid question (not a dict): {q}")
-                    continue
-                    
-                if not all(field in q for field in ["clue", "response", "value"]):
-                    logger.warning(f"Skipping incomplete question: {q}")
-                    continue
-                    
-                if q["value"] in seen_values:
-                    logger.warning(f"Skipping duplicate value {q['value']} in category {category}")
-                    continue
-                    
-                if q["value"] not in QUESTION_VALUES:
-                    logger.warning(f"Skipping invalid value {q['value']} in category {category}")
-                    continue
-                    
-                # Clean up the question
-                q["clue"] = q["clue"].strip()
-                if not q["clue"].endswith('?'):
-                    q["clue"] += "?"
-                    
-                q["response"] = q["response"].strip()
-                if not q["response"].lower().startswith(('what is ', 'what are ')):
-                    q["response"] = f"What is {q['response'].strip(' .?')}?"
-                    
-                q["image"] = q.get("image")
-                q["isDailyDouble"] = False
-                
-                seen_values.add(q["value"])
-                validated_questions.append(q)
-                
-            if not validated_questions:
-                raise ValueError("No valid questions found in response")
-                
-            # Sort questions by value
-            validated_questions.sort(key=lambda x: x["value"])
-            return validated_questions
+            return self._validate_questions(questions, category)
                 
         except (ValueError, KeyError, AttributeError) as e:
             logger.error(f"Error parsing questions for {category}: {e}\nRaw response: {response_text}")
@@ -426,93 +729,340 @@ class JeopardyGame:
             logger.error(f"Unexpected error parsing questions: {e}")
             raise
 
-    def generate_questions(self, categories: List[str]) -> Dict[str, List[Dict[str, Any]]]:
-        """Generate questions for each category with structured output and validation."""
-        all_questions = {}
-        
+    def generate_questions_oneshot(self, categories: List[str], board_num: int = 0) -> Dict[str, List[Dict[str, Any]]]:
+        """Generate the whole board with a single Question Crafter call.
+
+        Each column is validated like a per-category response. Columns with
+        some valid questions only have their missing value slots repaired;
+        columns that are missing or have none are regenerated through the
+        per-category path.
+        """
+        agent = self.question_crafter if not self.parallel_boards else self._create_question_crafter()
+        board_task = self._build_board_task(categories, agent)
+        columns: Dict[str, Any] = {}
+        try:
+            logger.info(f"Generating all {len(categories)} categories in one call for board {board_num + 1}")
+            board_result = self._execute_task(agent, board_task, focus=f"{' '.join(categories)} {self.theme}")
+            result = self._load_yaml_response(board_result)
+            for column in result.get("board", []):
+                if isinstance(column, dict) and column.get("category"):
+                    columns[str(column["category"]).strip().upper()] = column.get("questions", [])
+        except Exception as e:
+            logger.error(f"Error generating board {board_num + 1} in one call: {e}")
+
+        all_questions: Dict[str, List[Dict[str, Any]]] = {}
+        partial: Dict[str, List[Dict[str, Any]]] = {}
+        failed = []
         for category in categories:
             try:
-                logger.info(f"Generating questions for category: {category}")
-                questions_task = Task(
-                    description=(
-                        f"Create 5 Jeopardy questions for the category: '{category}'\n"
-                        f"Theme: {self.theme}\n\n"
-                        "## CRITICAL INSTRUCTIONS FOR YAML FORMATTING:\n"
-                        "1. You MUST respond with ONLY valid YAML, starting with 'questions:' on the first line\n"
-                        "2. The YAML must be properly indented with 2 spaces\n"
-                        "3. All strings MUST be in double quotes ("") not single quotes (')\n"
-                        "4. Use 'null' (without quotes) for empty image fields\n"
-                        "5. Do NOT include any markdown formatting like ```yaml or ```\n\n"
-                        "## Requirements:\n"
-                        f"1. Questions should relate to both the category '{category}' and the overall theme '{self.theme}'\n"
-                        "2. Create exactly 5 questions with increasing difficulty (200, 400, 600, 800, 1000 points)\n"
-                        "3. Questions must be in ascending order of value (200, 400, 600, 800, 1000)\n"
-                        "4. Each question must have these exact fields:\n"
-                        "   - `clue`: The question text (must end with a question mark)\n"
-                        "   - `response`: The answer (must start with 'What is' or 'What are')\n"
-                        "   - `value`: The point value (must be one of: 200, 400, 600, 800, 1000)\n"
-                        "   - `image`: Must be a valid URL or 'null'\n\n"
-                        '## Example Output (for category \'WORLD CAPITALS\' and theme \'EUROPEAN GEOGRAPHY\'):\n'
-                        'questions:\n'
-                        '  - clue: "This European capital is home to the Eiffel Tower."\n'
-                        '    response: "What is Paris?"\n'
-                        '    value: 200\n'
-                        '    image: null\n'
-                        '  - clue: "This city on the Tiber River is the capital of Italy and home to the Colosseum."\n'
-                        '    response: "What is Rome?"\n'
-                        '    value: 400\n'
-                        '    image: null\n'
-                        '  - clue: "This German city, once divided by a wall, became the capital of a reunified Germany in 1990."\n'
-                        '    response: "What is Berlin?"\n'
-                        '    value: 600\n'
-                        '    image: null\n'
-                        '  - clue: "This city, the capital of Spain, is home to the Prado Museum and the Royal Palace."\n'
-                        '    response: "What is Madrid?"\n'
-                        '    value: 800\n'
-                        '    image: "https://example.com/madrid.jpg"\n'
-                        '  - clue: "This capital city, located on the Bosphorus Strait, serves as a bridge between Europe and Asia."\n'
-                        '    response: "What is Istanbul?"\n'
-                        '    value: 1000\n'
-                        '    image: "https://example.com/istanbul.jpg"'
-                    ),
-                    agent=self.question_crafter,
-                    expected_output=(
-                        "A YAML document with a 'questions' key containing a list of 5 question objects. "
-                        "Each question must have 'clue', 'response', and 'value' fields, and an optional 'image' field. "
-                        "Values must be 200, 400, 600, 800, or 1000 points in ascending order. "
-                        "Use the exact YAML format shown in the example."
-                    )
-                )
+                questions = self._validate_questions(columns.get(category.upper(), []), category)
+            except (ValueError, KeyError, AttributeError) as e:
+                logger.warning(f"One-shot column for {category} failed validation: {e}")
+                failed.append(category)
+                continue
+            if len(questions) < QUESTIONS_PER_CATEGORY:
+                partial[category] = questions
+                continue
+            all_questions[category] = questions
+            self._emit("category", {"board_number": board_num + 1, "category": category, "questions": questions})
+
+        if partial:
+            logger.info(f"Repairing one-shot columns with missing values: {list(partial)}")
+            all_questions.update(self._repair_columns(partial, board_num))
+
+        if failed:
+            logger.info(f"Falling back to per-category generation for: {failed}")
+            all_questions.update(self.generate_questions(failed, board_num))
+
+        return {category: all_questions[category] for category in categories}
+
+    def _repair_columns(self, partial: Dict[str, List[Dict[str, Any]]], board_num: int = 0) -> Dict[str, List[Dict[str, Any]]]:
+        """Complete several partially valid columns, concurrently when allowed."""
+        def repair(category: str, agent: Agent) -> List[Dict[str, Any]]:
+            questions = self._complete_questions(category, partial[category], agent)
+            self._emit("category", {"board_number": board_num + 1, "category": category, "questions": questions})
+            return questions
+
+        if self.max_concurrency <= 1 or len(partial) <= 1:
+            agent = self.question_crafter if not self.parallel_boards else self._create_question_crafter()
+            return {category: repair(category, agent) for category in partial}
+
+        workers = min(self.max_concurrency, len(partial))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="jeopardy-repair") as executor:
+            futures = {
+                category: executor.submit(repair, category, self._create_question_crafter())
+                for category in partial
+            }
+            return {category: future.result() for category, future in futures.items()}
+
+    def _build_board_task(self, categories: List[str], agent: Agent) -> Task:
+        """Build a Question Crafter task that asks for every category's questions at once."""
+        category_list = "\n".join(f'  - "{category}"' for category in categories)
+        return Task(
+            description=(
+                f"Create 5 Jeopardy questions for EACH of these categories:\n{category_list}\n"
+                f"Theme: {self.theme}\n\n"
+                "## CRITICAL INSTRUCTIONS FOR YAML FORMATTING:\n"
+                "1. You MUST respond with ONLY valid YAML, starting with 'board:' on the first line\n"
+                "2. The YAML must be properly indented with 2 spaces\n"
+                "3. All strings MUST be in double quotes\n"
+                "4. Use 'null' (without quotes) for empty image fields\n"
+                "5. Do NOT include any markdown formatting like ```yaml or ```\n\n"
+                "## Requirements:\n"
+                "1. One board entry per category, in the order listed, with the category name exactly as given\n"
+                "2. Each category has exactly 5 questions worth 200, 400, 600, 800 and 1000 points, in ascending order\n"
+                "3. Each question has `clue` (ends with a question mark), `response` (starts with 'What is' "
+                "or 'What are'), `value`, and `image` (a short image search query for a picture that "
+                "fits the clue, or null)\n\n"
+                "## Example Output (one category shown):\n"
+                'board:\n'
+                '  - category: "WORLD CAPITALS"\n'
+                '    questions:\n'
+                '      - clue: "This European capital is home to the Eiffel Tower."\n'
+                '        response: "What is Paris?"\n'
+                '        value: 200\n'
+                '        image: null\n'
+                '      - clue: "This city on the Tiber River is the capital of Italy."\n'
+                '        response: "What is Rome?"\n'
+                '        value: 400\n'
+                '        image: null'
+            ),
+            agent=agent,
+            expected_output=(
+                f"A YAML document with a 'board' key containing {len(categories)} entries, each with a "
+                "'category' name and a 'questions' list of 5 question objects with 'clue', 'response', "
+                "'value' and 'image' fields."
+            )
+        )
+
+    def _validate_questions(self, questions: List[Any], category: str) -> List[Dict[str, Any]]:
+        """Validate and clean a category's parsed question list.
+
+        Invalid, incomplete and duplicate-value questions are dropped.
 
-                # Execute the task
-                questions_result = self.question_crafter.execute_task(questions_task)
+        Raises:
+            ValueError: If no valid questions remain
+        """
+        # Validate and clean each question
+        validated_questions = []
+        seen_values = set()
+        
+        for q in questions:
+            if not isinstance(q, dict):
+                logger.warning(f"Skipping invalid question (not a dict): {q}")
+                continue
                 
-                # Parse and validate the response
-                try:
-                    questions = self._parse_questions_response(questions_result, category)
-                    all_questions[category] = questions
-                    logger.info(f"Successfully generated {len(questions)} questions for {category}")
-                    
-                except Exception as e:
-                    logger.error(f"Error parsing questions for {category}: {e}")
-                    raise
+            if not all(field in q for field in ["clue", "response", "value"]):
+                logger.warning(f"Skipping incomplete question: {q}")
+                continue
+                
+            if q["value"] in seen_values:
+                logger.warning(f"Skipping duplicate value {q['value']} in category {category}")
+                continue
                 
+            if q["value"] not in QUESTION_VALUES:
+                logger.warning(f"Skipping invalid value {q['value']} in category {category}")
+                continue
+                
+            # Clean up the question
+            q["clue"] = q["clue"].strip()
+            if not q["clue"].endswith('?'):
+                q["clue"] += "?"
+                
+            q["response"] = q["response"].strip()
+            if not q["response"].lower().startswith(('what is ', 'what are ')):
+                q["response"] = f"What is {q['response'].strip(' .?')}?"
+                
+            # The crafter writes an image search query; enrich_game_images resolves it later.
+            # A URL from the model is never trusted as the image itself: it may be made up
+            image = q.get("image")
+            q["image"] = None
+            if isinstance(image, str) and image.strip() and not is_url(image):
+                q["image_query"] = image.strip()
+            q["isDailyDouble"] = False
+            
+            seen_values.add(q["value"])
+            validated_questions.append(q)
+            
+        if not validated_questions:
+            raise ValueError("No valid questions found in response")
+            
+        # Sort questions by value
+        validated_questions.sort(key=lambda x: x["value"])
+        return validated_questions
+
+    def generate_questions(self, categories: List[str], board_num: int = 0) -> Dict[str, List[Dict[str, Any]]]:
+        """Generate questions for each category with structured output and validation.
+
+        With max_concurrency > 1 the categories are fanned out over a bounded
+        thread pool. Results are keyed in the original category order either way,
+        so assemble_game lays the board out the same as the serial path.
+        """
+        if self.max_concurrency <= 1 or len(categories) <= 1:
+            return {
+                category: self._generate_category_questions(category, self.question_crafter, board_num)
+                for category in categories
+            }
+
+        workers = min(self.max_concurrency, len(categories))
+        logger.info(f"Generating questions for {len(categories)} categories with {workers} workers")
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="jeopardy-category") as executor:
+            futures = [
+                executor.submit(
+                    self._generate_category_questions, category, self._create_question_crafter(), board_num
+                )
+                for category in categories
+            ]
+            results = [future.result() for future in futures]
+
+        return dict(zip(categories, results))
+
+    def _build_questions_task(self, category: str, agent: Agent) -> Task:
+        """Build the Question Crafter task for a single category."""
+        return Task(
+            description=(
+                f"Create 5 Jeopardy questions for the category: '{category}'\n"
+                f"Theme: {self.theme}\n\n"
+                "## CRITICAL INSTRUCTIONS FOR YAML FORMATTING:\n"
+                "1. You MUST respond with ONLY valid YAML, starting with 'questions:' on the first line\n"
+                "2. The YAML must be properly indented with 2 spaces\n"
+                "3. All strings MUST be in double quotes ("") not single quotes (')\n"
+                "4. Use 'null' (without quotes) for empty image fields\n"
+                "5. Do NOT include any markdown formatting like ```yaml or ```\n\n"
+                "## Requirements:\n"
+                f"1. Questions should relate to both the category '{category}' and the overall theme '{self.theme}'\n"
+                "2. Create exactly 5 questions with increasing difficulty (200, 400, 600, 800, 1000 points)\n"
+                "3. Questions must be in ascending order of value (200, 400, 600, 800, 1000)\n"
+                "4. Each question must have these exact fields:\n"
+                "   - `clue`: The question text (must end with a question mark)\n"
+                "   - `response`: The answer (must start with 'What is' or 'What are')\n"
+                "   - `value`: The point value (must be one of: 200, 400, 600, 800, 1000)\n"
+                "   - `image`: A short image search query for a picture that fits the clue "
+                "(e.g. \"Prado Museum Madrid\"), or 'null' if no picture would help\n\n"
+                '## Example Output (for category \'WORLD CAPITALS\' and theme \'EUROPEAN GEOGRAPHY\'):\n'
+                'questions:\n'
+                '  - clue: "This European capital is home to the Eiffel Tower."\n'
+                '    response: "What is Paris?"\n'
+                '    value: 200\n'
+                '    image: null\n'
+                '  - clue: "This city on the Tiber River is the capital of Italy and home to the Colosseum."\n'
+                '    response: "What is Rome?"\n'
+                '    value: 400\n'
+                '    image: null\n'
+                '  - clue: "This German city, once divided by a wall, became the capital of a reunified Germany in 1990."\n'
+                '    response: "What is Berlin?"\n'
+                '    value: 600\n'
+                '    image: null\n'
+                '  - clue: "This city, the capital of Spain, is home to the Prado Museum and the Royal Palace."\n'
+                '    response: "What is Madrid?"\n'
+                '    value: 800\n'
+                '    image: "Prado Museum Madrid"\n'
+                '  - clue: "This capital city, located on the Bosphorus Strait, serves as a bridge between Europe and Asia."\n'
+                '    response: "What is Istanbul?"\n'
+                '    value: 1000\n'
+                '    image: "Istanbul Bosphorus skyline"'
+            ),
+            agent=agent,
+            expected_output=(
+                "A YAML document with a 'questions' key containing a list of 5 question objects. "
+                "Each question must have 'clue', 'response', and 'value' fields, and an optional 'image' search query. "
+                "Values must be 200, 400, 600, 800, or 1000 points in ascending order. "
+                "Use the exact YAML format shown in the example."
+            )
+        )
+
+    def _generate_category_questions(self, category: str, agent: Agent, board_num: int = 0) -> List[Dict[str, Any]]:
+        """Generate and validate the questions for one category.
+
+        Value slots the response leaves empty (or the whole category, if the
+        response can't be used at all) are re-requested through a small repair
+        prompt; only slots still empty after that get sample questions.
+        """
+        questions: List[Dict[str, Any]] = []
+        try:
+            logger.info(f"Generating questions for category: {category}")
+            questions_task = self._build_questions_task(category, agent)
+
+            # Execute the task
+            questions_result = self._execute_task(agent, questions_task, focus=f"{category} {self.theme}")
+            
+            # Parse and validate the response
+            questions = self._parse_questions_response(questions_result, category)
+            logger.info(f"Successfully generated {len(questions)} questions for {category}")
+            
+        except Exception as e:
+            logger.exception(f"Error generating questions for {category}")
+
+        questions = self._complete_questions(category, questions, agent)
+        self._emit("category", {"board_number": board_num + 1, "category": category, "questions": questions})
+        return questions
+
+    def _complete_questions(self, category: str, questions: List[Dict[str, Any]], agent: Agent) -> List[Dict[str, Any]]:
+        """Fill the value slots missing from a category's validated questions.
+
+        Args:
+            category: Category the questions belong to
+            questions: Validated questions, possibly fewer than five
+            agent: Question Crafter to send repair requests to
+
+        Returns:
+            One question per value in QUESTION_VALUES, sorted by value
+        """
+        for attempt in range(REPAIR_ATTEMPTS):
+            missing = [value for value in QUESTION_VALUES if value not in {q["value"] for q in questions}]
+            if not missing:
+                break
+            logger.info(f"Repairing {category}: requesting values {missing} (attempt {attempt + 1})")
+            try:
+                repair_task = self._build_repair_task(category, missing, questions, agent)
+                repair_result = self._execute_task(agent, repair_task, focus=f"{category} {self.theme}")
+                repaired = self._parse_questions_response(repair_result, category)
             except Exception as e:
-                logger.exception(f"Error generating questions for {category}")
-                # Generate fallback questions
-                fallback_questions = [
-                    {
-                        "clue": f"This is a sample question for {category} (${value})?",
-                        "response": f"What is the sample answer for the ${value} question in {category}?",
-                        "value": value,
-                        "image": None,
-                        "isDailyDouble": False
-                    } for value in [200, 400, 600, 800, 1000]
-                ]
-                all_questions[category] = fallback_questions
-                logger.warning(f"Using fallback questions for {category}")
+                logger.error(f"Error repairing questions for {category}: {e}")
+                continue
+            known_responses = {q["response"].lower() for q in questions}
+            for q in repaired:
+                # Keep only the requested slots, and no repeats of an existing answer
+                if q["value"] in missing and q["response"].lower() not in known_responses:
+                    questions.append(q)
+                    missing.remove(q["value"])
+                    known_responses.add(q["response"].lower())
 
-        return all_questions
+        missing = [value for value in QUESTION_VALUES if value not in {q["value"] for q in questions}]
+        if missing:
+            logger.warning(f"Using fallback questions for {category} values {missing}")
+            self.degraded = True
+            questions = questions + [
+                {
+                    "clue": f"This is a sample question for {category} (${value})?",
+                    "response": f"What is the sample answer for the ${value} question in {category}?",
+                    "value": value,
+                    "image": None,
+                    "isDailyDouble": False
+                } for value in missing
+            ]
+        return sorted(questions, key=lambda q: q["value"])
+
+    def _build_repair_task(self, category: str, missing: List[int], questions: List[Dict[str, Any]],
+                           agent: Agent) -> Task:
+        """Build a small Question Crafter task for just the missing value slots."""
+        values = ", ".join(str(value) for value in missing)
+        existing = "\n".join(f'  - {q["value"]}: "{q["response"]}"' for q in questions) or "  (none)"
+        return Task(
+            description=(
+                f"Write Jeopardy questions for the category '{category}' (theme: {self.theme}) "
+                f"worth exactly these values: {values}. One question per value, harder for higher values.\n"
+                f"Do not reuse these existing answers:\n{existing}\n\n"
+                "Respond with ONLY valid YAML starting with 'questions:', no markdown. Each question has "
+                "`clue` (ends with a question mark), `response` (starts with 'What is' or 'What are'), "
+                "`value`, and `image` (a short image search query, or null). Strings in double quotes."
+            ),
+            agent=agent,
+            expected_output=(
+                f"A YAML document with a 'questions' key listing {len(missing)} question objects "
+                f"with values {values}."
+            )
+        )
 
     def select_daily_double(self, game_board: Dict[str, Any]) -> Dict[str, Any]:
         """Randomly select one question to be a daily double.
@@ -592,6 +1142,9 @@ class JeopardyGame:
                         "dailyDouble": q.get("isDailyDouble", False),
                         "image": q.get("image")
                     }
+                    if q.get("image_query"):
+                        # Resolved after assembly by enrich_game_images
+                        question_obj["image_query"] = q["image_query"]
                     
                     formatted_questions[category].append(question_obj)
                     total_questions += 1
@@ -602,6 +1155,7 @@ class JeopardyGame:
             else:
                 # Generate fallback questions for missing categories
                 logger.warning(f"No questions generated for category: {category}")
+                self.degraded = True
                 for value in QUESTION_VALUES:
                     formatted_questions[category].append({
                         "question": f"Sample question for {category} (${value})?",
@@ -632,21 +1186,44 @@ class JeopardyGame:
 
     # Removed duplicate select_daily_double method
 
-def create_jeopardy_game(theme: str, num_boards: int = 1, save_to_file: bool = True) -> Dict[str, Any]:
+def create_jeopardy_game(theme: str, num_boards: int = 1, save_to_file: bool = True,
+                         max_concurrency: int = DEFAULT_MAX_CONCURRENCY, parallel_boards: bool = False,
+                         batch_planning: bool = False, stream_plan: bool = False,
+                         generation_mode: str = "per_category", enrich_images: bool = True,
+                         on_event: Optional[Callable[[str, Dict[str, Any]], None]] = None) -> Dict[str, Any]:
     """Create a Jeopardy game with the given theme and number of boards.
     
     Args:
         theme: The theme for the Jeopardy game
         num_boards: Number of game boards to generate (default: 1)
         save_to_file: Whether to save the game data to a file (default: True)
+        max_concurrency: Max LLM calls in flight at once across all boards (default: 5)
+        parallel_boards: Build boards concurrently (default: False)
+        batch_planning: Plan all boards' categories in one planner call (default: False)
+        stream_plan: Start question crafting off a streamed category plan (default: False)
+        generation_mode: "per_category" or "oneshot" (default: "per_category")
+        enrich_images: Resolve clue images before returning (default: True). The
+            API server passes False and enriches the text-only board in the background.
+        on_event: Optional progress callback, see JeopardyGame
         
     Returns:
         A dictionary containing the game data or error information
     """
     try:
         # Initialize game with the theme
-        game = JeopardyGame(theme, num_boards)
+        game = JeopardyGame(
+            theme,
+            num_boards,
+            max_concurrency=max_concurrency,
+            parallel_boards=parallel_boards,
+            batch_planning=batch_planning,
+            stream_plan=stream_plan,
+            generation_mode=generation_mode,
+            on_event=on_event
+        )
         game_data = game.generate_game()
+        if enrich_images:
+            enrich_game_images(game_data)
         
         if save_to_file:
             os.makedirs('game_outputs', exist_ok=True)
@@ -675,11 +1252,28 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser(description='Generate Jeopardy game data')
     parser.add_argument('--theme', type=str, required=True, help='Theme for the Jeopardy game')
     parser.add_argument('--num-boards', type=int, default=1, help='Number of game boards to generate')
+    parser.add_argument('--max-concurrency', type=int, default=DEFAULT_MAX_CONCURRENCY,
+                        help='Max LLM calls in flight at once across all boards (1 = serial)')
+    parser.add_argument('--parallel-boards', action='store_true', help='Build boards concurrently')
+    parser.add_argument('--batch-planning', action='store_true', help='Plan all boards in one planner call')
+    parser.add_argument('--stream-plan', action='store_true',
+                        help='Start crafting questions while the category plan is still streaming')
+    parser.add_argument('--generation-mode', choices=GENERATION_MODES, default='per_category',
+                        help='Generate each category separately or the whole board in one call')
+    parser.add_argument('--offline-tools', action='store_true',
+                        help='Serve search and scrape results only from the tool cache')
     
     args = parser.parse_args()
+    if args.offline_tools:
+        search_tool.offline = ddg_search_tool.tool.offline = True
     
     try:
-        game = create_jeopardy_game(args.theme, args.num_boards, save_to_file=True)
+        game = create_jeopardy_game(args.theme, args.num_boards, save_to_file=True,
+                                    max_concurrency=args.max_concurrency,
+                                    parallel_boards=args.parallel_boards,
+                                    batch_planning=args.batch_planning,
+                                    stream_plan=args.stream_plan,
+                                    generation_mode=args.generation_mode)
         print(yaml.dump(game, default_flow_style=False, sort_keys=False))
         print(f"Generated Jeopardy game with theme: {game['theme']}")
         print(f"Number of boards: {len(game['boards'])}")
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Shared parsing for the YAML/JSON payloads returned by the game agents.
+
+Agents wrap their answers in markdown fences, lead with prose ("Here are your
+questions:") or trail off with commentary. The helpers here pull the payload
+out in a single pass over the text and load it with the fastest available
+parser (libyaml's CSafeLoader when PyYAML was built with it, json for JSON).
+"""
+
+import json
+import re
+from functools import lru_cache
+from typing import Any, List, Optional, Sequence
+
+import yaml
+
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader
+
+# Top-level keys of the YAML documents the Jeopardy agents produce
+YAML_KEYS = ("board", "boards", "categories", "questions")
+
+
+@lru_cache(maxsize=None)
+def _key_pattern(keys: Sequence[str]) -> "re.Pattern":
+    return re.compile(r"^(?:%s):" % "|".join(re.escape(k) for k in keys))
+
+
+# A line that can continue a YAML document at the top level
+_YAML_CONTINUATION = re.compile(r"^(?:\s|-\s|-$|#|[\w\"'-]+\s*:)")
+
+
+def load_yaml(text: str) -> Any:
+    """Load YAML with the C-accelerated safe loader when available."""
+    return yaml.load(text, Loader=SafeLoader)
+
+
+def extract_payload(text: str, keys: Sequence[str] = YAML_KEYS) -> str:
+    """Extract the YAML document from an agent response in one pass.
+
+    Prefers the longest fenced block that contains one of ``keys`` at the
+    start of a line; otherwise takes the unfenced text from the first key
+    line up to the first line of trailing prose. Falls back to the longest
+    fenced block, then to the whole text.
+    """
+    if not text or not isinstance(text, str):
+        return ""
+
+    pattern = _key_pattern(tuple(keys))
+    best_block: Optional[List[str]] = None
+    any_block: Optional[List[str]] = None
+    block: List[str] = []
+    block_start = -1
+    outside: List[str] = []
+    outside_state = "before"  # then "inside" the document, then "after" it
+    in_fence = False
+
+    for line in text.splitlines():
+        if line.lstrip().startswith("```"):
+            if in_fence:
+                if block_start >= 0 and (best_block is None or len(block) - block_start > len(best_block)):
+                    best_block = block[block_start:]
+                if any_block is None or len(block) > len(any_block):
+                    any_block = block
+            in_fence = not in_fence
+            block, block_start = [], -1
+            continue
+
+        if in_fence:
+            if block_start < 0 and pattern.match(line):
+                block_start = len(block)
+            block.append(line)
+            continue
+
+        if outside_state == "before" and pattern.match(line):
+            outside_state = "inside"
+        elif outside_state == "inside" and line.strip() and not _YAML_CONTINUATION.match(line):
+            # Trailing prose after the document
+            outside_state = "after"
+        if outside_state == "inside":
+            outside.append(line)
+
+    # An unterminated fence still counts
+    if in_fence and block_start >= 0 and (best_block is None or len(block) - block_start > len(best_block)):
+        best_block = block[block_start:]
+
+    if best_block:
+        return "\n".join(best_block).strip()
+    if outside:
+        return "\n".join(outside).strip()
+    if any_block:
+        return "\n".join(any_block).strip()
+    return text.strip()
+
+
+def parse_yaml_payload(text: str, keys: Sequence[str] = YAML_KEYS) -> Any:
+    """Parse an agent's YAML response, returning None if nothing loads.
+
+    Clean responses that already start with one of ``keys`` are loaded
+    directly; anything else goes through extract_payload once.
+    """
+    if not text or not isinstance(text, str):
+        return None
+
+    stripped = text.strip()
+    if "```" not in stripped and _key_pattern(tuple(keys)).match(stripped):
+        try:
+            return load_yaml(stripped)
+        except yaml.YAMLError:
+            pass
+
+    try:
+        return load_yaml(extract_payload(text, keys))
+    except yaml.YAMLError:
+        return None
+
+
+def loads_json(text: str) -> Any:
+    """Parse a JSON payload from an agent response.
+
+    Tries the raw text first, then the first fenced block, then the span
+    between the first opening and last closing bracket.
+
+    Raises:
+        ValueError: If no JSON could be parsed
+    """
+    if not text or not isinstance(text, str):
+        raise ValueError("Empty or invalid response text")
+
+    stripped = text.strip()
+    if stripped[:1] in ("{", "["):
+        try:
+            return json.loads(stripped)
+        except ValueError:
+            pass
+
+    if "```" in stripped:
+        fenced = stripped.split("```", 2)[1]
+        # Drop a language tag such as ```json
+        first_line, _, rest = fenced.partition("\n")
+        if first_line.strip().isalpha():
+            fenced = rest
+        try:
+            return json.loads(fenced.strip())
+        except ValueError:
+            pass
+
+    starts = [i for i in (stripped.find("{"), stripped.find("[")) if i >= 0]
+    end = max(stripped.rfind("}"), stripped.rfind("]"))
+    if starts and end > min(starts):
+        return json.loads(stripped[min(starts):end + 1])
+    raise ValueError("No JSON payload found in response")
@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""A persistent library of survey personas for Feud panels.
+
+Personas generated for one game are kept and reused by later ones. The
+library is indexed in memory by age band, occupation and trait, so a
+demographically balanced panel is sampled without any model calls; the
+LLM is only asked for personas in age bands the library is short of.
+Respondent agents are built once per persona and checked out per game.
+"""
+
+import hashlib
+import logging
+import math
+import os
+import random
+import threading
+from collections import defaultdict
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from trivai_cache import SQLiteCache
+
+logger = logging.getLogger(__name__)
+
+# (label, lowest age, highest age); panels are spread evenly across these
+AGE_BANDS: List[Tuple[str, int, int]] = [
+    ("18-29", 18, 29),
+    ("30-44", 30, 44),
+    ("45-59", 45, 59),
+    ("60-80", 60, 80),
+]
+PERSONA_LIBRARY_MAX = int(os.getenv("PERSONA_LIBRARY_MAX", "5000"))
+
+# Called with {age band label: personas needed}, returns raw persona dicts
+TopUp = Callable[[Dict[str, int]], List[Dict[str, Any]]]
+
+
+def age_band(age: int) -> str:
+    """Return the label of the age band age falls in, clamped to the outer bands."""
+    for label, low, high in AGE_BANDS:
+        if age <= high:
+            return label if age >= low else AGE_BANDS[0][0]
+    return AGE_BANDS[-1][0]
+
+
+def persona_id(persona: Dict[str, Any]) -> str:
+    """A stable id for a persona, from its name, age and occupation."""
+    identity = "|".join(str(persona.get(field, "")).strip().lower() for field in ("name", "age", "occupation"))
+    return hashlib.sha1(identity.encode("utf-8")).hexdigest()[:16]
+
+
+def normalize_persona(raw: Any) -> Optional[Dict[str, Any]]:
+    """Clean up a generated persona, or return None if it's unusable."""
+    if not isinstance(raw, dict) or not str(raw.get("name", "")).strip():
+        return None
+    try:
+        age = int(raw.get("age"))
+    except (TypeError, ValueError):
+        return None
+    traits = raw.get("traits") or []
+    if isinstance(traits, str):
+        traits = [t for t in (t.strip() for t in traits.split(",")) if t]
+    persona = {
+        "name": str(raw["name"]).strip(),
+        "age": age,
+        "occupation": str(raw.get("occupation") or "General").strip(),
+        "background": str(raw.get("background") or "").strip(),
+        "traits": [str(t).strip() for t in traits][:5],
+        "perspective": str(raw.get("perspective") or "").strip(),
+    }
+    persona["id"] = persona_id(persona)
+    return persona
+
+
+class PersonaLibrary:
+    """Persisted personas with in-memory indices for panel sampling.
+
+    Safe to share between threads.
+    """
+
+    def __init__(self, store: Optional[SQLiteCache] = None, seed: Optional[int] = None):
+        # Personas never expire; the least recently sampled go first past the limit,
+        # see sample and _unindex
+        self.store = store if store is not None else SQLiteCache(
+            "personas", ttl=10 * 365 * 24 * 60 * 60, max_entries=PERSONA_LIBRARY_MAX
+        )
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._loaded = False
+        self._personas: Dict[str, Dict[str, Any]] = {}
+        self._by_band: Dict[str, List[str]] = defaultdict(list)
+        self._by_occupation: Dict[str, Set[str]] = defaultdict(set)
+        self._by_trait: Dict[str, Set[str]] = defaultdict(set)
+        # Idle respondent agents per persona id
+        self._agents: Dict[str, List[Any]] = defaultdict(list)
+        self.stats = {"sampled": 0, "generated": 0, "top_ups": 0, "agents_built": 0, "agents_reused": 0}
+
+    def _load(self) -> None:
+        if self._loaded:
+            return
+        for _, persona in self.store.items():
+            self._index(persona)
+        self._loaded = True
+        logger.info(f"Loaded {len(self._personas)} personas")
+
+    def _index(self, persona: Dict[str, Any]) -> bool:
+        pid = persona["id"]
+        if pid in self._personas:
+            return False
+        self._personas[pid] = persona
+        self._by_band[age_band(persona["age"])].append(pid)
+        self._by_occupation[persona["occupation"].lower()].add(pid)
+        for trait in persona["traits"]:
+            self._by_trait[trait.lower()].add(pid)
+        return True
+
+    def _unindex(self, pid: str) -> None:
+        persona = self._personas.pop(pid, None)
+        if persona is None:
+            return
+        self._by_band[age_band(persona["age"])].remove(pid)
+        self._by_occupation[persona["occupation"].lower()].discard(pid)
+        for trait in persona["traits"]:
+            self._by_trait[trait.lower()].discard(pid)
+        self._agents.pop(pid, None)
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._load()
+            return len(self._personas)
+
+    def add(self, personas: List[Any]) -> List[Dict[str, Any]]:
+        """Validate, store and index personas.
+
+        Returns:
+            The personas that were new to the library
+        """
+        added = []
+        with self._lock:
+            self._load()
+            for raw in personas:
+                persona = normalize_persona(raw)
+                if persona and self._index(persona):
+                    added.append(persona)
+        evicted = []
+        for persona in added:
+            evicted += self.store.put(persona["id"], persona)
+        if evicted:
+            # Evicted from the store, so drop them from the panel indices too
+            with self._lock:
+                for pid in evicted:
+                    self._unindex(pid)
+            added = [persona for persona in added if persona["id"] not in evicted]
+        return added
+
+    def find(self, band: Optional[str] = None, occupation: Optional[str] = None,
+             trait: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Return personas matching every given filter."""
+        with self._lock:
+            self._load()
+            ids = set(self._personas)
+            if band:
+                ids &= set(self._by_band.get(band, ()))
+            if occupation:
+                ids &= self._by_occupation.get(occupation.lower(), set())
+            if trait:
+                ids &= self._by_trait.get(trait.lower(), set())
+            return [self._personas[pid] for pid in ids]
+
+    def shortfall(self, size: int) -> Dict[str, int]:
+        """How many more personas each age band needs for a balanced panel of size."""
+        per_band = math.ceil(size / len(AGE_BANDS))
+        with self._lock:
+            self._load()
+            needed = {label: per_band - len(self._by_band.get(label, ())) for label, _, _ in AGE_BANDS}
+        return {label: count for label, count in needed.items() if count > 0}
+
+    def sample(self, size: int, top_up: Optional[TopUp] = None) -> List[Dict[str, Any]]:
+        """Sample a panel of size personas spread evenly over age bands.
+
+        Within a band, occupations not yet on the panel are preferred. When
+        the library has too few personas in some bands, top_up is asked for
+        just those and the results are added to the library first.
+
+        Returns:
+            Up to size personas (fewer only if the library and top_up can't
+            supply them)
+        """
+        missing = self.shortfall(size)
+        if missing and top_up:
+            logger.info(f"Topping up persona library: {missing}")
+            try:
+                added = self.add(top_up(missing))
+            except Exception as e:
+                logger.error(f"Error topping up persona library: {e}")
+                added = []
+            self.stats["top_ups"] += 1
+            self.stats["generated"] += len(added)
+
+        with self._lock:
+            self._load()
+            # A few random candidates per slot leave room to vary occupations
+            # without shuffling whole bands of a large library
+            candidates = 4 * math.ceil(size / len(AGE_BANDS))
+            pools = {}
+            for label, _, _ in AGE_BANDS:
+                band = self._by_band.get(label, [])
+                pools[label] = self._random.sample(band, min(len(band), candidates))
+
+            panel: List[str] = []
+            occupations: Set[str] = set()
+            # Round-robin over the bands so each gets an equal share
+            while len(panel) < size and any(pools.values()):
+                for label, _, _ in AGE_BANDS:
+                    pool = pools[label]
+                    if not pool or len(panel) >= size:
+                        continue
+                    pick = next((i for i, pid in enumerate(pool)
+                                 if self._personas[pid]["occupation"].lower() not in occupations), 0)
+                    pid = pool.pop(pick)
+                    panel.append(pid)
+                    occupations.add(self._personas[pid]["occupation"].lower())
+            self.stats["sampled"] += len(panel)
+            sampled = [dict(self._personas[pid]) for pid in panel]
+        # Sampled personas count as recently used, so eviction takes the idle ones first
+        self.store.touch(panel)
+        return sampled
+
+    def checkout_agents(self, personas: List[Dict[str, Any]], build: Callable[[Dict[str, Any]], Any]) -> List[Any]:
+        """Return a respondent agent per persona, reusing idle ones.
+
+        An agent is used by one game at a time; give it back with
+        release_agents once the survey is done.
+        """
+        agents = []
+        for persona in personas:
+            with self._lock:
+                idle = self._agents.get(persona["id"])
+                agent = idle.pop() if idle else None
+            if agent is None:
+                agent = build(persona)
+                self.stats["agents_built"] += 1
+            else:
+                self.stats["agents_reused"] += 1
+            agents.append(agent)
+        return agents
+
+    def release_agents(self, personas: List[Dict[str, Any]], agents: List[Any]) -> None:
+        """Make checked-out agents available to later games."""
+        with self._lock:
+            for persona, agent in zip(personas, agents):
+                self._agents[persona["id"]].append(agent)
+
+    def stats_snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            self._load()
+            bands = {label: len(self._by_band.get(label, ())) for label, _, _ in AGE_BANDS}
+            return {**self.stats, "personas": len(self._personas), "bands": bands,
+                    "occupations": len(self._by_occupation)}
+
+
+persona_library = PersonaLibrary()
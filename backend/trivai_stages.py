@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""A small dependency graph of generation stages.
+
+Each stage is a callable that receives its dependencies' results as
+positional arguments. Stages start as soon as everything they depend on
+has finished, so independent stages run in parallel, and every stage's
+wall time is recorded.
+"""
+
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+
+class StageGraph:
+    """Runs named stages in dependency order, in parallel where possible.
+
+    Example:
+        graph = StageGraph()
+        graph.add("personas", make_personas)
+        graph.add("questions", make_questions)
+        graph.add("answers", collect, deps=("personas", "questions"))
+        results = graph.run()
+    """
+
+    def __init__(self, name: str = "stages", max_workers: Optional[int] = None):
+        self.name = name
+        self.max_workers = max_workers
+        self._stages: Dict[str, Tuple[Callable[..., Any], Tuple[str, ...]]] = {}
+        # Seconds each finished stage took, in completion order
+        self.timings: Dict[str, float] = {}
+        self.wall_time = 0.0
+
+    def add(self, name: str, func: Callable[..., Any], deps: Sequence[str] = ()) -> "StageGraph":
+        """Add a stage; deps must already have been added."""
+        if name in self._stages:
+            raise ValueError(f"Stage {name} already exists")
+        missing = [dep for dep in deps if dep not in self._stages]
+        if missing:
+            raise ValueError(f"Stage {name} depends on unknown stages: {missing}")
+        self._stages[name] = (func, tuple(deps))
+        return self
+
+    def _timed(self, name: str, func: Callable[..., Any], args: List[Any]) -> Any:
+        start = time.perf_counter()
+        try:
+            return func(*args)
+        finally:
+            self.timings[name] = time.perf_counter() - start
+
+    def run(self) -> Dict[str, Any]:
+        """Run every stage and return their results by name.
+
+        Raises:
+            Exception: The first exception raised by a stage; stages that
+                haven't started yet are skipped
+        """
+        results: Dict[str, Any] = {}
+        remaining = dict(self._stages)
+        running: Dict[Future, str] = {}
+        start = time.perf_counter()
+        workers = self.max_workers or max(1, len(self._stages))
+
+        executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=self.name)
+        try:
+            while remaining or running:
+                for name, (func, deps) in list(remaining.items()):
+                    if all(dep in results for dep in deps):
+                        del remaining[name]
+                        future = executor.submit(self._timed, name, func, [results[dep] for dep in deps])
+                        running[future] = name
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    results[running.pop(future)] = future.result()
+        finally:
+            # On failure, don't hold the caller up waiting for stages still running
+            executor.shutdown(wait=not running, cancel_futures=True)
+            self.wall_time = time.perf_counter() - start
+        return results
+
+    def summary(self) -> str:
+        """One line with each stage's time and the graph's wall time."""
+        stages = ", ".join(f"{name} {seconds:.2f}s" for name, seconds in self.timings.items())
+        return f"{self.name}: {stages} (wall {self.wall_time:.2f}s)"
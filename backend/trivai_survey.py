@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Large simulated survey panels for Feud boards.
+
+Instead of one respondent per persona, each persona describes how likely
+it is to give each answer, and a panel of hundreds of respondents is drawn
+from the persona population: personas are weighted so the panel matches
+an age distribution, and every simulated respondent draws an answer from
+its persona's distribution. Counting is vectorized over canonical answer
+ids, and top answers come with confidence intervals bootstrapped over the
+personas, since they, not the simulated draws, are the real sample.
+"""
+
+import os
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from trivai_answers import AnswerCanonicalizer
+from trivai_personas import age_band
+
+# Simulated respondents per question
+FEUD_PANEL_SIZE = int(os.getenv("FEUD_PANEL_SIZE", "1000"))
+# Share of adults in each age band the panel is weighted to
+BAND_WEIGHTS: Dict[str, float] = {"18-29": 0.21, "30-44": 0.26, "45-59": 0.24, "60-80": 0.29}
+# Persona resamples behind each answer's 95% confidence interval
+FEUD_BOOTSTRAP_SAMPLES = int(os.getenv("FEUD_BOOTSTRAP_SAMPLES", "500"))
+
+
+def parse_distribution(raw: Any) -> Optional[Dict[str, float]]:
+    """Turn a persona's answer distribution into {answer: probability}.
+
+    Accepts {"answer": probability}, a list of answers (equally likely) or a
+    single answer; probabilities are renormalized to sum to 1.
+
+    Returns:
+        The distribution, or None if there are no usable answers
+    """
+    if isinstance(raw, str):
+        raw = {raw: 1.0}
+    elif isinstance(raw, list):
+        raw = {str(answer): 1.0 for answer in raw if answer}
+    if not isinstance(raw, dict):
+        return None
+    weights = {}
+    for answer, weight in raw.items():
+        try:
+            weight = float(weight)
+        except (TypeError, ValueError):
+            continue
+        if str(answer).strip() and weight > 0:
+            weights[str(answer).strip()] = weights.get(str(answer).strip(), 0.0) + weight
+    total = sum(weights.values())
+    if not total:
+        return None
+    return {answer: weight / total for answer, weight in weights.items()}
+
+
+def persona_bands(personas: List[Dict[str, Any]]) -> List[str]:
+    """Each persona's age band; personas without a usable age count as 30."""
+    bands = []
+    for persona in personas:
+        try:
+            bands.append(age_band(int(persona.get("age", 30))))
+        except (TypeError, ValueError):
+            bands.append(age_band(30))
+    return bands
+
+
+def persona_weights(personas: List[Dict[str, Any]],
+                    band_weights: Dict[str, float] = BAND_WEIGHTS) -> np.ndarray:
+    """Sampling weight per persona so the panel matches band_weights.
+
+    Each age band's share is split evenly between its personas; bands with
+    no personas are left out and the rest renormalized.
+    """
+    bands = persona_bands(personas)
+    per_band = Counter(bands)
+    weights = np.array([band_weights.get(band, 0.0) / per_band[band] for band in bands], dtype=float)
+    total = weights.sum()
+    return weights / total if total else np.full(len(personas), 1.0 / max(1, len(personas)))
+
+
+def answer_matrix(distributions: List[Optional[Dict[str, float]]],
+                  canonicalizer: AnswerCanonicalizer) -> np.ndarray:
+    """Stack answer distributions into a (persona x canonical answer) matrix.
+
+    Answers are mapped to canonical ids through canonicalizer, so rewordings
+    across personas share a column. Rows of personas without a
+    distribution are all zero.
+    """
+    rows: List[Dict[int, float]] = []
+    for distribution in distributions:
+        row: Dict[int, float] = {}
+        for answer, probability in (distribution or {}).items():
+            cluster = canonicalizer.add(answer, weight=probability)
+            if cluster is not None:
+                row[cluster] = row.get(cluster, 0.0) + probability
+        rows.append(row)
+    width = 1 + max((cluster for row in rows for cluster in row), default=-1)
+    matrix = np.zeros((len(rows), width), dtype=float)
+    for i, row in enumerate(rows):
+        for cluster, probability in row.items():
+            matrix[i, cluster] = probability
+    return matrix
+
+
+def simulate_counts(matrix: np.ndarray, weights: np.ndarray, respondents: int,
+                    rng: np.random.Generator) -> np.ndarray:
+    """Answer counts of a simulated panel of respondents.
+
+    Respondents are split between personas by weight, then each persona's
+    share is split between its answers, both as multinomial draws.
+    """
+    totals = matrix.sum(axis=1)
+    usable = totals > 0
+    if not usable.any() or respondents <= 0:
+        return np.zeros(matrix.shape[1], dtype=np.int64)
+    weights = np.where(usable, weights, 0.0)
+    weights = weights / weights.sum()
+    rows = matrix[usable] / totals[usable, None]
+    per_persona = rng.multinomial(respondents, weights[usable])
+    return rng.multinomial(per_persona, rows).sum(axis=0)
+
+
+def bootstrap_interval(matrix: np.ndarray, bands: List[str], samples: int, rng: np.random.Generator,
+                       band_weights: Dict[str, float] = BAND_WEIGHTS) -> Tuple[np.ndarray, np.ndarray]:
+    """95% percentile interval of each answer's share, resampling personas.
+
+    Each sample draws the personas with replacement, reweights them by age
+    band as persona_weights does and takes the expected share of every
+    answer, so the interval reflects how few personas back the panel
+    rather than the simulated draws.
+    """
+    totals = matrix.sum(axis=1)
+    usable = totals > 0
+    width = matrix.shape[1]
+    if not usable.any() or samples <= 0:
+        return np.zeros(width), np.zeros(width)
+    rows = matrix[usable] / totals[usable, None]
+    names, codes = np.unique(np.array(bands)[usable], return_inverse=True)
+    n = len(rows)
+    picks = rng.integers(0, n, size=(samples, n))
+    picked_bands = codes[picks]
+    per_band = np.zeros((samples, len(names)))
+    np.add.at(per_band, (np.arange(samples)[:, None], picked_bands), 1)
+    band_share = np.array([band_weights.get(name, 0.0) for name in names])
+    weights = band_share[picked_bands] / np.take_along_axis(per_band, picked_bands, axis=1)
+    sums = weights.sum(axis=1, keepdims=True)
+    weights = np.where(sums > 0, weights / np.where(sums > 0, sums, 1), 1.0 / n)
+    shares = np.einsum("sp,spa->sa", weights, rows[picks])
+    low, high = np.percentile(shares, [2.5, 97.5], axis=0)
+    return low, high
+
+
+def top_answers(counts: np.ndarray, canonicalizer: AnswerCanonicalizer, low: np.ndarray, high: np.ndarray,
+                k: int = 10) -> List[Dict[str, Any]]:
+    """The k most common answers with counts, shares and the given 95% intervals."""
+    n = int(counts.sum())
+    if not n:
+        return []
+    # Most common first, ties in canonical id order
+    order = np.lexsort((np.arange(len(counts)), -counts))[:k]
+    return [
+        {'answer': canonicalizer.name(int(i)), 'count': int(counts[i]), 'share': round(float(counts[i]) / n, 4),
+         'ci_low': round(float(low[i]), 4), 'ci_high': round(float(high[i]), 4)}
+        for i in order if counts[i]
+    ]
+
+
+def simulate_question(distributions: List[Optional[Dict[str, float]]], personas: List[Dict[str, Any]],
+                      respondents: int = FEUD_PANEL_SIZE, k: int = 10,
+                      rng: Optional[np.random.Generator] = None,
+                      bootstrap_samples: int = FEUD_BOOTSTRAP_SAMPLES) -> Tuple[List[Dict[str, Any]], AnswerCanonicalizer]:
+    """Simulate one question's panel from each persona's answer distribution.
+
+    Returns:
+        The top k answers (see top_answers), with intervals from
+        bootstrap_interval, and the canonicalizer holding every answer the
+        personas gave
+    """
+    rng = rng or np.random.default_rng()
+    canonicalizer = AnswerCanonicalizer()
+    matrix = answer_matrix(distributions, canonicalizer)
+    counts = simulate_counts(matrix, persona_weights(personas), respondents, rng)
+    low, high = bootstrap_interval(matrix, persona_bands(personas), bootstrap_samples, rng)
+    return top_answers(counts, canonicalizer, low, high, k), canonicalizer
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Caching wrappers for the web tools the game agents call.
+
+Search and scrape results are stored in the shared SQLite cache (see
+trivai_cache), keyed by the tool name and its normalized arguments, so
+overlapping queries across requests only hit the network once per TTL.
+
+Set TRIVAI_TOOLS_OFFLINE=1 to serve results only from the cache (expired
+entries included) and never touch the network, e.g. for benchmarking.
+
+Scraped pages are condensed (see trivai_condense) before they reach the
+agent. The excerpt is ranked against the focus set with tool_context by
+whoever runs the agent task, on the thread that runs it.
+"""
+
+import json
+import logging
+import os
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+from urllib.parse import urlsplit, urlunsplit
+
+from crewai.tools import BaseTool
+
+from trivai_cache import SQLiteCache
+from trivai_condense import SCRAPE_EXCERPT_CHARS, condense
+
+logger = logging.getLogger(__name__)
+
+TOOL_CACHE_TTL = int(os.getenv("TOOL_CACHE_TTL", str(7 * 24 * 60 * 60)))
+TOOL_CACHE_MAX_ENTRIES = int(os.getenv("TOOL_CACHE_MAX_ENTRIES", "5000"))
+TOOLS_OFFLINE = os.getenv("TRIVAI_TOOLS_OFFLINE", "").lower() in ("1", "true", "yes")
+
+OFFLINE_MISS = "No cached result is available for this input (offline mode)."
+
+# Called with (original, condensed) text whenever a tool result is condensed
+CondenseCallback = Callable[[str, str], None]
+
+_context = threading.local()
+
+
+@contextmanager
+def tool_context(focus: str = "", on_condense: Optional[CondenseCallback] = None) -> Iterator[None]:
+    """Set what tool calls made on this thread are for, e.g. around an agent task.
+
+    Args:
+        focus: Text condensed results are ranked against
+        on_condense: Callback for instrumentation, see CondenseCallback
+    """
+    previous = getattr(_context, "value", None)
+    _context.value = (focus, on_condense)
+    try:
+        yield
+    finally:
+        _context.value = previous
+
+
+def normalize_url(url: str) -> str:
+    """Normalize a URL so trivially different spellings share a cache entry."""
+    parts = urlsplit(url.strip())
+    path = parts.path.rstrip("/") or "/"
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, parts.query, ""))
+
+
+def normalize_argument(name: str, value: Any) -> Any:
+    """Normalize one tool argument for use in a cache key."""
+    if not isinstance(value, str):
+        return value
+    if "url" in name.lower():
+        return normalize_url(value)
+    return " ".join(value.casefold().split())
+
+
+def tool_cache_key(tool_name: str, args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> str:
+    """Build the cache key for a tool call."""
+    positional = [normalize_argument("", value) for value in args]
+    arguments = {name: normalize_argument(name, value) for name, value in kwargs.items()}
+    return json.dumps([tool_name, positional, arguments], sort_keys=True, default=str)
+
+
+class CachedTool(BaseTool):
+    """Wraps a tool so its results are served from a persistent cache.
+
+    The wrapper copies the inner tool's name, description and argument
+    schema, so agents see exactly the same tool.
+    """
+
+    tool: Any = None
+    cache: Any = None
+    offline: bool = False
+
+    def __init__(self, tool: BaseTool, cache: SQLiteCache, offline: bool = TOOLS_OFFLINE, **kwargs):
+        super().__init__(
+            name=tool.name,
+            description=tool.description,
+            args_schema=tool.args_schema,
+            tool=tool,
+            cache=cache,
+            offline=offline,
+            **kwargs
+        )
+
+    def _run(self, *args, **kwargs) -> Any:
+        key = tool_cache_key(self.tool.name, args, kwargs)
+
+        cached = self.cache.get(key, allow_expired=self.offline)
+        if cached is not None:
+            return cached
+        if self.offline:
+            logger.info(f"Offline cache miss for {self.tool.name}: {key}")
+            return OFFLINE_MISS
+
+        result = self.tool.run(*args, **kwargs)
+        if result:
+            self.cache.put(key, result)
+        return result
+
+
+def cached_tool(tool: BaseTool, namespace: str, ttl: int = TOOL_CACHE_TTL,
+                max_entries: int = TOOL_CACHE_MAX_ENTRIES) -> CachedTool:
+    """Wrap tool with a cache in its own namespace of the shared store."""
+    return CachedTool(tool, SQLiteCache(namespace, ttl=ttl, max_entries=max_entries))
+
+
+class CondensedTool(BaseTool):
+    """Wraps a tool that returns page text so agents only see a relevant excerpt."""
+
+    tool: Any = None
+    max_chars: int = SCRAPE_EXCERPT_CHARS
+
+    def __init__(self, tool: BaseTool, max_chars: int = SCRAPE_EXCERPT_CHARS, **kwargs):
+        super().__init__(
+            name=tool.name,
+            description=tool.description,
+            args_schema=tool.args_schema,
+            tool=tool,
+            max_chars=max_chars,
+            **kwargs
+        )
+
+    def _run(self, *args, **kwargs) -> Any:
+        result = self.tool.run(*args, **kwargs)
+        if not isinstance(result, str):
+            return result
+        focus, on_condense = getattr(_context, "value", None) or ("", None)
+        condensed = condense(result, focus, self.max_chars)
+        if on_condense is not None:
+            on_condense(result, condensed)
+        return condensed